@@ -0,0 +1,384 @@
+"""
+Content-addressed memoization of detector and recipe results.
+
+Results are keyed by a hash of the input data (timestamps and values) and
+the detector / recipe configuration, so repeated evaluations of identical
+data (dashboards, alerting, notebook reruns) are served from the cache:
+
+    cache = ResultCache(max_bytes=64 * 1024 * 1024, disk_dir="/var/cache/sg", ttl=300)
+    recipe = CachedRecipe(ErrorRateZScoreRecipe(service="orders"), cache)
+    incident = recipe.run(ts)   # computed
+    incident = recipe.run(ts)   # cache hit
+"""
+from __future__ import annotations
+
+import copy
+import dataclasses
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .detectors import BaseDetector
+from .detectors.base import FittableDetector, _accepts_timestamps, _detect
+from .incidents import Incident
+from .metrics import TimeSeries
+from .models.registry import params_fingerprint
+from .recipes.base import BaseRecipe
+
+
+def data_fingerprint(*arrays: Optional[np.ndarray]) -> str:
+    """Hash of one or more arrays (dtype-normalized to float64); None is allowed."""
+    h = hashlib.blake2b(digest_size=16)
+    for arr in arrays:
+        if arr is None:
+            h.update(b"\x00none")
+            continue
+        arr = np.ascontiguousarray(arr, dtype=float)
+        h.update(repr(arr.shape).encode("ascii"))
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+# recipe fields that choose how a run executes, not what it computes
+RUNTIME_FIELDS = frozenset({"registry", "executor", "max_workers"})
+
+
+def recipe_params(recipe: BaseRecipe) -> Dict[str, Any]:
+    """Public configuration of a recipe (its dataclass fields, or attributes), minus RUNTIME_FIELDS."""
+    if dataclasses.is_dataclass(recipe):
+        names = [f.name for f in dataclasses.fields(recipe)]
+    else:
+        names = list(vars(recipe))
+    return {name: getattr(recipe, name) for name in names if not name.startswith("_") and name not in RUNTIME_FIELDS}
+
+
+def fitted_state_fingerprint(detector: BaseDetector) -> Optional[str]:
+    """
+    Hash of what `fit` learned (every attribute that is not a constructor
+    parameter), or None for detectors that are not fitted.
+    """
+    if not isinstance(detector, FittableDetector) or not detector.is_fitted:
+        return None
+    params = detector.get_params()
+    state = sorted((k, v) for k, v in vars(detector).items() if k not in params)
+    return hashlib.blake2b(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    # address-free stand-in for nested configuration: detectors and recipes
+    # become (class, params[, fitted state]) instead of their default repr
+    if isinstance(value, BaseDetector):
+        cls = type(value)
+        return (f"{cls.__module__}.{cls.__qualname__}", _canonical(value.get_params()), fitted_state_fingerprint(value))
+    if isinstance(value, BaseRecipe):
+        cls = type(value)
+        return (f"{cls.__module__}.{cls.__qualname__}", _canonical(recipe_params(value)))
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return data_fingerprint(value)
+    return value
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """
+    Two-tier result cache.
+
+    Values are stored pickled, so every `get` returns an independent copy
+    and the memory tier is sized exactly: least recently used entries are
+    evicted once the total exceeds `max_bytes`. With `disk_dir`, entries
+    are also written to disk (shared across processes and restarts) and
+    read back on memory misses. Entries older than `ttl` seconds are
+    treated as missing in both tiers.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget for the in-process tier.
+    disk_dir : str, optional
+        Directory for the on-disk tier. If None, only memory is used.
+    ttl : float, optional
+        Maximum entry age in seconds. None means entries never expire.
+    clock : callable
+        Time source, defaults to time.time.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        self.ttl = ttl
+        self.clock = clock
+
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key(kind: str, owner: Any, params: Dict[str, Any], *arrays: Optional[np.ndarray]) -> str:
+        """
+        Cache key for `kind` ("detect", "run", ...) of `owner` on the given
+        data. Nested detectors / recipes in `params` are keyed by class and
+        parameters; a fitted `owner` is also keyed by its fitted state.
+        """
+        cls = type(owner)
+        config = params_fingerprint({k: _canonical(v) for k, v in params.items()})
+        state = fitted_state_fingerprint(owner) if isinstance(owner, BaseDetector) else None
+        if state is not None:
+            config = f"{config}.{state}"
+        return f"{kind}-{cls.__module__}.{cls.__qualname__}-{config}-{data_fingerprint(*arrays)}"
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for `key` (counted as hit / miss)."""
+        payload = self._lookup(key)
+        with self._lock:
+            if payload is None:
+                self.stats.misses += 1
+                return default
+            self.stats.hits += 1
+        return pickle.loads(payload)
+
+    def put(self, key: str, value: Any) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        created = self.clock()
+        with self._lock:
+            self._store(key, created, payload)
+        if self.disk_dir is not None:
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump((created, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, computing and storing it on a miss."""
+        payload = self._lookup(key)
+        with self._lock:
+            if payload is not None:
+                self.stats.hits += 1
+            else:
+                self.stats.misses += 1
+        if payload is not None:
+            return pickle.loads(payload)
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+        if self.disk_dir is not None and os.path.exists(self._path(key)):
+            os.remove(self._path(key))
+
+    def clear(self) -> None:
+        """Drop every entry, including the on-disk tier."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and self.clock() - created > self.ttl
+
+    def _lookup(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                self._drop(key)
+                self.stats.expirations += 1
+
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                created, payload = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        if self._expired(created):
+            self.stats.expirations += 1
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            return None
+
+        self.stats.disk_hits += 1
+        with self._lock:
+            self._store(key, created, payload)
+        return payload
+
+    def _store(self, key: str, created: float, payload: bytes) -> None:
+        self._drop(key)
+        self._memory[key] = (created, payload)
+        self._memory_bytes += len(payload)
+
+        while self._memory_bytes > self.max_bytes and self._memory:
+            _, (_, cold) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(cold)
+            self.stats.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[1])
+
+    def _path(self, key: str) -> str:
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=20).hexdigest()
+        return os.path.join(self.disk_dir, name + ".pkl")
+
+
+class CachedDetector(BaseDetector):
+    """
+    Detector wrapper that memoizes `detect` in a ResultCache.
+
+    The key covers the wrapped detector's class and `get_params()`, its
+    fitted state if it has one, plus the input arrays (and timestamps, for
+    detectors that take them). Fittable detectors are run on a copy, so
+    `detect` never refits the wrapped detector and hits and misses leave it
+    in the same state. Every other attribute is forwarded to the wrapped
+    detector.
+    """
+
+    def __init__(self, detector: BaseDetector, cache: ResultCache):
+        self.detector = detector
+        self.cache = cache
+
+    def detect(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if not _accepts_timestamps(self.detector):
+            timestamps = None  # not part of the result, keep them out of the key
+        key = self.cache.key("detect", self.detector, self.detector.get_params(), values, timestamps)
+
+        def compute():
+            detector = copy.deepcopy(self.detector) if isinstance(self.detector, FittableDetector) else self.detector
+            return _detect(detector, values, timestamps)
+
+        return self.cache.get_or_compute(key, compute)
+
+    def get_params(self) -> Dict[str, Any]:
+        return self.detector.get_params()
+
+    def __getattr__(self, name: str):
+        # only called for attributes not found on the wrapper itself
+        if name in ("detector", "cache"):
+            raise AttributeError(name)
+        return getattr(self.detector, name)
+
+
+def _forward(name: str) -> property:
+    # BaseRecipe defines these itself, so __getattr__ would never see them
+    def fget(self):
+        return getattr(self.recipe, name)
+
+    def fset(self, value):
+        setattr(self.recipe, name, value)
+
+    return property(fget, fset, doc=f"`{name}` of the wrapped recipe.")
+
+
+class CachedRecipe(BaseRecipe):
+    """
+    Recipe wrapper that memoizes `run` in a ResultCache.
+
+    The key covers the wrapped recipe's class and public fields (nested
+    detectors by class and parameters, RUNTIME_FIELDS left out) plus the
+    series timestamps and values. Recipes with a model `registry` are not
+    cached: their results depend on the models fitted in it.
+
+    Everything else behaves as the wrapped recipe: its configuration
+    (`tier`, `history_window`, ...) and hooks (`plan_detectors` /
+    `combine`, streaming for `run_incremental`, `run_on_baseline`) are
+    forwarded, as is every other attribute.
+    """
+
+    history_window = _forward("history_window")
+    tier = _forward("tier")
+    tier_agg = _forward("tier_agg")
+    baseline_tier = _forward("baseline_tier")
+    plan_detectors = _forward("plan_detectors")
+    combine = _forward("combine")
+    run_on_baseline = _forward("run_on_baseline")
+    _stream_detector = _forward("_stream_detector")
+    _incident = _forward("_incident")
+
+    def __init__(self, recipe: BaseRecipe, cache: ResultCache):
+        self.recipe = recipe
+        self.cache = cache
+
+    def run(self, series: TimeSeries) -> Incident:
+        if getattr(self.recipe, "registry", None) is not None:
+            return self.recipe.run(series)
+        key = self.cache.key("run", self.recipe, recipe_params(self.recipe), series.timestamps, series.values)
+        return self.cache.get_or_compute(key, lambda: self.recipe.run(series))
+
+    def __getattr__(self, name: str):
+        if name in ("recipe", "cache"):
+            raise AttributeError(name)
+        return getattr(self.recipe, name)
+
+
+def cached(obj, cache: ResultCache):
+    """Wrap a detector or recipe so its results are served from `cache`."""
+    if isinstance(obj, BaseRecipe):
+        return CachedRecipe(obj, cache)
+    if isinstance(obj, BaseDetector):
+        return CachedDetector(obj, cache)
+    raise TypeError(f"cannot cache {type(obj).__name__}; expected a detector or a recipe")
@@ -1,6 +1,120 @@
-from .zscore import ZScoreDetector
-from .ema import EMADetector
-from .isolation_forest import IsolationForestDetector
-from .lof import LOFDetector
-from .prophet_detector import ProphetResidualDetector
-from .lstm_autoencoder import LSTMAutoencoderDetector
\ No newline at end of file
+"""
+Anomaly detectors.
+
+Detector classes are resolved lazily: importing this package only loads the
+base classes, and e.g. `LSTMAutoencoderDetector` imports TensorFlow the first
+time it is accessed. Third-party detectors can be added with
+`register_detector` or through the ``signalguard_aiops.detectors`` entry point
+group, e.g. in a plugin's pyproject.toml:
+
+    [project.entry-points."signalguard_aiops.detectors"]
+    my_detector = "my_package.detectors:MyDetector"
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Dict, List, Type, Union
+
+from .base import BaseDetector, StreamingDetector
+
+ENTRY_POINT_GROUP = "signalguard_aiops.detectors"
+
+# registry name -> "module:attribute" (relative modules resolve in this package)
+_BUILTIN: Dict[str, str] = {
+    "zscore": ".zscore:ZScoreDetector",
+    "ema": ".ema:EMADetector",
+    "isolation_forest": ".isolation_forest:IsolationForestDetector",
+    "lof": ".lof:LOFDetector",
+    "prophet": ".prophet_detector:ProphetResidualDetector",
+    "seasonal": ".seasonal:SeasonalResidualDetector",
+    "lstm_autoencoder": ".lstm_autoencoder:LSTMAutoencoderDetector",
+    "lstm_autoencoder_numpy": ".lstm_numpy:NumpyLSTMAutoencoderDetector",
+}
+
+_registry: Dict[str, Union[str, type]] = dict(_BUILTIN)
+_entry_points_loaded = False
+
+# public class name -> registry name, for attribute access on this package
+_CLASS_NAMES = {target.rsplit(":", 1)[1]: name for name, target in _BUILTIN.items()}
+
+__all__ = [
+    "BaseDetector",
+    "StreamingDetector",
+    "register_detector",
+    "get_detector",
+    "available_detectors",
+    *_CLASS_NAMES,
+]
+
+
+def _resolve(target: Union[str, type]) -> type:
+    if not isinstance(target, str):
+        return target
+    module_name, _, attr = target.partition(":")
+    module = import_module(module_name, package=__name__)
+    return getattr(module, attr)
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    try:
+        eps = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python < 3.10
+        eps = entry_points().get(ENTRY_POINT_GROUP, [])
+    for ep in eps:
+        # built-ins and explicit registrations win over plugins
+        _registry.setdefault(ep.name, ep.value)
+
+
+def register_detector(name: str, target: Union[str, Type[BaseDetector]]) -> None:
+    """
+    Register a detector under `name`.
+
+    Parameters
+    ----------
+    name : str
+        Registry name, e.g. "my_detector".
+    target : str or type
+        The detector class, or a lazy "package.module:ClassName" reference
+        that is imported on first use.
+    """
+    _registry[name] = target
+
+
+def get_detector(name: str) -> Type[BaseDetector]:
+    """
+    Return the detector class registered under `name`, importing it if needed.
+
+    Accepts registry names ("zscore") as well as class names ("ZScoreDetector").
+    """
+    name = _CLASS_NAMES.get(name, name)
+    if name not in _registry:
+        _load_entry_points()
+    if name not in _registry:
+        raise KeyError(f"Unknown detector {name!r}. Available: {', '.join(available_detectors())}")
+
+    cls = _resolve(_registry[name])
+    _registry[name] = cls
+    return cls
+
+
+def available_detectors() -> List[str]:
+    """Names of all registered detectors (including entry points), without importing them."""
+    _load_entry_points()
+    return sorted(_registry)
+
+
+def __getattr__(name: str):
+    if name in _CLASS_NAMES:
+        cls = _resolve(_BUILTIN[_CLASS_NAMES[name]])
+        globals()[name] = cls
+        return cls
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_CLASS_NAMES))
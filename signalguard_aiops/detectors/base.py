@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
 
@@ -13,9 +14,182 @@ class BaseDetector(ABC):
     All detectors take a 1D array of float values and return:
       - labels: np.ndarray of shape (n,), values in {0, 1}
       - scores: np.ndarray of shape (n,), anomaly score (higher = more anomalous)
+
+    `detect_batch` runs the detector over many series at once. The default
+    implementation loops over rows; detectors with a vectorized kernel
+    override it.
     """
 
     @abstractmethod
     def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Run anomaly detection on a 1D array of values."""
         raise NotImplementedError
+
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Constructor parameters of this detector, read back from the attributes
+        of the same name. Used to fingerprint detector configurations.
+        """
+        params = {}
+        for name, p in inspect.signature(type(self).__init__).parameters.items():
+            if name == "self" or p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD):
+                continue
+            if hasattr(self, name):
+                params[name] = getattr(self, name)
+        return params
+
+    def detect_batch(
+        self,
+        values: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run anomaly detection on a (n_series, n_points) matrix.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            2D array, one series per row.
+        mask : np.ndarray, optional
+            Boolean array of the same shape marking valid points. Each row is
+            detected on its valid points only (e.g. ragged series padded to a
+            common length); invalid positions get label 0 and score 0.
+
+        Returns
+        -------
+        labels, scores : tuple of np.ndarray
+            Both of shape (n_series, n_points).
+        """
+        values, mask = _check_batch(values, mask)
+        labels = np.zeros(values.shape, dtype=int)
+        scores = np.zeros(values.shape, dtype=float)
+
+        for r in range(values.shape[0]):
+            if mask is None:
+                labels[r], scores[r] = self.detect(values[r])
+            else:
+                valid = mask[r]
+                labels[r, valid], scores[r, valid] = self.detect(values[r, valid])
+
+        return labels, scores
+
+
+def _check_batch(
+    values: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("values must be a 2D array of shape (n_series, n_points)")
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != values.shape:
+            raise ValueError("mask must have the same shape as values")
+    return values, mask
+
+
+def _accepts_timestamps(detector: BaseDetector) -> bool:
+    """Whether `detector.detect` takes a `timestamps` argument (seasonal, Prophet, ...)."""
+    return "timestamps" in inspect.signature(detector.detect).parameters
+
+
+def _detect(
+    detector: BaseDetector,
+    values: np.ndarray,
+    timestamps: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """`detector.detect(values)`, passing `timestamps` to detectors that take them."""
+    if timestamps is not None and _accepts_timestamps(detector):
+        return detector.detect(values, timestamps)
+    return detector.detect(values)
+
+
+def _detect_causal_masked(
+    kernel: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    values: np.ndarray,
+    mask: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Apply a dense batch kernel to ragged rows.
+
+    The valid points of every row are shifted to the left (keeping their
+    order), the kernel runs on the packed matrix, and results are scattered
+    back. This is exact for causal kernels, whose output at a position only
+    depends on earlier points, because the padding always sits after the
+    last valid point of its row.
+    """
+    order = np.argsort(~mask, axis=1, kind="stable")
+    packed = np.take_along_axis(values, order, axis=1)
+    packed_valid = np.take_along_axis(mask, order, axis=1)
+    packed = np.where(packed_valid, packed, np.nan)
+
+    packed_labels, packed_scores = kernel(packed)
+
+    labels = np.zeros(values.shape, dtype=int)
+    scores = np.zeros(values.shape, dtype=float)
+    np.put_along_axis(labels, order, np.where(packed_valid, packed_labels, 0), axis=1)
+    np.put_along_axis(scores, order, np.where(packed_valid, packed_scores, 0.0), axis=1)
+    return labels, scores
+
+
+class FittableDetector(BaseDetector):
+    """
+    Detector with separate training and scoring steps.
+
+    `fit` learns a model from a training window and `score` applies it to
+    new data without retraining, so fitted detectors can be cached and
+    reused (see `signalguard_aiops.models.ModelRegistry`). `detect` keeps the
+    self-contained behaviour of fitting and scoring in a single call.
+    """
+
+    @abstractmethod
+    def fit(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> "FittableDetector":
+        """Fit the detector on a training window and return self."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score values with the fitted model and return (labels, scores)."""
+        raise NotImplementedError
+
+    @property
+    def is_fitted(self) -> bool:
+        return bool(getattr(self, "_fitted", False))
+
+    def _check_fitted(self) -> None:
+        if not self.is_fitted:
+            raise RuntimeError(f"{type(self).__name__} is not fitted; call fit() first")
+
+
+class StreamingDetector(BaseDetector):
+    """
+    Detector that can also consume a series incrementally.
+
+    Streaming detectors keep explicit online state. Feeding a series through
+    `update` / `update_many` in any chunking returns the same labels and scores
+    as a single `detect` call on the concatenated series. `detect` itself is
+    stateless and never touches the streaming state.
+    """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Clear the online state, as if no point had been seen."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, x: float) -> Tuple[int, float]:
+        """Consume one new point and return its (label, score)."""
+        raise NotImplementedError
+
+    def update_many(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Consume a chunk of new points and return labels/scores for them only."""
+        values = np.asarray(values, dtype=float).ravel()
+        labels = np.zeros(len(values), dtype=int)
+        scores = np.zeros(len(values), dtype=float)
+        for i, x in enumerate(values):
+            labels[i], scores[i] = self.update(x)
+        return labels, scores
@@ -1,19 +1,87 @@
 from __future__ import annotations
 
-from typing import Tuple
+import math
+from typing import Optional, Tuple
 
 import numpy as np
 
-from .base import BaseDetector
+from .base import StreamingDetector, _check_batch, _detect_causal_masked
 
 
-class EMADetector(BaseDetector):
+def ema_filter(values: np.ndarray, alpha: float, init: np.ndarray | float) -> np.ndarray:
+    """
+    Vectorized first-order linear filter y[i] = alpha * x[i] + (1 - alpha) * y[i - 1].
+
+    Solves the recursion in closed form along the last axis:
+
+        y[j] = y0 + d^j * cumsum(alpha * (x[k] - y0) * d^(-k))[j],  d = 1 - alpha
+
+    The series is processed in blocks short enough that d^(-k) stays well
+    inside the float64 range, carrying the last output of each block as the
+    initial state y0 of the next one. Working relative to y0 keeps the
+    result exact on flat stretches (x == y0 gives y == y0, as the per-point
+    recursion does), so e.g. a constant 1e9 series has an EMA deviation of
+    exactly 0.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Input of shape (..., n).
+    alpha : float
+        Smoothing factor in (0, 1].
+    init : np.ndarray or float
+        Filter state before the first point (y[-1]), broadcastable to
+        values.shape[:-1].
+
+    Returns
+    -------
+    np.ndarray
+        Filtered values, same shape as `values`.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    state = np.broadcast_to(np.asarray(init, dtype=float), values.shape[:-1])
+    out = np.empty(values.shape, dtype=float)
+
+    d = 1.0 - alpha
+    if d == 0.0:
+        out[...] = alpha * values
+        return out
+
+    # keep d^(-block) <= 1e150
+    block = int(min(4096, max(1, 150 * math.log(10) / -math.log(d))))
+    k = np.arange(block)
+    grow = d ** -k.astype(float)
+    decay = d ** k.astype(float)
+
+    for b in range(0, n, block):
+        e = min(b + block, n)
+        m = e - b
+        # filter x - y[-1] from a zero state: the rounding error then scales with
+        # the change of the input, not its magnitude, and a run equal to the
+        # state comes out exactly equal to it
+        shift = state[..., np.newaxis]
+        acc = np.cumsum(alpha * (values[..., b:e] - shift) * grow[:m], axis=-1)
+        out[..., b:e] = shift + decay[:m] * acc
+        state = out[..., e - 1]
+
+    return out
+
+
+class EMADetector(StreamingDetector):
     """
     Exponential moving average anomaly detector.
 
     Maintains an exponentially weighted moving average (EMA) and deviation,
     flags points whose deviation from EMA exceeds a threshold.
 
+    Both recursions are linear filters, so they are evaluated with the
+    vectorized `ema_filter` kernel. The original per-point loop is kept as
+    `detect_reference` for equivalence checks.
+
+    Streaming: `update` / `update_many` carry the EMA, the EMA deviation and
+    the number of points seen, so each new point costs O(1).
+
     Parameters
     ----------
     alpha : float
@@ -28,8 +96,74 @@ class EMADetector(BaseDetector):
         self.alpha = float(alpha)
         self.k_sigma = float(k_sigma)
         self.warmup = int(warmup)
+        self.reset()
 
     def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float)
+        labels, scores, _, _ = self._run(values, 0, 0.0, 0.0)
+        return labels, scores
+
+    def detect_batch(
+        self,
+        values: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values, mask = _check_batch(values, mask)
+        if mask is not None:
+            return _detect_causal_masked(self.detect_batch, values, mask)
+
+        labels, scores, _, _ = self._run(values, 0, 0.0, 0.0)
+        return labels, scores
+
+    def _run(
+        self,
+        values: np.ndarray,
+        n_seen: int,
+        ema0: np.ndarray | float,
+        ema_dev0: np.ndarray | float,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score `values` (shape (..., m)) as the continuation of a series of
+        which `n_seen` points have already produced the state (ema0, ema_dev0).
+
+        Returns labels, scores and the final (ema, ema_dev) state.
+        """
+        m = values.shape[-1]
+        labels = np.zeros(values.shape, dtype=int)
+        scores = np.zeros(values.shape, dtype=float)
+
+        if m == 0:
+            return labels, scores, np.asarray(ema0), np.asarray(ema_dev0)
+
+        # The first point of a series only seeds the EMA
+        offset = 0
+        if n_seen == 0:
+            ema0 = values[..., 0]
+            ema_dev0 = np.zeros(values.shape[:-1])
+            offset = 1
+
+        body = values[..., offset:]
+        if body.shape[-1] == 0:
+            return labels, scores, np.asarray(ema0), np.asarray(ema_dev0)
+
+        ema = ema_filter(body, self.alpha, ema0)
+        dev = np.abs(body - ema)
+        ema_dev = ema_filter(dev, self.alpha, ema_dev0)
+
+        # Warm-up period and flat history: don't flag anomalies
+        i = n_seen + offset + np.arange(body.shape[-1])
+        active = (i >= self.warmup) & (ema_dev != 0)
+        with np.errstate(invalid="ignore"):
+            score = np.where(active, dev / (ema_dev + 1e-8), 0.0)
+
+        scores[..., offset:] = score
+        labels[..., offset:] = active & (score >= self.k_sigma)
+        return labels, scores, ema[..., -1], ema_dev[..., -1]
+
+    def detect_reference(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reference per-point implementation of `detect`.
+        """
         values = np.asarray(values, dtype=float)
         n = len(values)
         labels = np.zeros(n, dtype=int)
@@ -65,3 +199,44 @@ class EMADetector(BaseDetector):
             scores[i] = score
 
         return labels, scores
+
+    # ------------------------------------------------------------------
+    # Streaming API
+    # ------------------------------------------------------------------
+    def reset(self) -> None:
+        self._n = 0
+        self._ema = 0.0
+        self._ema_dev = 0.0
+
+    def update(self, x: float) -> Tuple[int, float]:
+        x = float(x)
+        i = self._n
+        self._n += 1
+
+        if i == 0:
+            self._ema = x
+            self._ema_dev = 0.0
+            return 0, 0.0
+
+        # Update EMA and deviation
+        ema_prev = self._ema
+        self._ema = ema = self.alpha * x + (1 - self.alpha) * ema_prev
+
+        dev = abs(x - ema)
+        self._ema_dev = ema_dev = self.alpha * dev + (1 - self.alpha) * self._ema_dev
+
+        # Warm-up period: don't flag anomalies yet
+        if i < self.warmup or ema_dev == 0:
+            return 0, 0.0
+
+        score = dev / (ema_dev + 1e-8)
+        return int(score >= self.k_sigma), score
+
+    def update_many(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float).ravel()
+        labels, scores, ema, ema_dev = self._run(values, self._n, self._ema, self._ema_dev)
+        if len(values):
+            self._n += len(values)
+            self._ema = float(ema)
+            self._ema_dev = float(ema_dev)
+        return labels, scores
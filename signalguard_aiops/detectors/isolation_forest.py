@@ -1,20 +1,23 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
 
 import numpy as np
 from sklearn.ensemble import IsolationForest
 
-from .base import BaseDetector
+from .base import FittableDetector
 
 
-class IsolationForestDetector(BaseDetector):
+class IsolationForestDetector(FittableDetector):
     """
     Isolation Forest anomaly detector for 1D time series.
 
     Fits an IsolationForest on the value distribution and uses the
     decision_function as an anomaly score.
 
+    `detect` fits on the given values and scores them. Use `fit` / `score`
+    to train once and score later windows with the same forest.
+
     Parameters
     ----------
     n_estimators : int
@@ -36,15 +39,34 @@ class IsolationForestDetector(BaseDetector):
             contamination=contamination,
             random_state=random_state,
         )
+        self._fitted = False
 
-    def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        values = np.asarray(values, dtype=float).reshape(-1, 1)
+    def get_params(self) -> Dict[str, Any]:
+        params = self.model.get_params()
+        return {k: params[k] for k in ("n_estimators", "contamination", "random_state")}
 
+    def fit(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> "IsolationForestDetector":
+        """Fit the forest on a 1D array of values. `timestamps` is ignored."""
+        values = np.asarray(values, dtype=float).reshape(-1, 1)
         if values.shape[0] == 0:
-            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+            return self
 
         # Fit on all values (unsupervised)
         self.model.fit(values)
+        self._fitted = True
+        return self
+
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float).reshape(-1, 1)
+
+        if values.shape[0] == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        self._check_fitted()
 
         # decision_function: higher = more normal, lower = more anomalous
         decision_scores = self.model.decision_function(values)
@@ -59,3 +81,11 @@ class IsolationForestDetector(BaseDetector):
         labels = (norm_scores > 0.8).astype(int)
 
         return labels, norm_scores.ravel()
+
+    def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float)
+
+        if values.shape[0] == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        return self.fit(values).score(values)
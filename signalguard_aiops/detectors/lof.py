@@ -1,20 +1,164 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Tuple, Optional, Union
 
 import numpy as np
-from sklearn.neighbors import LocalOutlierFactor
 
-from .base import BaseDetector
+from .base import FittableDetector
 
 
-class LOFDetector(BaseDetector):
+def _nearest_windows(
+    ref: np.ndarray,
+    x: np.ndarray,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    m: int,
+) -> np.ndarray:
+    """
+    Start index of the run of `m` consecutive sorted reference values closest
+    to each query `x`.
+
+    For scalar data the m nearest neighbours of x are a contiguous run
+    ref[a:a+m] of the sorted reference set. The run minimizes
+    max(x - ref[a], ref[a+m-1] - x) over the admissible starts [lo, hi]; the
+    right-hand gap grows with a while the left-hand gap shrinks, so the
+    optimum sits where they cross and is found with a vectorized binary
+    search (O(log m) steps for all queries at once).
+    """
+    # smallest a in [lo, hi] with right gap >= left gap (hi + 1 if none)
+    left, right = lo.copy(), hi + 1
+    while True:
+        active = left < right
+        if not active.any():
+            break
+        mid = (left + right) // 2
+        mid_c = np.minimum(mid, hi)
+        cond = (ref[mid_c + m - 1] - x) >= (x - ref[mid_c])
+        right = np.where(active & cond, mid, right)
+        left = np.where(active & ~cond, mid + 1, left)
+
+    a = np.minimum(left, hi)
+    # the window just before the crossing can be tighter
+    prev = np.maximum(a - 1, lo)
+    cost_a = np.maximum(x - ref[a], ref[a + m - 1] - x)
+    cost_prev = np.maximum(x - ref[prev], ref[prev + m - 1] - x)
+    return np.where(cost_prev < cost_a, prev, a)
+
+
+class LOF1D:
+    """
+    Exact Local Outlier Factor for scalar values.
+
+    Same definitions (and attribute names) as sklearn's LocalOutlierFactor
+    with the euclidean metric, specialised to 1D: the reference set is kept
+    sorted, so every k-neighbourhood is a contiguous run found by binary
+    search instead of a tree / brute-force kNN query. Fitting costs
+    O(n log n + n * k).
+
+      k-distance(p)    = distance to the k-th nearest neighbour
+      reach-dist(p, o) = max(|p - o|, k-distance(o))
+      lrd(p)           = 1 / (mean_o reach-dist(p, o) + 1e-10)
+      LOF(p)           = mean_o lrd(o) / lrd(p)
+
+    Results match sklearn up to floating point rounding; neighbours tied at
+    exactly the k-distance on both sides of a point may be chosen
+    differently.
+
+    Parameters
+    ----------
+    n_neighbors : int
+        Number of neighbours (capped at n_samples - 1 on fit).
+    contamination : float or "auto"
+        Proportion of outliers, in (0, 0.5]; sets `offset_`.
+    """
+
+    def __init__(self, n_neighbors: int = 20, contamination: Union[float, str] = "auto"):
+        if contamination != "auto" and not 0.0 < float(contamination) <= 0.5:
+            raise ValueError(f"contamination must be 'auto' or in (0, 0.5], got {contamination!r}")
+        self.n_neighbors = int(n_neighbors)
+        self.contamination = contamination
+
+    def fit(self, values: np.ndarray) -> "LOF1D":
+        """Fit on a reference set; sets `negative_outlier_factor_` and `offset_`."""
+        values = np.asarray(values, dtype=float).ravel()
+        n = len(values)
+        if n < 2:
+            raise ValueError(f"LOF needs at least 2 samples, got {n}")
+        if not np.isfinite(values).all():
+            raise ValueError("LOF input contains NaN or infinity")
+
+        k = max(1, min(self.n_neighbors, n - 1))
+        order = np.argsort(values, kind="stable")
+        ref = values[order]
+        pos = np.arange(n)
+
+        # k+1 closest values to each point, the point itself included
+        start = _nearest_windows(ref, ref, np.maximum(pos - k, 0), np.minimum(pos, n - k - 1), k + 1)
+        idx = start[:, np.newaxis] + np.arange(k + 1)
+        others = idx != pos[:, np.newaxis]
+        dist = np.abs(ref[idx] - ref[:, np.newaxis])
+
+        kdist = dist.max(axis=1)
+        reach = np.where(others, np.maximum(dist, kdist[idx]), 0.0)
+        lrd = 1.0 / (reach.sum(axis=1) / k + 1e-10)
+        ratios = np.where(others, lrd[idx] / lrd[:, np.newaxis], 0.0)
+        nof_sorted = -(ratios.sum(axis=1) / k)
+
+        self.n_neighbors_ = k
+        self.ref_ = ref
+        self.kdist_ = kdist
+        self.lrd_ = lrd
+        self.negative_outlier_factor_ = np.empty(n)
+        self.negative_outlier_factor_[order] = nof_sorted
+
+        if self.contamination == "auto":
+            self.offset_ = -1.5
+        else:
+            self.offset_ = float(np.percentile(self.negative_outlier_factor_, 100.0 * float(self.contamination)))
+        return self
+
+    def fit_predict(self, values: np.ndarray) -> np.ndarray:
+        """Unsupervised labels for the fitted values: -1 = outlier, 1 = inlier."""
+        self.fit(values)
+        return np.where(self.negative_outlier_factor_ < self.offset_, -1, 1)
+
+    def score_samples(self, values: np.ndarray) -> np.ndarray:
+        """Novelty mode: opposite LOF of new values against the reference set."""
+        x = np.asarray(values, dtype=float).ravel()
+        if not np.isfinite(x).all():
+            raise ValueError("LOF input contains NaN or infinity")
+
+        ref, k = self.ref_, self.n_neighbors_
+        n = len(ref)
+        p = np.searchsorted(ref, x)
+        start = _nearest_windows(ref, x, np.clip(p - k, 0, n - k), np.minimum(p, n - k), k)
+        idx = start[:, np.newaxis] + np.arange(k)
+
+        dist = np.abs(ref[idx] - x[:, np.newaxis])
+        lrd = 1.0 / (np.maximum(dist, self.kdist_[idx]).mean(axis=1) + 1e-10)
+        return -np.mean(self.lrd_[idx] / lrd[:, np.newaxis], axis=1)
+
+    def decision_function(self, values: np.ndarray) -> np.ndarray:
+        return self.score_samples(values) - self.offset_
+
+    def predict(self, values: np.ndarray) -> np.ndarray:
+        """Novelty labels for new values: -1 = outlier, 1 = inlier."""
+        return np.where(self.decision_function(values) < 0, -1, 1)
+
+
+class LOFDetector(FittableDetector):
     """
     Local Outlier Factor anomaly detector for 1D time series.
 
-    Uses LocalOutlierFactor in unsupervised mode (novelty=False).
+    `detect` uses LOF in unsupervised mode (novelty=False).
     LOF gives negative_outlier_factor_: lower = more anomalous.
 
+    `fit` / `score` use novelty mode instead: the training window becomes
+    the reference set and new values are scored against it.
+
+    Both run on LOF1D, an exact sorted-array LOF for scalar values that
+    gives the same results as sklearn's LocalOutlierFactor.
+
     Parameters
     ----------
     n_neighbors : int
@@ -26,16 +170,55 @@ class LOFDetector(BaseDetector):
     def __init__(self, n_neighbors: int = 20, contamination: float = 0.05):
         self.n_neighbors = n_neighbors
         self.contamination = contamination
+        self.model: Optional[LOF1D] = None
+        self._fitted = False
+
+    def _n_neighbors_for(self, n: int) -> int:
+        return min(self.n_neighbors, max(2, n - 1))
+
+    def fit(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> "LOFDetector":
+        """Fit a novelty-mode LOF on a 1D array of values. `timestamps` is ignored."""
+        values = np.asarray(values, dtype=float).ravel()
+        n = values.shape[0]
+        if n < 2:
+            return self
+
+        self.model = LOF1D(
+            n_neighbors=self._n_neighbors_for(n),
+            contamination=self.contamination,
+        )
+        self.model.fit(values)
+        self._fitted = True
+        return self
+
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float).ravel()
+        if values.shape[0] == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        self._check_fitted()
+
+        # score_samples: lower (more negative) = more anomalous
+        raw_scores = -self.model.score_samples(values)
+        raw_scores = raw_scores - raw_scores.min()
+        norm_scores = raw_scores / (raw_scores.max() + 1e-8)
+
+        anomaly_labels = (self.model.predict(values) == -1).astype(int)
+        return anomaly_labels, norm_scores
 
     def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        values = np.asarray(values, dtype=float).reshape(-1, 1)
+        values = np.asarray(values, dtype=float).ravel()
         n = values.shape[0]
         if n == 0:
             return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
 
         # LOF in unsupervised mode
-        lof = LocalOutlierFactor(
-            n_neighbors=min(self.n_neighbors, max(2, n - 1)),
+        lof = LOF1D(
+            n_neighbors=self._n_neighbors_for(n),
             contamination=self.contamination,
         )
         labels = lof.fit_predict(values)  # -1 = outlier, 1 = inlier
@@ -48,4 +231,4 @@ class LOFDetector(BaseDetector):
         norm_scores = raw_scores / (raw_scores.max() + 1e-8)
 
         anomaly_labels = (labels == -1).astype(int)
-        return anomaly_labels, norm_scores.ravel()
+        return anomaly_labels, norm_scores
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
 
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
-from .base import BaseDetector
+from .base import FittableDetector
+from .lstm_numpy import WEIGHT_NAMES, NumpyLSTMAutoencoder, NumpyLSTMAutoencoderDetector, reconstruction_scores
+from .windowing import sliding_windows
 
 
-class LSTMAutoencoderDetector(BaseDetector):
+class LSTMAutoencoderDetector(FittableDetector):
     """
     LSTM autoencoder for 1D time-series anomaly detection.
 
@@ -19,9 +21,20 @@ class LSTMAutoencoderDetector(BaseDetector):
       - Compute reconstruction error for each window.
       - Map window-level anomaly scores back to point-level scores.
 
+    Windows are strided read-only views of the series. Training streams
+    batches of windows through a `tf.data` pipeline and inference scores
+    them in fixed-size chunks, so memory stays bounded by the batch size
+    rather than n_windows * window_size.
+
     NOTE:
       This detector has a `fit` step. For convenience, if you call detect()
       before fit(), it will perform a quick fit on the provided values.
+      `score` never trains. Pickling keeps the trained weights, so a fitted
+      detector can be cached or spilled to disk.
+
+    Inference without TensorFlow: `export_weights(path)` writes a compact
+    .npz artifact that `NumpyLSTMAutoencoderDetector` (detectors.lstm_numpy)
+    scores with a pure-NumPy forward pass.
 
     Parameters
     ----------
@@ -33,6 +46,9 @@ class LSTMAutoencoderDetector(BaseDetector):
         Training epochs.
     batch_size : int
         Batch size for training.
+    train_stride : int
+        Step between consecutive training windows. Values > 1 subsample the
+        (highly overlapping) training windows; scoring always uses every window.
     """
 
     def __init__(
@@ -41,11 +57,13 @@ class LSTMAutoencoderDetector(BaseDetector):
         latent_dim: int = 16,
         epochs: int = 10,
         batch_size: int = 32,
+        train_stride: int = 1,
     ):
         self.window_size = int(window_size)
         self.latent_dim = int(latent_dim)
         self.epochs = int(epochs)
         self.batch_size = int(batch_size)
+        self.train_stride = max(1, int(train_stride))
 
         self.model: Optional[tf.keras.Model] = None
         self._trained = False
@@ -61,81 +79,123 @@ class LSTMAutoencoderDetector(BaseDetector):
         model.compile(optimizer="adam", loss="mse")
         self.model = model
 
-    def _create_windows(self, values: np.ndarray) -> np.ndarray:
+    def _create_windows(self, values: np.ndarray, stride: int = 1) -> np.ndarray:
         """
-        Build overlapping windows [n_windows, window_size, 1]
+        Overlapping windows [n_windows, window_size, 1] as a read-only view.
         """
-        n = len(values)
-        if n < self.window_size:
-            return np.empty((0, self.window_size, 1))
-
-        windows = []
-        for i in range(n - self.window_size + 1):
-            window = values[i : i + self.window_size]
-            windows.append(window)
-        windows = np.array(windows, dtype=float)
+        windows = sliding_windows(values, self.window_size, stride)
         return windows[..., np.newaxis]  # add feature dim
 
-    def fit(self, values: np.ndarray):
+    def _training_dataset(self, values: np.ndarray) -> tf.data.Dataset:
+        """
+        Stream (window, window) training batches.
+
+        Only the series and the window start offsets are handed to TensorFlow;
+        each batch of windows is gathered on the fly.
+        """
+        n_windows = len(values) - self.window_size + 1
+        starts = np.arange(0, n_windows, self.train_stride, dtype=np.int64)
+
+        series = tf.constant(values, dtype=tf.float32)
+        offsets = tf.range(self.window_size, dtype=tf.int64)
+
+        def gather(batch_starts):
+            windows = tf.gather(series, batch_starts[:, tf.newaxis] + offsets)[..., tf.newaxis]
+            return windows, windows
+
+        return (
+            tf.data.Dataset.from_tensor_slices(starts)
+            .shuffle(len(starts))
+            .batch(self.batch_size)
+            .map(gather, num_parallel_calls=tf.data.AUTOTUNE)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        model = state.pop("model")
+        state["_weights"] = model.get_weights() if model is not None else None
+        return state
+
+    def __setstate__(self, state):
+        weights = state.pop("_weights", None)
+        self.__dict__.update(state)
+        self.model = None
+        if weights is not None:
+            self._build_model()
+            self.model.set_weights(weights)
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._trained
+
+    def fit(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> "LSTMAutoencoderDetector":
         """
-        Fit the LSTM autoencoder on the given series.
+        Fit the LSTM autoencoder on the given series. `timestamps` is ignored.
         """
         values = np.asarray(values, dtype=float)
-        windows = self._create_windows(values)
-        if windows.shape[0] == 0:
-            return
+        if len(values) < self.window_size:
+            return self
 
         if self.model is None:
             self._build_model()
 
         self.model.fit(
-            windows,
-            windows,
+            self._training_dataset(values),
             epochs=self.epochs,
-            batch_size=self.batch_size,
+            shuffle=False,  # the dataset shuffles window offsets itself
             verbose=0,
         )
         self._trained = True
+        return self
 
     def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         values = np.asarray(values, dtype=float)
-        n = len(values)
-        if n == 0:
+        if len(values) == 0:
             return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
 
         if not self._trained:
             # Quick self-fit on the provided values
             self.fit(values)
 
-        windows = self._create_windows(values)
-        if windows.shape[0] == 0:
-            return np.zeros(n, dtype=int), np.zeros(n, dtype=float)
-
-        recon = self.model.predict(windows, verbose=0)
-        # MSE per window
-        window_errors = np.mean((windows - recon) ** 2, axis=(1, 2))
+        return self.score(values)
 
-        # Map window error to point-level scores:
-        # assign each window error to its center point
-        point_scores = np.zeros(n)
-        counts = np.zeros(n)
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score values with the trained autoencoder. `timestamps` is ignored."""
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
 
-        half = self.window_size // 2
-        for i, err in enumerate(window_errors):
-            center = i + half
-            if center < n:
-                point_scores[center] += err
-                counts[center] += 1
+        if n >= self.window_size:
+            self._check_fitted()
 
-        # average where multiple windows overlap
-        mask = counts > 0
-        point_scores[mask] /= counts[mask]
+        return reconstruction_scores(
+            lambda chunk: self.model.predict_on_batch(chunk),
+            values,
+            self.window_size,
+        )
 
-        # normalize scores to [0, 1+]
-        if point_scores.max() > 0:
-            point_scores = point_scores / point_scores.max()
+    def numpy_weights(self) -> Dict[str, np.ndarray]:
+        """Trained weights in the layout expected by NumpyLSTMAutoencoder."""
+        self._check_fitted()
+        encoder, decoder = [l for l in self.model.layers if isinstance(l, layers.LSTM)]
+        dense = next(l for l in self.model.layers if isinstance(l, layers.TimeDistributed))
+        arrays = [*encoder.get_weights(), *decoder.get_weights(), *dense.get_weights()]
+        return dict(zip(WEIGHT_NAMES, arrays))
 
-        # simple threshold for labels
-        labels = (point_scores > 0.8).astype(int)
+    def to_numpy(self) -> NumpyLSTMAutoencoderDetector:
+        """TensorFlow-free scoring detector with the current trained weights."""
+        model = NumpyLSTMAutoencoder(self.numpy_weights(), window_size=self.window_size)
+        return NumpyLSTMAutoencoderDetector(model=model)
 
-        return labels, point_scores
+    def export_weights(self, path: str) -> None:
+        """
+        Write the trained weights and config to a .npz artifact for
+        NumpyLSTMAutoencoderDetector.
+        """
+        NumpyLSTMAutoencoder(self.numpy_weights(), window_size=self.window_size).save(path)
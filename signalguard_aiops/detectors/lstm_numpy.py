@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .base import BaseDetector
+from .windowing import sliding_windows, window_scores_to_points
+
+# Windows scored per inference call; bounds memory for long series
+_PREDICT_CHUNK = 4096
+
+# Arrays stored in an exported LSTM autoencoder artifact
+WEIGHT_NAMES = (
+    "encoder_kernel",
+    "encoder_recurrent_kernel",
+    "encoder_bias",
+    "decoder_kernel",
+    "decoder_recurrent_kernel",
+    "decoder_bias",
+    "dense_kernel",
+    "dense_bias",
+)
+
+
+def reconstruction_scores(
+    predict: Callable[[np.ndarray], np.ndarray],
+    values: np.ndarray,
+    window_size: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Point-level labels / scores from an autoencoder's reconstruction error.
+
+    `predict` maps a (batch, window_size, 1) float32 array of windows to its
+    reconstruction. Windows are fed in fixed-size chunks, each window's MSE
+    is assigned to its center point, scores are normalized by their maximum
+    and points above 0.8 are labelled anomalous.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    windows = sliding_windows(values, window_size)[..., np.newaxis]
+    if windows.shape[0] == 0:
+        return np.zeros(n, dtype=int), np.zeros(n, dtype=float)
+
+    # MSE per window, scored chunk by chunk
+    window_errors = np.empty(windows.shape[0])
+    for start in range(0, windows.shape[0], _PREDICT_CHUNK):
+        chunk = windows[start : start + _PREDICT_CHUNK]
+        recon = np.asarray(predict(chunk.astype(np.float32)))
+        window_errors[start : start + len(chunk)] = np.mean((chunk - recon) ** 2, axis=(1, 2))
+
+    # Map window error to point-level scores:
+    # assign each window error to its center point
+    point_scores = window_scores_to_points(window_errors, n, window_size)
+
+    # normalize scores to [0, 1+]
+    if point_scores.max() > 0:
+        point_scores = point_scores / point_scores.max()
+
+    # simple threshold for labels
+    labels = (point_scores > 0.8).astype(int)
+
+    return labels, point_scores
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + np.tanh(0.5 * x))
+
+
+def _lstm_step(
+    z: np.ndarray,
+    c: np.ndarray,
+    units: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Keras gate order: input, forget, cell, output
+    i = _sigmoid(z[:, :units])
+    f = _sigmoid(z[:, units : 2 * units])
+    g = np.tanh(z[:, 2 * units : 3 * units])
+    o = _sigmoid(z[:, 3 * units :])
+    c = f * c + i * g
+    h = o * np.tanh(c)
+    return h, c
+
+
+class NumpyLSTMAutoencoder:
+    """
+    Pure-NumPy forward pass of the LSTMAutoencoderDetector network.
+
+    Architecture (as built by LSTMAutoencoderDetector):
+      LSTM(latent_dim) -> RepeatVector(window_size)
+      -> LSTM(latent_dim, return_sequences=True) -> TimeDistributed(Dense(1))
+
+    All windows of a batch advance through the recurrences together, so one
+    matrix product per timestep covers the whole batch. The decoder input is
+    the same encoding at every timestep, so its input projection is computed
+    once.
+
+    Parameters
+    ----------
+    weights : dict
+        Arrays named as in WEIGHT_NAMES, in Keras layout.
+    window_size : int
+        Number of timesteps per window.
+    dtype : numpy dtype
+        Compute precision. float32 matches TensorFlow.
+    """
+
+    def __init__(self, weights: Dict[str, np.ndarray], window_size: int, dtype=np.float32):
+        missing = [k for k in WEIGHT_NAMES if k not in weights]
+        if missing:
+            raise ValueError(f"missing LSTM autoencoder weights: {', '.join(missing)}")
+
+        self.window_size = int(window_size)
+        self.dtype = np.dtype(dtype)
+        self.weights = {k: np.asarray(weights[k], dtype=self.dtype) for k in WEIGHT_NAMES}
+        self.latent_dim = self.weights["encoder_recurrent_kernel"].shape[0]
+
+    @classmethod
+    def load(cls, path: str, dtype=np.float32) -> "NumpyLSTMAutoencoder":
+        """Load an artifact written by `save` / `LSTMAutoencoderDetector.export_weights`."""
+        with np.load(path, allow_pickle=False) as data:
+            config = json.loads(str(data["config"]))
+            weights = {k: data[k] for k in WEIGHT_NAMES}
+        return cls(weights, window_size=config["window_size"], dtype=dtype)
+
+    def save(self, path: str) -> None:
+        """Write the weights and config to a compressed .npz artifact."""
+        config = {"window_size": self.window_size, "latent_dim": self.latent_dim}
+        np.savez_compressed(path, config=np.array(json.dumps(config)), **self.weights)
+
+    def predict(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Reconstruct a batch of windows.
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            Array of shape (batch, window_size, 1) or (batch, window_size).
+
+        Returns
+        -------
+        np.ndarray
+            Reconstruction of shape (batch, window_size, 1).
+        """
+        w = self.weights
+        u = self.latent_dim
+        x = np.asarray(windows, dtype=self.dtype).reshape(-1, self.window_size, 1)
+        batch = x.shape[0]
+
+        # Encoder: precompute the input projection for all timesteps
+        xz = x @ w["encoder_kernel"] + w["encoder_bias"]  # (batch, T, 4u)
+        h = np.zeros((batch, u), dtype=self.dtype)
+        c = np.zeros((batch, u), dtype=self.dtype)
+        for t in range(self.window_size):
+            h, c = _lstm_step(xz[:, t] + h @ w["encoder_recurrent_kernel"], c, u)
+
+        # Decoder: RepeatVector feeds the same encoding at every timestep
+        ez = h @ w["decoder_kernel"] + w["decoder_bias"]  # (batch, 4u)
+        h = np.zeros((batch, u), dtype=self.dtype)
+        c = np.zeros((batch, u), dtype=self.dtype)
+        hidden = np.empty((batch, self.window_size, u), dtype=self.dtype)
+        for t in range(self.window_size):
+            h, c = _lstm_step(ez + h @ w["decoder_recurrent_kernel"], c, u)
+            hidden[:, t] = h
+
+        return hidden @ w["dense_kernel"] + w["dense_bias"]
+
+
+class NumpyLSTMAutoencoderDetector(BaseDetector):
+    """
+    Score-only LSTM autoencoder detector that runs without TensorFlow.
+
+    Loads an artifact exported from a trained LSTMAutoencoderDetector and
+    produces the same labels / scores as its `score` method, using
+    NumpyLSTMAutoencoder for inference.
+
+    Parameters
+    ----------
+    path : str, optional
+        Artifact to load.
+    model : NumpyLSTMAutoencoder, optional
+        Already loaded network, used instead of `path`.
+    """
+
+    def __init__(self, path: Optional[str] = None, model: Optional[NumpyLSTMAutoencoder] = None):
+        if model is None:
+            if path is None:
+                raise ValueError("either path or model is required")
+            model = NumpyLSTMAutoencoder.load(path)
+        self.path = path
+        self.model = model
+        self.window_size = model.window_size
+
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+        return reconstruction_scores(self.model.predict, values, self.window_size)
+
+    def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self.score(values)
@@ -1,15 +1,40 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Hashable, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
 
-from .base import BaseDetector
+from .base import FittableDetector
+from ..metrics import TimeSeries
 
+# One Stan backend per process, shared by every Prophet model fitted in it
+_SHARED_BACKEND = None
 
-class ProphetResidualDetector(BaseDetector):
+
+class _SharedBackendProphet(Prophet):
+    """
+    Prophet that reuses the process-wide Stan backend.
+
+    Prophet loads (and validates) the compiled cmdstan model in every
+    constructor; fitting many series in one process only needs it once.
+    """
+
+    def _load_stan_backend(self, stan_backend):
+        global _SHARED_BACKEND
+        if _SHARED_BACKEND is None or stan_backend is not None:
+            super()._load_stan_backend(stan_backend)
+            if stan_backend is None:
+                _SHARED_BACKEND = self.stan_backend
+        else:
+            self.stan_backend = _SHARED_BACKEND
+
+
+class ProphetResidualDetector(FittableDetector):
     """
     Anomaly detector based on forecasting with Prophet and inspecting residuals.
 
@@ -19,6 +44,15 @@ class ProphetResidualDetector(BaseDetector):
       3. Compute residual = y - yhat.
       4. Standardize residuals and flag large deviations.
 
+    `fit` runs steps 1-3 on a training window and keeps the model together
+    with the residual mean / std; `score` only predicts on the given
+    timestamps and standardizes with the training residual statistics.
+    `detect` fits and scores the same values.
+
+    Fitted detectors pickle through Prophet's JSON serialization, so they can
+    be cached (ModelRegistry) or returned from worker processes
+    (see ProphetFleet).
+
     Parameters
     ----------
     z_thresh : float
@@ -41,6 +75,92 @@ class ProphetResidualDetector(BaseDetector):
         self.daily_seasonality = daily_seasonality
         self.yearly_seasonality = yearly_seasonality
 
+        self.model: Optional[Prophet] = None
+        self.residual_mean_ = 0.0
+        self.residual_std_ = 1.0
+        self._fitted = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.model is not None:
+            state["model"] = model_to_json(self.model)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if isinstance(self.model, str):
+            self.model = model_from_json(self.model)
+
+    @staticmethod
+    def _frame(n: int, timestamps: Optional[np.ndarray] = None) -> pd.DataFrame:
+        if timestamps is None:
+            # Build a simple time index
+            ds = pd.date_range(start="2025-01-01", periods=n, freq="min")
+        else:
+            timestamps = np.asarray(timestamps, dtype=float)
+            ds = pd.to_datetime(timestamps, unit="s")
+        return pd.DataFrame({"ds": ds})
+
+    def fit(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> "ProphetResidualDetector":
+        """
+        Fit Prophet on the series and record the in-sample residual statistics.
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return self
+
+        df = self._frame(n, timestamps)
+        df["y"] = values
+
+        m = _SharedBackendProphet(
+            weekly_seasonality=self.weekly_seasonality,
+            daily_seasonality=self.daily_seasonality,
+            yearly_seasonality=self.yearly_seasonality,
+        )
+        m.fit(df)
+
+        forecast = m.predict(df)
+        residuals = values - forecast["yhat"].to_numpy()
+
+        self.model = m
+        self.residual_mean_ = float(residuals.mean())
+        self.residual_std_ = float(residuals.std() or 1e-8)
+        self._fitted = True
+        return self
+
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score values against the fitted forecast (predict only, no refit).
+
+        Pass the timestamps of the values: without them the points are placed
+        on the same synthetic minute grid used for training, starting again
+        at the first training point.
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        self._check_fitted()
+
+        forecast = self.model.predict(self._frame(n, timestamps))
+        residuals = values - forecast["yhat"].to_numpy()
+
+        z = (residuals - self.residual_mean_) / self.residual_std_
+        scores = np.abs(z)
+        labels = (scores >= self.z_thresh).astype(int)
+
+        return labels, scores
+
     def detect(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
         """
         Detect anomalies based on Prophet residuals.
@@ -59,35 +179,111 @@ class ProphetResidualDetector(BaseDetector):
             scores: standardized residual magnitude
         """
         values = np.asarray(values, dtype=float)
-        n = len(values)
-        if n == 0:
+        if len(values) == 0:
             return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
 
-        if timestamps is None:
-            # Build a simple time index
-            ds = pd.date_range(start="2025-01-01", periods=n, freq="T")
-        else:
-            timestamps = np.asarray(timestamps, dtype=float)
-            ds = pd.to_datetime(timestamps, unit="s")
+        return self.fit(values, timestamps).score(values, timestamps)
 
-        df = pd.DataFrame({"ds": ds, "y": values})
 
-        m = Prophet(
-            weekly_seasonality=self.weekly_seasonality,
-            daily_seasonality=self.daily_seasonality,
-            yearly_seasonality=self.yearly_seasonality,
-        )
-        m.fit(df)
+def _fit_worker(
+    detector: ProphetResidualDetector,
+    values: np.ndarray,
+    timestamps: Optional[np.ndarray],
+) -> ProphetResidualDetector:
+    return detector.fit(values, timestamps)
 
-        forecast = m.predict(df)
-        yhat = forecast["yhat"].to_numpy()
-        residuals = values - yhat
 
-        mean_res = residuals.mean()
-        std_res = residuals.std() or 1e-8
+def _init_worker() -> None:
+    # Load the Stan backend once per worker, before the first task arrives
+    _SharedBackendProphet()
 
-        z = (residuals - mean_res) / std_res
-        scores = np.abs(z)
-        labels = (scores >= self.z_thresh).astype(int)
 
-        return labels, scores
+class ProphetFleet:
+    """
+    Fit ProphetResidualDetector on many series in a process pool and keep
+    the fitted models for predict-only scoring of new data.
+
+    Each worker process loads the Stan backend once and reuses it for every
+    series it fits. At most `2 * max_workers` series are in flight at any
+    time, so memory use does not grow with the fleet size.
+
+    Parameters
+    ----------
+    detector : ProphetResidualDetector, optional
+        Unfitted template whose parameters are used for every series.
+    max_workers : int, optional
+        Number of worker processes (defaults to the CPU count).
+    mp_context : multiprocessing context, optional
+        Start method for the workers, e.g. multiprocessing.get_context("spawn").
+
+    Attributes
+    ----------
+    models : dict
+        Fitted detectors by series key.
+    errors : dict
+        Exceptions raised while fitting, by series key.
+    """
+
+    def __init__(
+        self,
+        detector: Optional[ProphetResidualDetector] = None,
+        max_workers: Optional[int] = None,
+        mp_context=None,
+    ):
+        self.detector = detector or ProphetResidualDetector()
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self.models: Dict[Hashable, ProphetResidualDetector] = {}
+        self.errors: Dict[Hashable, BaseException] = {}
+
+    def fit(self, series: Mapping[Hashable, TimeSeries]) -> Dict[Hashable, ProphetResidualDetector]:
+        """
+        Fit one model per series in parallel. Returns the fitted models of
+        this call; failures are recorded in `errors` instead of raising.
+        """
+        fitted: Dict[Hashable, ProphetResidualDetector] = {}
+        items = iter(series.items())
+
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+        ) as pool:
+            max_in_flight = 2 * (self.max_workers or os.cpu_count() or 1)
+            pending = {}
+
+            def submit_next() -> bool:
+                for key, ts in items:
+                    future = pool.submit(_fit_worker, self.detector, ts.values, ts.timestamps)
+                    pending[future] = key
+                    return True
+                return False
+
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    try:
+                        fitted[key] = future.result()
+                        self.errors.pop(key, None)
+                    except Exception as exc:
+                        self.errors[key] = exc
+                    submit_next()
+
+        self.models.update(fitted)
+        return fitted
+
+    def score(self, key: Hashable, series: TimeSeries) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score new points of a series with its stored model (predict only).
+        """
+        if key not in self.models:
+            raise KeyError(f"no fitted Prophet model for {key!r}")
+        return self.models[key].score(series.values, series.timestamps)
+
+    def score_many(self, series: Mapping[Hashable, TimeSeries]) -> Dict[Hashable, Tuple[np.ndarray, np.ndarray]]:
+        """Score the new tail of every series that has a stored model."""
+        return {key: self.score(key, ts) for key, ts in series.items() if key in self.models}
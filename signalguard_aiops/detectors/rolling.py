@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=4096)
+def constant_moments(value: float, count: int) -> Tuple[float, float]:
+    """
+    np.mean / np.std of `count` copies of `value`.
+
+    Not simply (value, 0.0): the pairwise sum rounds, so e.g. 30 copies of
+    0.1 have a std of about 1e-17. Used to reproduce np.std on constant
+    histories bit for bit.
+    """
+    history = np.full(int(count), value)
+    return float(history.mean()), float(history.std())
+
+
+def trailing_moments(
+    values: np.ndarray,
+    window: int,
+    block_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized mean / std over the trailing window of every point.
+
+    For point i the history is values[max(0, i - window):i], i.e. the current
+    point is excluded. This is the baseline used by ZScoreDetector.
+
+    The sums are computed with prefix sums (O(n) overall), restarted on blocks
+    of `block_size` points and shifted by the block mean so the running sums
+    never accumulate the magnitude of the whole series. Histories made of one
+    repeated value are detected exactly (integer change counts) and get the
+    mean / std np.mean / np.std report on that slice (see `constant_moments`),
+    so a z-score on a flat baseline matches the per-point loop: the std is 0.0
+    for values like 1.0 but a tiny rounding residue for values like 0.1.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values, or a (n_series, n_points) batch; statistics are
+        computed along the last axis.
+    window : int
+        Maximum number of history points.
+    block_size : int, optional
+        Number of output points per prefix-sum block. Defaults to
+        max(256, 8 * window).
+
+    Returns
+    -------
+    count, mean, std : tuple of np.ndarray
+        count: number of history points for each position (min(i, window)),
+               shape (n_points,)
+        mean: history mean (NaN for empty or non-finite histories),
+              same shape as values
+        std: population std of the history (NaN where mean is NaN)
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[-1]
+    window = int(window)
+    if window < 1:
+        raise ValueError("window must be >= 1")
+
+    idx = np.arange(n)
+    count = np.minimum(idx, window)
+    start = idx - count
+    mean = np.full(values.shape, np.nan)
+    std = np.full(values.shape, np.nan)
+
+    if n == 0:
+        return count, mean, std
+
+    finite = np.isfinite(values)
+    clean = np.where(finite, values, 0.0)
+    zero = np.zeros(values.shape[:-1] + (1,))
+
+    # prefix counts: bad[..., j] = non-finite points in values[..., :j],
+    # changes[..., j] = number of k < j with values[k] != values[k - 1]
+    bad = np.concatenate((zero, np.cumsum(~finite, axis=-1)), axis=-1)
+    changes = np.concatenate(
+        (zero, zero, np.cumsum(values[..., 1:] != values[..., :-1], axis=-1)), axis=-1
+    )
+
+    if block_size is None:
+        block_size = max(256, 8 * window)
+
+    for b in range(0, n, block_size):
+        e = min(b + block_size, n)
+        lo = max(0, b - window)
+        seg = clean[..., lo:e]
+        shift = seg.mean(axis=-1, keepdims=True)
+        y = seg - shift
+        p1 = np.concatenate((zero, np.cumsum(y, axis=-1)), axis=-1)
+        p2 = np.concatenate((zero, np.cumsum(y * y, axis=-1)), axis=-1)
+
+        i = idx[b:e] - lo
+        s = start[b:e] - lo
+        nz = np.maximum(count[b:e], 1)
+        m = (p1[..., i] - p1[..., s]) / nz
+        var = np.maximum((p2[..., i] - p2[..., s]) / nz - m * m, 0.0)
+        mean[..., b:e] = shift + m
+        std[..., b:e] = np.sqrt(var)
+
+    # exact constant histories: moments of the repeated value, as np.std
+    # would compute them (one evaluation per distinct value and length)
+    constant = (count > 0) & (changes[..., idx] == changes[..., np.minimum(start + 1, n)])
+    if constant.any():
+        repeated = values[..., np.maximum(idx - 1, 0)][constant]
+        lengths = np.broadcast_to(count, values.shape)[constant]
+        pairs, inverse = np.unique(np.stack([repeated, lengths]), axis=1, return_inverse=True)
+        moments = np.array([constant_moments(v, int(c)) for v, c in pairs.T]).reshape(-1, 2)
+        inverse = inverse.reshape(-1)
+        mean[constant] = moments[inverse, 0]
+        std[constant] = moments[inverse, 1]
+
+    # empty or non-finite histories behave like np.mean / np.std on the slice
+    invalid = (count == 0) | (bad[..., idx] - bad[..., start] > 0)
+    mean[invalid] = np.nan
+    std[invalid] = np.nan
+
+    return count, mean, std
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .base import FittableDetector, _check_batch
+
+DAY = 86400.0
+WEEK = 7 * DAY
+YEAR = 365.25 * DAY
+
+# attributes set by fit(); detect_batch restores them when it is done
+_FITTED_STATE = ("coef_", "t0_", "t_scale_", "residual_mean_", "residual_std_", "_fitted")
+
+
+def _default_timestamps(n: int) -> np.ndarray:
+    # same fallback grid as ProphetResidualDetector: one point per minute
+    return np.arange(n, dtype=float) * 60.0
+
+
+class SeasonalResidualDetector(FittableDetector):
+    """
+    Lightweight alternative to ProphetResidualDetector.
+
+    Fits a linear trend (optionally with hinge changepoints) plus Fourier
+    seasonal terms by ordinary least squares, then flags large standardized
+    residuals, exactly like the Prophet detector does with its forecast:
+
+      1. Build the design matrix [1, t, hinges..., sin/cos(2*pi*k*t/P)...].
+      2. Solve for the coefficients with np.linalg.lstsq.
+      3. residual = y - X @ beta, z = (residual - mean) / std.
+
+    `detect_batch` fits every series that shares a timestamp grid with one
+    least-squares call on the shared design matrix.
+
+    Parameters
+    ----------
+    z_thresh : float
+        Threshold on standardized residuals to mark anomalies.
+    weekly_seasonality : bool
+    daily_seasonality : bool
+    yearly_seasonality : bool
+        Seasonality switches, as for ProphetResidualDetector.
+    daily_order, weekly_order, yearly_order : int
+        Number of Fourier pairs per seasonality (Prophet's defaults).
+    n_changepoints : int
+        Number of evenly spaced trend changepoints in the first 80% of the
+        training span. 0 gives a single linear trend.
+    """
+
+    def __init__(
+        self,
+        z_thresh: float = 3.0,
+        weekly_seasonality: bool = False,
+        daily_seasonality: bool = False,
+        yearly_seasonality: bool = False,
+        daily_order: int = 4,
+        weekly_order: int = 3,
+        yearly_order: int = 10,
+        n_changepoints: int = 0,
+    ):
+        self.z_thresh = float(z_thresh)
+        self.weekly_seasonality = weekly_seasonality
+        self.daily_seasonality = daily_seasonality
+        self.yearly_seasonality = yearly_seasonality
+        self.daily_order = int(daily_order)
+        self.weekly_order = int(weekly_order)
+        self.yearly_order = int(yearly_order)
+        self.n_changepoints = int(n_changepoints)
+
+        self.coef_: Optional[np.ndarray] = None
+        self.t0_ = 0.0
+        self.t_scale_ = 1.0
+        self.residual_mean_ = 0.0
+        self.residual_std_ = 1.0
+        self._fitted = False
+
+    # ------------------------------------------------------------------
+    # Design matrix
+    # ------------------------------------------------------------------
+    def _periods(self):
+        periods = []
+        if self.daily_seasonality:
+            periods.append((DAY, self.daily_order))
+        if self.weekly_seasonality:
+            periods.append((WEEK, self.weekly_order))
+        if self.yearly_seasonality:
+            periods.append((YEAR, self.yearly_order))
+        return periods
+
+    def design_matrix(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Regression design for the given timestamps (seconds), using the time
+        origin and scale of the last fit (or of `timestamps` if unfitted).
+        """
+        timestamps = np.asarray(timestamps, dtype=float)
+        if not self._fitted:
+            self._set_time_scale(timestamps)
+
+        t = (timestamps - self.t0_) / self.t_scale_
+        columns = [np.ones_like(t), t]
+
+        if self.n_changepoints > 0:
+            changepoints = np.linspace(0.0, 0.8, self.n_changepoints + 1)[1:]
+            columns.extend(np.maximum(t - c, 0.0) for c in changepoints)
+
+        for period, order in self._periods():
+            k = np.arange(1, order + 1)
+            angle = 2 * np.pi * np.outer(timestamps / period, k)
+            columns.extend(np.sin(angle).T)
+            columns.extend(np.cos(angle).T)
+
+        return np.column_stack(columns)
+
+    def _set_time_scale(self, timestamps: np.ndarray) -> None:
+        if len(timestamps):
+            self.t0_ = float(timestamps[0])
+            self.t_scale_ = float(timestamps[-1] - timestamps[0]) or 1.0
+
+    # ------------------------------------------------------------------
+    # Fit / score
+    # ------------------------------------------------------------------
+    def fit(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> "SeasonalResidualDetector":
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return self
+        if timestamps is None:
+            timestamps = _default_timestamps(n)
+
+        self._fitted = False
+        self._set_time_scale(np.asarray(timestamps, dtype=float))
+        X = self.design_matrix(timestamps)
+
+        # fit on finite points only (missing samples are ignored)
+        finite = np.isfinite(values)
+        coef, *_ = np.linalg.lstsq(X[finite], values[finite], rcond=None)
+        residuals = values[finite] - X[finite] @ coef
+
+        self.coef_ = coef
+        self.residual_mean_ = float(residuals.mean()) if residuals.size else 0.0
+        self.residual_std_ = float(residuals.std() or 1e-8) if residuals.size else 1e-8
+        self._fitted = True
+        return self
+
+    def score(
+        self,
+        values: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        if n == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        self._check_fitted()
+        if timestamps is None:
+            timestamps = _default_timestamps(n)
+
+        residuals = values - self.design_matrix(timestamps) @ self.coef_
+        z = (residuals - self.residual_mean_) / self.residual_std_
+        scores = np.where(np.isfinite(z), np.abs(z), 0.0)
+        labels = (scores >= self.z_thresh).astype(int)
+        return labels, scores
+
+    def detect(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect anomalies based on seasonal-regression residuals.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            1D array of values.
+        timestamps : np.ndarray, optional
+            1D array of timestamps in seconds. If None, uses a one-minute grid.
+
+        Returns
+        -------
+        labels, scores : tuple of np.ndarray
+            labels: 0/1 anomalies
+            scores: standardized residual magnitude
+        """
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+        return self.fit(values, timestamps).score(values, timestamps)
+
+    def detect_batch(
+        self,
+        values: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+        timestamps: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Detect anomalies in a (n_series, n_points) matrix on one timestamp grid.
+
+        Fully valid, finite rows are solved together with a single lstsq call
+        on the shared design matrix; rows with masked or missing points are
+        fitted individually on their valid points. The detector's own fitted
+        model (from `fit`) is left untouched.
+        """
+        state = {k: getattr(self, k) for k in _FITTED_STATE}
+        try:
+            return self._detect_batch(values, mask, timestamps)
+        finally:
+            self.__dict__.update(state)
+
+    def _detect_batch(
+        self,
+        values: np.ndarray,
+        mask: Optional[np.ndarray],
+        timestamps: Optional[np.ndarray],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values, mask = _check_batch(values, mask)
+        n_series, n = values.shape
+        labels = np.zeros(values.shape, dtype=int)
+        scores = np.zeros(values.shape, dtype=float)
+        if n == 0:
+            return labels, scores
+
+        if timestamps is None:
+            timestamps = _default_timestamps(n)
+        timestamps = np.asarray(timestamps, dtype=float)
+
+        valid = np.isfinite(values) if mask is None else mask & np.isfinite(values)
+        dense = valid.all(axis=1)
+
+        if dense.any():
+            self._fitted = False
+            self._set_time_scale(timestamps)
+            X = self.design_matrix(timestamps)
+            Y = values[dense].T  # (n_points, n_dense)
+            coef, *_ = np.linalg.lstsq(X, Y, rcond=None)
+            residuals = (Y - X @ coef).T
+            mean = residuals.mean(axis=1, keepdims=True)
+            std = residuals.std(axis=1, keepdims=True)
+            std = np.where(std == 0, 1e-8, std)
+            z = np.abs((residuals - mean) / std)
+            scores[dense] = z
+            labels[dense] = z >= self.z_thresh
+
+        for r in np.flatnonzero(~dense):
+            keep = valid[r]
+            if keep.any():
+                labels[r, keep], scores[r, keep] = self.detect(values[r, keep], timestamps[keep])
+
+        return labels, scores
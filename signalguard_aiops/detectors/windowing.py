@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(values: np.ndarray, window_size: int, stride: int = 1) -> np.ndarray:
+    """
+    Overlapping windows of a 1D series as a read-only strided view.
+
+    Window i covers values[i * stride : i * stride + window_size]. No data is
+    copied, so building windows over a long series costs O(1) memory.
+
+    Returns
+    -------
+    np.ndarray
+        View of shape (n_windows, window_size), empty if the series is
+        shorter than one window.
+    """
+    values = np.asarray(values, dtype=float)
+    window_size = int(window_size)
+    if len(values) < window_size:
+        return np.empty((0, window_size))
+
+    windows = sliding_window_view(values, window_size)  # read-only view
+    return windows[:: int(stride)]
+
+
+def window_scores_to_points(
+    window_scores: np.ndarray,
+    n: int,
+    window_size: int,
+    stride: int = 1,
+) -> np.ndarray:
+    """
+    Map window-level scores to point-level scores.
+
+    Each window score is assigned to the window's center point; points that
+    receive several windows get their average, points that receive none get 0.
+    """
+    window_scores = np.asarray(window_scores, dtype=float)
+    centers = np.arange(len(window_scores)) * int(stride) + int(window_size) // 2
+    keep = centers < n
+    centers, window_scores = centers[keep], window_scores[keep]
+
+    totals = np.bincount(centers, weights=window_scores, minlength=n)
+    counts = np.bincount(centers, minlength=n)
+
+    point_scores = np.zeros(n)
+    # average where multiple windows overlap
+    mask = counts > 0
+    point_scores[mask] = totals[mask] / counts[mask]
+    return point_scores
@@ -1,19 +1,28 @@
 from __future__ import annotations
 
-from typing import Tuple
+import math
+from typing import Optional, Tuple
 
 import numpy as np
 
-from .base import BaseDetector
+from .base import StreamingDetector, _check_batch, _detect_causal_masked
+from .rolling import constant_moments, trailing_moments
 
 
-class ZScoreDetector(BaseDetector):
+class ZScoreDetector(StreamingDetector):
     """
     Simple rolling z-score detector.
 
     For each point, compute (x - mean(window)) / std(window) and flag as anomalous
     if |z| >= z_thresh.
 
+    The rolling statistics are computed with a vectorized O(n) engine
+    (see `rolling.trailing_moments`). The original per-point loop is kept as
+    `detect_reference` for equivalence checks.
+
+    Streaming: `update` / `update_many` keep a ring buffer of the last
+    `window` points with running sums, so each new point costs O(1).
+
     Parameters
     ----------
     window : int
@@ -28,10 +37,55 @@ class ZScoreDetector(BaseDetector):
         self.window = int(window)
         self.z_thresh = float(z_thresh)
         self.min_history = int(min_history)
+        self.reset()
 
     def detect(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         values = np.asarray(values, dtype=float)
         n = len(values)
+
+        if n == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=float)
+
+        count, mean, std = trailing_moments(values, self.window)
+        return self._score(values, count, mean, std)
+
+    def detect_batch(
+        self,
+        values: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        values, mask = _check_batch(values, mask)
+        if mask is not None:
+            return _detect_causal_masked(self.detect_batch, values, mask)
+
+        count, mean, std = trailing_moments(values, self.window)
+        return self._score(values, count, mean, std)
+
+    def _score(
+        self,
+        values: np.ndarray,
+        count: np.ndarray,
+        mean: np.ndarray,
+        std: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        std = np.where(std == 0, 1e-8, std)  # avoid division by zero
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.abs((values - mean) / std)
+
+        # Not enough history to compute a stable baseline
+        ready = count >= self.min_history
+        scores = np.where(ready, scores, 0.0)
+        labels = (ready & (scores >= self.z_thresh)).astype(int)
+
+        return labels, scores
+
+    def detect_reference(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reference per-point implementation of `detect` (O(n * window)).
+        """
+        values = np.asarray(values, dtype=float)
+        n = len(values)
         labels = np.zeros(n, dtype=int)
         scores = np.zeros(n, dtype=float)
 
@@ -57,3 +111,128 @@ class ZScoreDetector(BaseDetector):
             scores[i] = score
 
         return labels, scores
+
+    # ------------------------------------------------------------------
+    # Streaming API
+    # ------------------------------------------------------------------
+    def reset(self) -> None:
+        w = self.window
+        self._buf = np.zeros(w, dtype=float)  # ring buffer of raw values
+        self._changed = np.zeros(w, dtype=bool)  # value != previous value
+        self._head = 0  # position of the oldest point
+        self._size = 0
+        self._seen = 0
+        # running sums of (x - anchor) over the finite points in the buffer
+        self._anchor = 0.0
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._n_bad = 0
+        self._n_changed = 0
+        self._since_resum = 0
+
+    def update(self, x: float) -> Tuple[int, float]:
+        x = float(x)
+
+        if self._size < self.min_history:
+            label, score = 0, 0.0
+        else:
+            mean, std = self._moments()
+            std = std or 1e-8  # avoid division by zero
+            score = abs((x - mean) / std)
+            label = int(score >= self.z_thresh)
+
+        self._push(x)
+        return label, score
+
+    def update_many(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.asarray(values, dtype=float).ravel()
+        m = len(values)
+        if m < self.window:
+            return super().update_many(values)
+
+        # Large chunk: run the vectorized engine with the buffer as context
+        context = self._ordered_buffer()
+        full = np.concatenate([context, values])
+        count, mean, std = trailing_moments(full, self.window)
+        c = len(context)
+        labels, scores = self._score(values, count[c:], mean[c:], std[c:])
+
+        self._load_buffer(full[-self.window :])
+        self._seen += m
+        return labels, scores
+
+    def _moments(self) -> Tuple[float, float]:
+        size = self._size
+        if size == 0 or self._n_bad:
+            return math.nan, math.nan
+
+        w = self.window
+        if self._n_changed - self._changed[self._head] == 0:
+            # all history points are the same value
+            return constant_moments(float(self._buf[(self._head + size - 1) % w]), size)
+
+        m = self._s1 / size
+        var = max(self._s2 / size - m * m, 0.0)
+        return self._anchor + m, math.sqrt(var)
+
+    def _push(self, x: float) -> None:
+        w = self.window
+        changed = False
+        if self._size:
+            changed = x != self._buf[(self._head + self._size - 1) % w]
+        else:
+            self._anchor = x if math.isfinite(x) else 0.0
+
+        if self._size == w:
+            old = self._buf[self._head]
+            if math.isfinite(old):
+                y = old - self._anchor
+                self._s1 -= y
+                self._s2 -= y * y
+            else:
+                self._n_bad -= 1
+            self._n_changed -= int(self._changed[self._head])
+            self._head = (self._head + 1) % w
+            self._size -= 1
+
+        pos = (self._head + self._size) % w
+        self._buf[pos] = x
+        self._changed[pos] = changed
+        self._n_changed += int(changed)
+        if math.isfinite(x):
+            y = x - self._anchor
+            self._s1 += y
+            self._s2 += y * y
+        else:
+            self._n_bad += 1
+        self._size += 1
+        self._seen += 1
+
+        # Re-sum from the buffer once per window to stop rounding drift
+        self._since_resum += 1
+        if self._since_resum >= w:
+            self._resum()
+
+    def _ordered_buffer(self) -> np.ndarray:
+        idx = (self._head + np.arange(self._size)) % self.window
+        return self._buf[idx]
+
+    def _load_buffer(self, tail: np.ndarray) -> None:
+        k = len(tail)
+        self._buf[:k] = tail
+        self._changed[:] = False
+        self._changed[1:k] = tail[1:] != tail[:-1]
+        self._head = 0
+        self._size = k
+        self._n_changed = int(self._changed.sum())
+        self._resum()
+
+    def _resum(self) -> None:
+        vals = self._ordered_buffer()
+        finite = vals[np.isfinite(vals)]
+        self._anchor = float(finite.mean()) if finite.size else 0.0
+        y = finite - self._anchor
+        self._s1 = float(y.sum())
+        self._s2 = float((y * y).sum())
+        self._n_bad = int(vals.size - finite.size)
+        self._since_resum = 0
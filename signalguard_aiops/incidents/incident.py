@@ -44,7 +44,9 @@ class Incident:
         labels: np.ndarray,
         note: str = "",
     ) -> "Incident":
-        timestamps = np.asarray(timestamps, dtype=float)
+        # a copy: series timestamps may be views of a buffer that is reused
+        # later (RollingTimeSeries, Rollup raw window)
+        timestamps = np.array(timestamps, dtype=float)
         scores = np.asarray(scores, dtype=float)
         labels = np.asarray(labels, dtype=int)
 
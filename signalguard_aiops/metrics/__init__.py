@@ -1 +1,7 @@
 from .timeseries import TimeSeries
+from .frame import TimeSeriesFrame
+from .resample import align, fill_gaps, lttb, resample
+from .store import SeriesStore
+from .compressed import CompressedTimeSeries
+from .rolling import RollingTimeSeries
+from .rollup import Rollup, RollupTier
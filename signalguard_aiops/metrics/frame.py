@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .timeseries import TimeSeries, _as_seconds
+
+
+class TimeSeriesFrame:
+    """
+    Columnar container for many series on one shared timestamp index.
+
+    Attributes
+    ----------
+    timestamps : np.ndarray
+        Sorted, unique 1D array of n_points timestamps shared by all series.
+    values : np.ndarray
+        C-contiguous float64 matrix of shape (n_series, n_points). Points a
+        series does not have are NaN.
+    tags : list of dict
+        Per-series label set (e.g. Prometheus metric labels).
+    names : list of str
+        Per-series name.
+    mask : np.ndarray, optional
+        Extra boolean (n_series, n_points) validity mask. `valid` combines it
+        with the finiteness of `values`.
+
+    Rows are handed out as zero-copy TimeSeries views (`frame[i]`,
+    `frame["name"]`, iteration), and `detect` runs a detector over all rows
+    at once through `detect_batch`.
+    """
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        tags: Optional[Sequence[Mapping[str, str]]] = None,
+        names: Optional[Sequence[str]] = None,
+        mask: Optional[np.ndarray] = None,
+    ):
+        timestamps = _as_seconds(timestamps)
+        values = np.ascontiguousarray(values, dtype=float)
+        if timestamps.ndim != 1:
+            raise ValueError("timestamps must be 1D")
+        if values.ndim != 2 or values.shape[1] != len(timestamps):
+            raise ValueError(f"values must have shape (n_series, {len(timestamps)}), got {values.shape}")
+        if len(timestamps) > 1 and not np.all(np.diff(timestamps) > 0):
+            raise ValueError("timestamps must be sorted and unique")
+
+        n_series = values.shape[0]
+        self.timestamps = timestamps
+        self.values = values
+        self.tags: List[Dict[str, str]] = [dict(t) for t in tags] if tags is not None else [{} for _ in range(n_series)]
+        self.names: List[str] = list(names) if names is not None else [t.get("__name__", "") for t in self.tags]
+        if len(self.tags) != n_series or len(self.names) != n_series:
+            raise ValueError("tags and names must have one entry per series")
+
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != values.shape:
+                raise ValueError("mask must have the same shape as values")
+        self.mask = mask
+
+    # ------------------------------------------------------------------
+    # Constructors
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_series(
+        cls,
+        series: Sequence[TimeSeries],
+        tags: Optional[Sequence[Mapping[str, str]]] = None,
+    ) -> "TimeSeriesFrame":
+        """
+        Align TimeSeries on the union of their timestamps; points missing
+        from a series are NaN.
+        """
+        if not series:
+            return cls(np.zeros(0), np.zeros((0, 0)), tags=[], names=[])
+
+        timestamps = np.unique(np.concatenate([np.asarray(s.timestamps, dtype=float) for s in series]))
+        values = np.full((len(series), len(timestamps)), np.nan)
+        for i, s in enumerate(series):
+            idx = np.searchsorted(timestamps, np.asarray(s.timestamps, dtype=float))
+            values[i, idx] = s.values
+        return cls(timestamps, values, tags=tags, names=[s.name for s in series])
+
+    @classmethod
+    def from_prometheus(cls, response: Union[Mapping[str, Any], Sequence[Mapping[str, Any]]]) -> "TimeSeriesFrame":
+        """
+        Build a frame from a Prometheus range-query response.
+
+        Accepts the decoded JSON body of /api/v1/query_range (or just its
+        `data.result` list). Each result becomes one row, tagged with its
+        metric labels; the index is the union of all sample timestamps.
+        To parse a raw response body faster, see
+        `pipelines.prometheus_client.parse_range_response`.
+        """
+        if isinstance(response, Mapping):
+            results = response.get("data", {}).get("result", [])
+        else:
+            results = response
+
+        tags = [dict(r.get("metric", {})) for r in results]
+        lengths = [len(r.get("values", [])) for r in results]
+        n = sum(lengths)
+        # Prometheus sends [<float ts>, "<value>"] pairs
+        timestamps = np.fromiter((p[0] for r in results for p in r.get("values", [])), dtype=float, count=n)
+        values = np.fromiter((p[1] for r in results for p in r.get("values", [])), dtype=float, count=n)
+        return cls.from_samples(tags, lengths, timestamps, values)
+
+    @classmethod
+    def from_samples(
+        cls,
+        tags: Sequence[Mapping[str, str]],
+        lengths: Sequence[int],
+        timestamps: np.ndarray,
+        values: np.ndarray,
+    ) -> "TimeSeriesFrame":
+        """
+        Build a frame from concatenated samples: the first lengths[0] entries
+        of `timestamps` / `values` belong to series 0, and so on.
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=float)
+        if len(timestamps) != lengths.sum() or len(values) != len(timestamps):
+            raise ValueError("timestamps and values must hold sum(lengths) samples")
+
+        names = [t.get("__name__", "") for t in tags]
+        rows = np.repeat(np.arange(len(tags)), lengths)
+        index, cols = np.unique(timestamps, return_inverse=True)
+        matrix = np.full((len(tags), len(index)), np.nan)
+        matrix[rows, cols.reshape(-1)] = values
+        return cls(index, matrix, tags=tags, names=names)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def nbytes(self) -> int:
+        mask_bytes = self.mask.nbytes if self.mask is not None else 0
+        return self.values.nbytes + self.timestamps.nbytes + mask_bytes
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean (n_series, n_points) array: finite and not masked out."""
+        valid = np.isfinite(self.values)
+        if self.mask is not None:
+            valid &= self.mask
+        return valid
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def _row(self, key: Union[int, str]) -> int:
+        if isinstance(key, str):
+            try:
+                return self.names.index(key)
+            except ValueError:
+                raise KeyError(key) from None
+        return range(len(self))[key]
+
+    def __getitem__(self, key: Union[int, str]) -> TimeSeries:
+        """Zero-copy TimeSeries view of one row (by position or name)."""
+        i = self._row(key)
+        return TimeSeries._view(self.timestamps, self.values[i], self.names[i])
+
+    def __iter__(self) -> Iterator[TimeSeries]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def series(self, key: Union[int, str], dropna: bool = False) -> TimeSeries:
+        """
+        One row as a TimeSeries; with `dropna`, only its valid points (a copy).
+        """
+        if not dropna:
+            return self[key]
+        i = self._row(key)
+        keep = self.valid[i]
+        return TimeSeries(timestamps=self.timestamps[keep], values=self.values[i, keep], name=self.names[i])
+
+    def to_series_list(self, dropna: bool = True) -> List[TimeSeries]:
+        return [self.series(i, dropna=dropna) for i in range(len(self))]
+
+    def select(self, **matchers: str) -> "TimeSeriesFrame":
+        """Rows whose tags equal all `matchers`, e.g. frame.select(service="orders")."""
+        rows = [i for i, t in enumerate(self.tags) if all(t.get(k) == v for k, v in matchers.items())]
+        return self.take(rows)
+
+    def take(self, rows: Sequence[int]) -> "TimeSeriesFrame":
+        rows = list(rows)
+        return TimeSeriesFrame(
+            self.timestamps,
+            self.values[rows],
+            tags=[self.tags[i] for i in rows],
+            names=[self.names[i] for i in rows],
+            mask=self.mask[rows] if self.mask is not None else None,
+        )
+
+    def window(self, start_ts: float, end_ts: float) -> "TimeSeriesFrame":
+        """Columns with start_ts <= timestamp <= end_ts, as views (no copy)."""
+        lo = np.searchsorted(self.timestamps, start_ts, side="left")
+        hi = np.searchsorted(self.timestamps, end_ts, side="right")
+        frame = TimeSeriesFrame.__new__(TimeSeriesFrame)
+        frame.timestamps = self.timestamps[lo:hi]
+        frame.values = self.values[:, lo:hi]
+        frame.tags = self.tags
+        frame.names = self.names
+        frame.mask = self.mask[:, lo:hi] if self.mask is not None else None
+        return frame
+
+    def resample(self, step: float, agg: str = "mean", fill=None, limit: Optional[int] = None) -> "TimeSeriesFrame":
+        """Aggregate every row into `step`-second buckets; see `metrics.resample.align`."""
+        from .resample import align
+
+        return align(self, step, agg=agg, fill=fill, limit=limit)
+
+    def fill_gaps(self, method="ffill", limit: Optional[int] = None) -> "TimeSeriesFrame":
+        """
+        Copy of the frame with NaN gaps filled; see `metrics.resample.fill_gaps`.
+
+        The mask is kept: filled points become valid, but masked-out points
+        stay masked out (with their original values) and are not used to
+        fill the gaps around them.
+        """
+        from .resample import fill_gaps
+
+        if self.mask is None:
+            values = fill_gaps(self.values, method, limit)
+        else:
+            filled = fill_gaps(np.where(self.mask, self.values, np.nan), method, limit)
+            values = np.where(self.mask, filled, self.values)
+        mask = self.mask.copy() if self.mask is not None else None
+        return TimeSeriesFrame(self.timestamps, values, tags=self.tags, names=self.names, mask=mask)
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+    def detect(self, detector) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run `detector.detect_batch` on all rows; each row is detected on its
+        valid points only. Returns (n_series, n_points) labels and scores.
+        """
+        valid = self.valid
+        mask = None if valid.all() else valid
+        return detector.detect_batch(self.values, mask)
+
+    def __repr__(self) -> str:
+        return f"TimeSeriesFrame(n_series={len(self)}, n_points={len(self.timestamps)})"
@@ -0,0 +1,279 @@
+"""
+Resampling, alignment, gap filling and downsampling without pandas.
+
+All bucketing goes through one kernel: points are mapped to integer bucket
+keys (non-decreasing, since timestamps are sorted), and every aggregation is
+a `ufunc.reduceat` over the runs of equal keys. Aligning many series to one
+grid uses the same kernel on keys `row * n_buckets + bucket`.
+"""
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .frame import TimeSeriesFrame
+from .timeseries import TimeSeries
+
+AGGREGATIONS = ("mean", "sum", "count", "min", "max", "first", "last")
+FILL_METHODS = ("ffill", "bfill", "linear", "zero")
+
+Fill = Union[None, str, float]
+
+
+def _check_agg(agg: str) -> None:
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"unknown aggregation {agg!r}; expected one of {AGGREGATIONS}")
+
+
+def bucket_reduce(keys: np.ndarray, values: np.ndarray, n_keys: int, agg: str = "mean") -> np.ndarray:
+    """
+    Aggregate `values` by integer bucket `keys`.
+
+    Parameters
+    ----------
+    keys : np.ndarray
+        Non-decreasing integer bucket index of every value, in [0, n_keys).
+    values : np.ndarray
+        Values to aggregate (same length as keys).
+    n_keys : int
+        Number of output buckets.
+    agg : str
+        One of "mean", "sum", "count", "min", "max", "first", "last".
+
+    Returns
+    -------
+    np.ndarray
+        Length n_keys. Empty buckets are NaN (0 for "count").
+    """
+    _check_agg(agg)
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    out = np.zeros(n_keys) if agg == "count" else np.full(n_keys, np.nan)
+    if len(keys) == 0:
+        return out
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:], len(keys)]
+    present = keys[starts]
+
+    if agg == "count":
+        out[present] = ends - starts
+    elif agg == "sum":
+        out[present] = np.add.reduceat(values, starts)
+    elif agg == "mean":
+        out[present] = np.add.reduceat(values, starts) / (ends - starts)
+    elif agg == "min":
+        out[present] = np.minimum.reduceat(values, starts)
+    elif agg == "max":
+        out[present] = np.maximum.reduceat(values, starts)
+    elif agg == "first":
+        out[present] = values[starts]
+    else:  # last
+        out[present] = values[ends - 1]
+    return out
+
+
+def _grid(
+    timestamps: np.ndarray,
+    step: float,
+    start: Optional[float],
+    end: Optional[float],
+) -> Tuple[float, int]:
+    """Grid origin (aligned to multiples of step) and number of buckets."""
+    if step <= 0:
+        raise ValueError("step must be > 0")
+    if start is None:
+        start = float(timestamps.min()) if len(timestamps) else 0.0
+    if end is None:
+        end = float(timestamps.max()) if len(timestamps) else start
+    origin = np.floor(start / step) * step
+    n_buckets = int(np.floor((end - origin) / step)) + 1 if end >= origin else 0
+    return float(origin), n_buckets
+
+
+def _bucket_keys(timestamps: np.ndarray, origin: float, step: float, n_buckets: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Bucket index of every timestamp and a mask of those inside the grid."""
+    buckets = np.floor((timestamps - origin) / step).astype(np.int64)
+    inside = (buckets >= 0) & (buckets < n_buckets)
+    return buckets, inside
+
+
+def fill_gaps(values: np.ndarray, method: Fill = "ffill", limit: Optional[int] = None) -> np.ndarray:
+    """
+    Fill NaN gaps in a 1D or 2D (one series per row) array.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values with NaN marking missing points.
+    method : str or float
+        "ffill" / "bfill" (carry the previous / next value), "linear"
+        (interpolate between the surrounding values), "zero", or a constant.
+        None returns a copy unchanged.
+    limit : int, optional
+        Only fill gaps of at most `limit` consecutive missing points; longer
+        gaps stay NaN (e.g. a scrape target that was down).
+
+    Leading / trailing gaps are only filled by "bfill" / "ffill", "zero" and
+    constants.
+    """
+    out = np.array(values, dtype=float)
+    if method is None:
+        return out
+    if isinstance(method, str) and method not in FILL_METHODS:
+        raise ValueError(f"unknown fill method {method!r}; expected one of {FILL_METHODS} or a number")
+
+    rows = out.reshape(-1, out.shape[-1]) if out.ndim > 1 else out[None, :]
+    missing = np.isnan(rows)
+    if not missing.any():
+        return out
+
+    fillable = missing
+    if limit is not None:
+        fillable = missing & (_gap_lengths(missing) <= limit)
+
+    n = rows.shape[1]
+    idx = np.broadcast_to(np.arange(n), rows.shape)
+    if method == "ffill":
+        prev = np.maximum.accumulate(np.where(missing, -1, idx), axis=1)
+        filled = np.take_along_axis(rows, np.maximum(prev, 0), axis=1)
+        fillable = fillable & (prev >= 0)
+    elif method == "bfill":
+        nxt = np.minimum.accumulate(np.where(missing, n, idx)[:, ::-1], axis=1)[:, ::-1]
+        filled = np.take_along_axis(rows, np.minimum(nxt, n - 1), axis=1)
+        fillable = fillable & (nxt < n)
+    elif method == "linear":
+        filled = np.full(rows.shape, np.nan)
+        for r in range(rows.shape[0]):
+            valid = ~missing[r]
+            if valid.sum() >= 2:
+                filled[r] = np.interp(np.arange(n), np.flatnonzero(valid), rows[r, valid], left=np.nan, right=np.nan)
+        fillable = fillable & ~np.isnan(filled)
+    else:
+        filled = np.zeros(rows.shape) if method == "zero" else np.full(rows.shape, float(method))
+
+    rows[fillable] = filled[fillable]
+    return out
+
+
+def _gap_lengths(missing: np.ndarray) -> np.ndarray:
+    """Length of the run of missing points each position belongs to (2D)."""
+    n_rows, n = missing.shape
+    flat = np.zeros(n_rows * (n + 1), dtype=bool)
+    flat.reshape(n_rows, n + 1)[:, :n] = missing  # a separator column ends every row's last run
+    run_id = np.cumsum(np.r_[True, flat[1:] != flat[:-1]])
+    lengths = np.bincount(run_id)[run_id]
+    return lengths.reshape(n_rows, n + 1)[:, :n]
+
+
+def resample(
+    series: TimeSeries,
+    step: float,
+    agg: str = "mean",
+    fill: Fill = None,
+    limit: Optional[int] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> TimeSeries:
+    """
+    Aggregate a series into fixed `step`-second buckets.
+
+    Buckets are labelled by their left edge, aligned to multiples of `step`,
+    and span [start, end] (defaults: the series' first and last timestamp).
+    NaN values are ignored; empty buckets are NaN (0 for "count") unless
+    `fill` / `limit` are given (see `fill_gaps`).
+    """
+    _check_agg(agg)
+    timestamps = np.asarray(series.timestamps, dtype=float)
+    values = np.asarray(series.values, dtype=float)
+    origin, n_buckets = _grid(timestamps, step, start, end)
+
+    buckets, keep = _bucket_keys(timestamps, origin, step, n_buckets)
+    keep &= ~np.isnan(values)
+    out = bucket_reduce(buckets[keep], values[keep], n_buckets, agg)
+    if fill is not None and agg != "count":
+        out = fill_gaps(out, fill, limit)
+    return TimeSeries(timestamps=origin + step * np.arange(n_buckets), values=out, name=series.name)
+
+
+def align(
+    series: Union[Sequence[TimeSeries], TimeSeriesFrame],
+    step: float,
+    agg: str = "mean",
+    fill: Fill = None,
+    limit: Optional[int] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> TimeSeriesFrame:
+    """
+    Resample many series onto one shared grid and return a TimeSeriesFrame.
+
+    Takes a sequence of TimeSeries (with arbitrary, jittered timestamps) or
+    a TimeSeriesFrame. The grid covers all series unless `start` / `end` are
+    given; see `resample` for the meaning of the other arguments. All series
+    are bucketed in one pass.
+    """
+    _check_agg(agg)
+    if isinstance(series, TimeSeriesFrame):
+        valid = series.valid
+        rows, cols = np.nonzero(valid)
+        timestamps = series.timestamps[cols]
+        values = series.values[rows, cols]
+        n_rows, tags, names = len(series), series.tags, series.names
+    else:
+        lengths = [len(s.timestamps) for s in series]
+        rows = np.repeat(np.arange(len(series)), lengths)
+        timestamps = np.concatenate([s.timestamps for s in series]) if series else np.zeros(0)
+        values = np.concatenate([s.values for s in series]) if series else np.zeros(0)
+        keep = ~np.isnan(values)
+        rows, timestamps, values = rows[keep], timestamps[keep], values[keep]
+        n_rows, tags, names = len(series), None, [s.name for s in series]
+
+    origin, n_buckets = _grid(timestamps, step, start, end)
+    buckets, keep = _bucket_keys(timestamps, origin, step, n_buckets)
+    keys = rows[keep] * n_buckets + buckets[keep]  # row-major, so still sorted
+    out = bucket_reduce(keys, values[keep], n_rows * n_buckets, agg).reshape(n_rows, n_buckets)
+    if fill is not None and agg != "count":
+        out = fill_gaps(out, fill, limit)
+    return TimeSeriesFrame(origin + step * np.arange(n_buckets), out, tags=tags, names=names)
+
+
+def lttb(series: TimeSeries, n_out: int) -> TimeSeries:
+    """
+    Largest-Triangle-Three-Buckets downsampling to `n_out` points.
+
+    Keeps the first and last point and, from each of the n_out - 2 buckets in
+    between, the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. Preserves the visual shape
+    (spikes included) far better than averaging, which makes it suited to
+    exporting long series to dashboards. NaN points are dropped first.
+    """
+    if n_out < 3:
+        raise ValueError("n_out must be >= 3")
+    keep = ~np.isnan(series.values)
+    x = np.asarray(series.timestamps, dtype=float)[keep]
+    y = np.asarray(series.values, dtype=float)[keep]
+    n = len(x)
+    if n <= n_out:
+        return TimeSeries(timestamps=x, values=y, name=series.name)
+
+    # bucket edges over the interior points [1, n - 1)
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / sizes
+    avg_y = np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / sizes
+    # the bucket after the last one is the final point
+    avg_x = np.r_[avg_x[1:], x[-1]]
+    avg_y = np.r_[avg_y[1:], y[-1]]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - avg_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[b] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+
+    return TimeSeries(timestamps=x[selected], values=y[selected], name=series.name)
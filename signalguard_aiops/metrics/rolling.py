@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+from .timeseries import TimeSeries
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class RollingTimeSeries(TimeSeries):
+    """
+    Fixed-capacity TimeSeries backed by a mirrored ring buffer.
+
+    Holds the newest `capacity` points. Every point is written twice, at
+    position i and i + capacity of buffers of length 2 * capacity, so the
+    current contents are always one contiguous slice: `timestamps` and
+    `values` are zero-copy, read-only views, and appending costs O(1) per
+    point with no reallocation.
+
+    It is a TimeSeries, so it can be passed to `BaseDetector.detect` (via
+    `.values`) and `BaseRecipe.run` directly. The views alias the buffer and
+    are overwritten by later appends; keep `snapshot()` (a copy) if a result
+    must outlive the next append.
+
+    Parameters
+    ----------
+    capacity : int
+        Maximum number of points kept.
+    name : str
+        Optional name, e.g. metric name.
+    """
+
+    def __init__(self, capacity: int, name: str = ""):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.name = name
+        self._ts = np.empty(2 * self.capacity)
+        self._values = np.empty(2 * self.capacity)
+        self._start = 0
+        self._n = 0
+
+    @classmethod
+    def from_timeseries(cls, series: TimeSeries, capacity: Optional[int] = None) -> "RollingTimeSeries":
+        """Rolling buffer holding the newest `capacity` points of `series` (all by default)."""
+        if capacity is None:
+            capacity = max(len(series.timestamps), 1)
+        rolling = cls(capacity, name=series.name)
+        rolling.extend(series.timestamps, series.values)
+        return rolling
+
+    @classmethod
+    def from_lists(
+        cls,
+        timestamps: Sequence[float],
+        values: Sequence[float],
+        name: str = "",
+        sort: bool = False,
+        capacity: Optional[int] = None,
+    ) -> "RollingTimeSeries":
+        series = TimeSeries.from_lists(timestamps, values, name=name, sort=sort)
+        return cls.from_timeseries(series, capacity)
+
+    @classmethod
+    def from_pandas(
+        cls, series: pd.Series, name: Optional[str] = None, capacity: Optional[int] = None
+    ) -> "RollingTimeSeries":
+        return cls.from_timeseries(TimeSeries.from_pandas(series, name=name), capacity)
+
+    def _contents(self, buffer: np.ndarray) -> np.ndarray:
+        view = buffer[self._start : self._start + self._n]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._contents(self._ts)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._contents(self._values)
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def full(self) -> bool:
+        return self._n == self.capacity
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add one point, dropping the oldest one if the buffer is full."""
+        if self._n and timestamp < self._ts[self._start + self._n - 1]:
+            raise ValueError("timestamps must be appended in non-decreasing order")
+        pos = (self._start + self._n) % self.capacity
+        self._ts[pos] = self._ts[pos + self.capacity] = timestamp
+        self._values[pos] = self._values[pos + self.capacity] = value
+        if self._n < self.capacity:
+            self._n += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def extend(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Add a batch of points (only the newest `capacity` of them are kept)."""
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+        if len(timestamps) == 0:
+            return
+        if np.any(np.diff(timestamps) < 0) or (self._n and timestamps[0] < self._ts[self._start + self._n - 1]):
+            raise ValueError("timestamps must be appended in non-decreasing order")
+
+        total = self._n + len(timestamps)
+        timestamps, values = timestamps[-self.capacity :], values[-self.capacity :]
+        pos = (self._start + total - len(timestamps) + np.arange(len(timestamps))) % self.capacity
+        for buffer, data in ((self._ts, timestamps), (self._values, values)):
+            buffer[pos] = data
+            buffer[pos + self.capacity] = data
+
+        if total > self.capacity:
+            self._start = (self._start + total - self.capacity) % self.capacity
+            self._n = self.capacity
+        else:
+            self._n = total
+
+    def clear(self) -> None:
+        self._start = 0
+        self._n = 0
+
+    def snapshot(self) -> TimeSeries:
+        """Plain TimeSeries copy of the current contents."""
+        return TimeSeries._view(self.timestamps.copy(), self.values.copy(), self.name)
+
+    def __repr__(self) -> str:
+        return f"RollingTimeSeries(name={self.name!r}, n_points={self._n}, capacity={self.capacity})"
@@ -0,0 +1,301 @@
+"""
+Multi-resolution rollups of a series.
+
+A `Rollup` keeps the recent raw points in a `RollingTimeSeries` plus one
+`RollupTier` per resolution (1m, 5m and 1h by default) with the count, sum,
+squared deviation, min and max of every bucket, so long baselines can be read
+at a coarse resolution instead of scanning raw data:
+
+    rollup = Rollup(raw_window=6 * 3600)
+    rollup.update(new_points)                       # incremental, every scrape
+    hourly = rollup.series("1h", agg="max")         # 400 days, 1 point per hour
+    count, mean, std = rollup.baseline("1h")        # raw-sample stats from buckets
+    incident = rollup.run(recipe)                   # runs on recipe.tier, or scores
+                                                    # raw points against recipe.baseline_tier
+"""
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .rolling import RollingTimeSeries
+from .timeseries import TimeSeries
+
+# tier name -> (bucket seconds, retention seconds)
+DEFAULT_TIERS: Dict[str, Tuple[float, float]] = {
+    "1m": (60.0, 7 * 86400.0),
+    "5m": (300.0, 30 * 86400.0),
+    "1h": (3600.0, 400 * 86400.0),
+}
+
+TIER_AGGREGATIONS = ("mean", "sum", "count", "min", "max", "std")
+
+_COLUMNS = ("_key", "_count", "_sum", "_m2", "_min", "_max")
+
+
+class RollupTier:
+    """
+    Per-bucket count / sum / M2 / min / max of a series at one resolution,
+    where M2 is the sum of squared deviations from the bucket mean.
+
+    Buckets are aligned to multiples of `step` and stored in columnar arrays
+    that grow by doubling. The newest bucket stays open: points arriving
+    for it are merged in place. Buckets older than `retention` seconds are
+    dropped from reads, and from memory once they make up half the arrays.
+    NaN points are ignored.
+
+    M2 keeps the spread of the raw points: "std" is the population std of
+    the points in each bucket, and `stats` pools the buckets of a range into
+    the mean / std of all their raw points. Being centered, it stays
+    accurate for series far from zero (a raw sum of squares would cancel
+    out for e.g. 1e8 + noise); partial buckets are merged with Chan's
+    parallel update.
+    """
+
+    def __init__(self, step: float, retention: Optional[float] = None, capacity: int = 1024):
+        if step <= 0:
+            raise ValueError("step must be > 0")
+        self.step = float(step)
+        self.retention = retention
+        self._n = 0
+        self._lo = 0  # first bucket inside the retention window
+        self._key = np.empty(capacity, dtype=np.int64)
+        self._count = np.empty(capacity, dtype=np.int64)
+        self._sum = np.empty(capacity)
+        self._m2 = np.empty(capacity)
+        self._min = np.empty(capacity)
+        self._max = np.empty(capacity)
+
+    def __len__(self) -> int:
+        return self._n - self._lo
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._n + extra
+        if self._lo and self._lo >= self._n // 2:
+            # drop expired buckets instead of growing
+            for name in _COLUMNS:
+                arr = getattr(self, name)
+                arr[: self._n - self._lo] = arr[self._lo : self._n]
+            self._n -= self._lo
+            self._lo = 0
+            needed = self._n + extra
+        if needed <= len(self._key):
+            return
+        size = max(needed, 2 * len(self._key))
+        for name in _COLUMNS:
+            arr = getattr(self, name)
+            grown = np.empty(size, dtype=arr.dtype)
+            grown[: self._n] = arr[: self._n]
+            setattr(self, name, grown)
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Fold sorted points into the buckets; they may not precede the open bucket."""
+        timestamps = np.asarray(timestamps, dtype=float)
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(values)
+        timestamps, values = timestamps[keep], values[keep]
+        if len(timestamps) == 0:
+            return
+
+        keys = np.floor(timestamps / self.step).astype(np.int64)
+        if self._n and keys[0] < self._key[self._n - 1]:
+            raise ValueError("points are older than the open rollup bucket")
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        run_keys = keys[starts]
+        counts = np.diff(np.r_[starts, len(keys)])
+        sums = np.add.reduceat(values, starts)
+        deviations = values - np.repeat(sums / counts, counts)
+        m2s = np.add.reduceat(deviations * deviations, starts)
+        mins = np.minimum.reduceat(values, starts)
+        maxs = np.maximum.reduceat(values, starts)
+
+        if self._n and run_keys[0] == self._key[self._n - 1]:
+            last = self._n - 1
+            n_a, n_b = self._count[last], counts[0]
+            delta = sums[0] / n_b - self._sum[last] / n_a
+            self._m2[last] += m2s[0] + delta * delta * n_a * n_b / (n_a + n_b)
+            self._count[last] += n_b
+            self._sum[last] += sums[0]
+            self._min[last] = min(self._min[last], mins[0])
+            self._max[last] = max(self._max[last], maxs[0])
+            run_keys, counts, sums, m2s = run_keys[1:], counts[1:], sums[1:], m2s[1:]
+            mins, maxs = mins[1:], maxs[1:]
+
+        k = len(run_keys)
+        if k:
+            self._reserve(k)
+            end = self._n + k
+            self._key[self._n : end] = run_keys
+            self._count[self._n : end] = counts
+            self._sum[self._n : end] = sums
+            self._m2[self._n : end] = m2s
+            self._min[self._n : end] = mins
+            self._max[self._n : end] = maxs
+            self._n = end
+
+        if self.retention is not None:
+            oldest = np.floor((timestamps[-1] - self.retention) / self.step)
+            self._lo = int(np.searchsorted(self._key[: self._n], oldest, side="left"))
+
+    def _rows(self, start_ts: Optional[float], end_ts: Optional[float], include_open: bool) -> slice:
+        keys = self._key[self._lo : self._n]
+        lo = 0 if start_ts is None else int(np.searchsorted(keys, np.ceil(start_ts / self.step), side="left"))
+        hi = len(keys) if end_ts is None else int(np.searchsorted(keys, np.floor(end_ts / self.step), side="right"))
+        if not include_open:
+            hi = min(hi, len(keys) - 1)
+        hi = max(hi, lo)
+        return slice(self._lo + lo, self._lo + hi)
+
+    def series(
+        self,
+        agg: str = "mean",
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        include_open: bool = True,
+        name: str = "",
+    ) -> TimeSeries:
+        """
+        One aggregate of the buckets as a TimeSeries, stamped with the bucket
+        start. Only buckets holding data are returned. With
+        `include_open=False` the newest (still filling) bucket is left out.
+        """
+        if agg not in TIER_AGGREGATIONS:
+            raise ValueError(f"unknown aggregation {agg!r}; expected one of {TIER_AGGREGATIONS}")
+        rows = self._rows(start_ts, end_ts, include_open)
+
+        if agg == "mean":
+            values = self._sum[rows] / self._count[rows]
+        elif agg == "std":
+            values = np.sqrt(self._m2[rows] / self._count[rows])
+        elif agg == "count":
+            values = self._count[rows].astype(float)
+        else:
+            values = {"sum": self._sum, "min": self._min, "max": self._max}[agg][rows].copy()
+        return TimeSeries._view(self._key[rows] * self.step, values, name)
+
+    def stats(
+        self,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+        include_open: bool = True,
+    ) -> Tuple[int, float, float]:
+        """
+        Number, mean and population std of all raw points in the buckets
+        between `start_ts` and `end_ts` (same selection as `series`),
+        pooled from the bucket moments without touching raw data. Mean and
+        std are NaN for an empty range.
+        """
+        rows = self._rows(start_ts, end_ts, include_open)
+        count = int(self._count[rows].sum())
+        if count == 0:
+            return 0, float("nan"), float("nan")
+        counts = self._count[rows]
+        mean = self._sum[rows].sum() / count
+        spread = self._sum[rows] / counts - mean
+        m2 = self._m2[rows].sum() + (counts * spread * spread).sum()
+        return count, float(mean), float(np.sqrt(m2 / count))
+
+
+class Rollup:
+    """
+    Raw recent window plus coarse tiers of one series, updated incrementally.
+
+    Parameters
+    ----------
+    tiers : mapping, optional
+        Tier name -> (bucket seconds, retention seconds). Defaults to
+        DEFAULT_TIERS (1m for 7 days, 5m for 30 days, 1h for 400 days).
+    raw_window : float
+        Seconds of raw points kept for recent-window detection.
+    raw_capacity : int
+        Maximum number of raw points kept (bounds memory for fast scrapes).
+    name : str
+        Series name, carried over to the returned TimeSeries.
+
+    Recipes choose their input resolution with their `tier` / `tier_agg`
+    fields (see `BaseRecipe`); `run` and `series_for` honour them. A recipe
+    with a `baseline_tier` instead scores the raw recent window against the
+    mean / std of that tier's buckets before it (see `baseline`), so a long
+    baseline costs one pass over coarse buckets rather than over raw points.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[Mapping[str, Tuple[float, float]]] = None,
+        raw_window: float = 6 * 3600.0,
+        raw_capacity: int = 1 << 14,
+        name: str = "",
+    ):
+        self.name = name
+        self.raw_window = raw_window
+        self.raw = RollingTimeSeries(raw_capacity, name=name)
+        self.tiers: Dict[str, RollupTier] = {
+            tier: RollupTier(step, retention) for tier, (step, retention) in (tiers or DEFAULT_TIERS).items()
+        }
+
+    def update(self, series: TimeSeries) -> None:
+        """Add new points (newer than every point seen so far) to every tier."""
+        self.raw.extend(series.timestamps, series.values)
+        for tier in self.tiers.values():
+            tier.update(series.timestamps, series.values)
+
+    def series(
+        self,
+        tier: Optional[str] = None,
+        agg: str = "mean",
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+    ) -> TimeSeries:
+        """
+        The series at resolution `tier` ("raw" or None for raw points, limited
+        to the last `raw_window` seconds and returned as views of the raw
+        buffer, valid until the next `update`).
+        """
+        if tier is None or tier == "raw":
+            if not len(self.raw):
+                return TimeSeries(np.zeros(0), np.zeros(0), name=self.name)
+            lo = float(self.raw.timestamps[-1]) - self.raw_window
+            start_ts = lo if start_ts is None else max(start_ts, lo)
+            return self.raw.window(start_ts, np.inf if end_ts is None else end_ts)
+        if tier not in self.tiers:
+            raise KeyError(f"unknown rollup tier {tier!r}; available: {sorted(self.tiers)}")
+        return self.tiers[tier].series(agg, start_ts, end_ts, name=self.name)
+
+    def baseline(
+        self,
+        tier: str,
+        start_ts: Optional[float] = None,
+        end_ts: Optional[float] = None,
+    ) -> Tuple[int, float, float]:
+        """
+        Number, mean and std of the raw points summarized by `tier` (see
+        `RollupTier.stats`). By default the baseline ends with the last
+        bucket that closes before the raw recent window starts, so the
+        window being scored does not leak into its own baseline.
+        """
+        if tier not in self.tiers:
+            raise KeyError(f"unknown rollup tier {tier!r}; available: {sorted(self.tiers)}")
+        rollup_tier = self.tiers[tier]
+        if end_ts is None:
+            if not len(self.raw):
+                return 0, float("nan"), float("nan")
+            recent = float(self.raw.timestamps[-1]) - self.raw_window
+            end_ts = recent - rollup_tier.step
+        return rollup_tier.stats(start_ts, end_ts)
+
+    def series_for(self, recipe, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> TimeSeries:
+        """Input series for `recipe`, at its declared `tier` / `tier_agg`."""
+        return self.series(getattr(recipe, "tier", None), getattr(recipe, "tier_agg", "mean"), start_ts, end_ts)
+
+    def run(self, recipe, start_ts: Optional[float] = None, end_ts: Optional[float] = None):
+        """
+        Run `recipe` on its declared tier, or, if it has a `baseline_tier`,
+        score the raw recent window against that tier's baseline.
+        """
+        baseline_tier = getattr(recipe, "baseline_tier", None)
+        if baseline_tier is None:
+            return recipe.run(self.series_for(recipe, start_ts, end_ts))
+        _, mean, std = self.baseline(baseline_tier)
+        return recipe.run_on_baseline(self.series(None, start_ts=start_ts, end_ts=end_ts), mean, std)
@@ -0,0 +1,346 @@
+"""
+Local append-only series store.
+
+Layout: one directory per series holding an `index.json` and columnar
+segment files, `seg-<id>.ts` and `seg-<id>.val` (raw little-endian float64).
+New points are appended to the last segment until it holds
+`segment_points` points, then a new one is started. The index is rewritten
+atomically after the data, so it is authoritative: bytes past the indexed
+count (an interrupted append) are ignored and truncated on the next write.
+
+    store = SeriesStore("/var/lib/signalguard", retention=30 * 86400)
+    store.append("orders:error_rate", series)
+    baseline = store.read("orders:error_rate", start_ts, end_ts)  # memory-mapped
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .timeseries import TimeSeries
+
+_DTYPE = np.dtype("<f8")
+
+
+@dataclass
+class Segment:
+    id: int
+    count: int = 0
+    start: float = float("nan")
+    end: float = float("nan")
+
+
+@dataclass
+class _SeriesIndex:
+    key: str
+    segments: List[Segment]
+    next_id: int = 0
+
+    @property
+    def last_ts(self) -> Optional[float]:
+        for seg in reversed(self.segments):
+            if seg.count:
+                return seg.end
+        return None
+
+
+class SeriesStore:
+    """
+    On-disk store of append-only series with memory-mapped reads.
+
+    Parameters
+    ----------
+    root : str
+        Directory holding the store (created if missing).
+    segment_points : int
+        Points per segment file. Range reads inside one segment are
+        zero-copy views of the mapped file; reads spanning segments are
+        concatenated.
+    retention : float, optional
+        Seconds of data kept by `compact`. None keeps everything.
+    fsync : bool
+        fsync segment files after every append (slower, survives power loss).
+
+    The store is safe to use from several threads of one process, not from
+    several writer processes at once.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        segment_points: int = 1 << 16,
+        retention: Optional[float] = None,
+        fsync: bool = False,
+    ):
+        if segment_points < 1:
+            raise ValueError("segment_points must be >= 1")
+        self.root = root
+        self.segment_points = int(segment_points)
+        self.retention = retention
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._indexes: Dict[str, _SeriesIndex] = {}
+        self._maps: Dict[Tuple[str, int, str], np.ndarray] = {}
+        os.makedirs(root, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Paths and index
+    # ------------------------------------------------------------------
+    def _dir(self, key: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", key)[:64]
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.root, f"{safe}-{digest}")
+
+    def _segment_path(self, key: str, seg_id: int, column: str) -> str:
+        return os.path.join(self._dir(key), f"seg-{seg_id:08d}.{column}")
+
+    def _index(self, key: str, create: bool = False) -> Optional[_SeriesIndex]:
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+        path = os.path.join(self._dir(key), "index.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                raw = json.load(f)
+            index = _SeriesIndex(raw["key"], [Segment(**s) for s in raw["segments"]], raw["next_id"])
+        elif create:
+            os.makedirs(self._dir(key), exist_ok=True)
+            index = _SeriesIndex(key, [])
+        else:
+            return None
+        self._indexes[key] = index
+        return index
+
+    def _write_index(self, index: _SeriesIndex) -> None:
+        path = os.path.join(self._dir(index.key), "index.json")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"key": index.key, "segments": [asdict(s) for s in index.segments], "next_id": index.next_id}, f)
+        os.replace(tmp, path)
+
+    def _column(self, key: str, seg: Segment, column: str) -> np.ndarray:
+        # mappings are cached per (segment, count); a grown head segment is remapped
+        cache_key = (key, seg.id, column)
+        mapped = self._maps.get(cache_key)
+        if mapped is None or len(mapped) != seg.count:
+            mapped = np.memmap(self._segment_path(key, seg.id, column), dtype=_DTYPE, mode="r", shape=(seg.count,))
+            self._maps[cache_key] = mapped
+        return mapped
+
+    def _forget_maps(self, key: str, seg_ids) -> None:
+        for seg_id in seg_ids:
+            for column in ("ts", "val"):
+                self._maps.pop((key, seg_id, column), None)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def keys(self) -> List[str]:
+        """Keys of every stored series."""
+        keys = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name, "index.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    keys.append(json.load(f)["key"])
+        return keys
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._index(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def last_timestamp(self, key: str) -> Optional[float]:
+        """Newest stored timestamp of `key`, or None if nothing is stored."""
+        with self._lock:
+            index = self._index(key)
+            return index.last_ts if index is not None else None
+
+    def append(self, key: str, series: TimeSeries) -> int:
+        """
+        Append points to `key` and return how many were written.
+
+        Points at or before the newest stored timestamp are skipped, so an
+        overlapping re-fetch of the tail can be appended as is.
+        """
+        timestamps = np.asarray(series.timestamps, dtype=float)
+        values = np.asarray(series.values, dtype=float)
+        with self._lock:
+            index = self._index(key, create=True)
+            last = index.last_ts
+            if last is not None:
+                first_new = np.searchsorted(timestamps, last, side="right")
+                timestamps, values = timestamps[first_new:], values[first_new:]
+            if len(timestamps) == 0:
+                return 0
+
+            pos = 0
+            while pos < len(timestamps):
+                if not index.segments or index.segments[-1].count >= self.segment_points:
+                    index.segments.append(Segment(index.next_id))
+                    index.next_id += 1
+                seg = index.segments[-1]
+                take = min(len(timestamps) - pos, self.segment_points - seg.count)
+                chunk = slice(pos, pos + take)
+                self._write_columns(key, seg, timestamps[chunk], values[chunk])
+                if seg.count == 0:
+                    seg.start = float(timestamps[pos])
+                seg.count += take
+                seg.end = float(timestamps[pos + take - 1])
+                pos += take
+
+            self._write_index(index)
+            return len(timestamps)
+
+    def _write_columns(self, key: str, seg: Segment, timestamps: np.ndarray, values: np.ndarray) -> None:
+        offset = seg.count * _DTYPE.itemsize
+        for column, data in (("ts", timestamps), ("val", values)):
+            path = self._segment_path(key, seg.id, column)
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                f.truncate(offset)  # drop bytes of an interrupted append
+                f.seek(offset)
+                f.write(np.ascontiguousarray(data, dtype=_DTYPE).tobytes())
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def read(self, key: str, start_ts: Optional[float] = None, end_ts: Optional[float] = None) -> TimeSeries:
+        """
+        Points of `key` with start_ts <= timestamp <= end_ts (inclusive, open
+        ends if None). A range inside one segment is a read-only view of the
+        memory-mapped files; otherwise the segments are concatenated.
+        """
+        lo_ts = -np.inf if start_ts is None else start_ts
+        hi_ts = np.inf if end_ts is None else end_ts
+        with self._lock:
+            index = self._index(key)
+            if index is None:
+                raise KeyError(key)
+            parts = []
+            for seg in index.segments:
+                if seg.count == 0 or seg.end < lo_ts or seg.start > hi_ts:
+                    continue
+                ts = self._column(key, seg, "ts")
+                lo = np.searchsorted(ts, lo_ts, side="left")
+                hi = np.searchsorted(ts, hi_ts, side="right")
+                parts.append((ts[lo:hi], self._column(key, seg, "val")[lo:hi]))
+
+        if not parts:
+            return TimeSeries(np.zeros(0), np.zeros(0), name=key)
+        if len(parts) == 1:
+            return TimeSeries._view(parts[0][0], parts[0][1], key)
+        return TimeSeries._view(
+            np.concatenate([p[0] for p in parts]),
+            np.concatenate([p[1] for p in parts]),
+            key,
+        )
+
+    def sync(
+        self,
+        key: str,
+        fetch: Callable[[float, float], TimeSeries],
+        start_ts: float,
+        end_ts: float,
+    ) -> TimeSeries:
+        """
+        Bring `key` up to `end_ts` and return its [start_ts, end_ts] range.
+
+        `fetch(start, end)` is only asked for the part not stored yet (from
+        the newest stored timestamp on), e.g.
+        `lambda s, e: fetcher.fetch_range(query, s, e)`.
+        """
+        last = self.last_timestamp(key)
+        fetch_from = start_ts if last is None else max(start_ts, last)
+        if fetch_from <= end_ts:
+            self.append(key, fetch(fetch_from, end_ts))
+        return self.read(key, start_ts, end_ts)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            index = self._index(key)
+            if index is None:
+                return
+            self._forget_maps(key, [s.id for s in index.segments])
+            self._indexes.pop(key, None)
+            shutil.rmtree(self._dir(key), ignore_errors=True)
+
+    def compact(self, key: Optional[str] = None, now: Optional[float] = None) -> int:
+        """
+        Apply retention and merge partially filled segments.
+
+        Points older than `now - retention` are dropped (`now` defaults to
+        the wall clock). Segments that end before the cutoff are deleted;
+        if the first kept segment is partially expired, or sealed segments
+        are not full, the kept points are rewritten into full segments.
+        Compacts every series if `key` is None. Returns the number of points
+        removed.
+        """
+        keys = [key] if key is not None else self.keys()
+        cutoff = -np.inf
+        if self.retention is not None:
+            cutoff = (time.time() if now is None else now) - self.retention
+
+        removed = 0
+        with self._lock:
+            for k in keys:
+                removed += self._compact_one(k, cutoff)
+        return removed
+
+    def _compact_one(self, key: str, cutoff: float) -> int:
+        index = self._index(key)
+        if index is None:
+            return 0
+        old = [s for s in index.segments if s.count]
+        expired = [s for s in old if s.end < cutoff]
+        kept = [s for s in old if s.end >= cutoff]
+        removed = sum(s.count for s in expired)
+
+        partial_head = bool(kept) and kept[0].start < cutoff
+        underfilled = any(s.count < self.segment_points for s in kept[:-1])
+        if not partial_head and not underfilled:
+            if expired:
+                index.segments = kept
+                self._write_index(index)
+                self._remove_segments(key, expired)
+            return removed
+
+        series = self.read(key, cutoff if np.isfinite(cutoff) else None)
+        removed += sum(s.count for s in kept) - len(series.timestamps)
+        timestamps = np.array(series.timestamps)  # copy: the mapped files are rewritten
+        values = np.array(series.values)
+
+        new_segments = []
+        for pos in range(0, len(timestamps), self.segment_points):
+            seg = Segment(index.next_id)
+            index.next_id += 1
+            chunk = slice(pos, pos + self.segment_points)
+            self._write_columns(key, seg, timestamps[chunk], values[chunk])
+            seg.count = len(timestamps[chunk])
+            seg.start, seg.end = float(timestamps[chunk][0]), float(timestamps[chunk][-1])
+            new_segments.append(seg)
+
+        index.segments = new_segments
+        self._write_index(index)
+        self._remove_segments(key, old)
+        return removed
+
+    def _remove_segments(self, key: str, segments: List[Segment]) -> None:
+        self._forget_maps(key, [s.id for s in segments])
+        for seg in segments:
+            for column in ("ts", "val"):
+                try:
+                    os.remove(self._segment_path(key, seg.id, column))
+                except FileNotFoundError:
+                    pass
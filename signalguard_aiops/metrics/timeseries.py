@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence, List, Optional
+from typing import TYPE_CHECKING, Iterator, Sequence, List, Optional
 
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:  # pandas is only imported by the conversion helpers
+    import pandas as pd
+
+
+def _as_seconds(timestamps) -> np.ndarray:
+    """float64 timestamps in seconds; datetime64 input is converted to seconds since epoch."""
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        ns = timestamps.astype("datetime64[ns]")
+        seconds = ns.view(np.int64) / 1e9
+        return np.where(np.isnat(ns), np.nan, seconds)
+    return np.asarray(timestamps, dtype=float)
 
 
 @dataclass
@@ -15,26 +27,54 @@ class TimeSeries:
     Attributes
     ----------
     timestamps : np.ndarray
-        1D array of timestamps (seconds since epoch or pandas-compatible).
+        1D float array of timestamps in seconds since epoch, sorted in
+        non-decreasing order. datetime64 input is converted to seconds.
     values : np.ndarray
         1D array of float values.
     name : str
         Optional name, e.g. metric name.
+
+    Sorted timestamps are checked on construction, so `window` and
+    `sliding_windows` can binary-search them and return views instead of
+    copies. Use `from_lists(..., sort=True)` for unordered input.
     """
     timestamps: np.ndarray
     values: np.ndarray
     name: str = ""
 
+    def __post_init__(self) -> None:
+        self.timestamps = _as_seconds(self.timestamps)
+        self.values = np.asarray(self.values, dtype=float)
+        if self.timestamps.ndim != 1 or self.values.ndim != 1:
+            raise ValueError("timestamps and values must be 1D arrays")
+        if len(self.timestamps) != len(self.values):
+            raise ValueError(
+                f"timestamps and values must have the same length, got {len(self.timestamps)} and {len(self.values)}"
+            )
+        if len(self.timestamps) > 1 and not np.all(self.timestamps[1:] >= self.timestamps[:-1]):
+            raise ValueError("timestamps must be sorted in non-decreasing order")
+
+    @classmethod
+    def _view(cls, timestamps: np.ndarray, values: np.ndarray, name: str = "") -> "TimeSeries":
+        # slices of an already validated series: skip the O(n) checks
+        ts = cls.__new__(cls)
+        ts.timestamps = timestamps
+        ts.values = values
+        ts.name = name
+        return ts
+
     @classmethod
     def from_pandas(cls, series: pd.Series, name: Optional[str] = None) -> "TimeSeries":
+        import pandas as pd
+
+        if not series.index.is_monotonic_increasing:
+            series = series.sort_index(kind="stable")
         idx = series.index
-        if isinstance(idx, pd.DatetimeIndex):
-            timestamps = idx.view("int64") // 10**9
-        else:
-            timestamps = idx.to_numpy()
+        if isinstance(idx, pd.DatetimeIndex) and idx.tz is not None:
+            idx = idx.tz_convert(None)
 
         return cls(
-            timestamps=np.asarray(timestamps, dtype=float),
+            timestamps=_as_seconds(idx.to_numpy()),
             values=series.to_numpy(dtype=float),
             name=name or getattr(series, "name", "") or "",
         )
@@ -45,20 +85,78 @@ class TimeSeries:
         timestamps: Sequence[float],
         values: Sequence[float],
         name: str = "",
+        sort: bool = False,
     ) -> "TimeSeries":
-        return cls(
-            timestamps=np.asarray(timestamps, dtype=float),
-            values=np.asarray(values, dtype=float),
-            name=name,
-        )
+        timestamps = _as_seconds(timestamps)
+        values = np.asarray(values, dtype=float)
+        if sort:
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, values = timestamps[order], values[order]
+        return cls(timestamps=timestamps, values=values, name=name)
 
     def to_pandas(self) -> pd.Series:
+        import pandas as pd
+
         return pd.Series(self.values, index=pd.to_datetime(self.timestamps, unit="s"), name=self.name)
 
     def window(self, start_ts: float, end_ts: float) -> "TimeSeries":
-        mask = (self.timestamps >= start_ts) & (self.timestamps <= end_ts)
-        return TimeSeries(
-            timestamps=self.timestamps[mask],
-            values=self.values[mask],
-            name=self.name,
-        )
+        """
+        Points with start_ts <= timestamp <= end_ts. The result shares memory
+        with this series (slice views, no copy).
+        """
+        lo = np.searchsorted(self.timestamps, start_ts, side="left")
+        hi = np.searchsorted(self.timestamps, end_ts, side="right")
+        return TimeSeries._view(self.timestamps[lo:hi], self.values[lo:hi], self.name)
+
+    def sliding_windows(
+        self,
+        width: float,
+        stride: int = 1,
+        by_time: bool = False,
+        min_points: Optional[int] = None,
+    ) -> Iterator["TimeSeries"]:
+        """
+        Iterate over trailing windows, as views into this series.
+
+        A window ends at every `stride`-th point. With `by_time=False` it holds
+        the last `width` points; with `by_time=True` it holds the points with
+        t_end - width < timestamp <= t_end. Windows with fewer than
+        `min_points` points are skipped (defaults: `width` for point windows,
+        1 for time windows).
+        """
+        if width <= 0 or stride < 1:
+            raise ValueError("width must be > 0 and stride >= 1")
+        n = len(self.timestamps)
+        if by_time:
+            ends = np.arange(1, n + 1, stride)
+            starts = np.searchsorted(self.timestamps, self.timestamps[ends - 1] - width, side="right")
+            min_points = 1 if min_points is None else min_points
+        else:
+            width = int(width)
+            ends = np.arange(width, n + 1, stride)
+            starts = ends - width
+            min_points = width if min_points is None else min_points
+
+        for lo, hi in zip(starts.tolist(), ends.tolist()):
+            if hi - lo >= min_points:
+                yield TimeSeries._view(self.timestamps[lo:hi], self.values[lo:hi], self.name)
+
+    def resample(
+        self,
+        step: float,
+        agg: str = "mean",
+        fill=None,
+        limit: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> "TimeSeries":
+        """Aggregate into `step`-second buckets; see `metrics.resample.resample`."""
+        from .resample import resample
+
+        return resample(self, step, agg=agg, fill=fill, limit=limit, start=start, end=end)
+
+    def lttb(self, n_out: int) -> "TimeSeries":
+        """Downsample to `n_out` points for display; see `metrics.resample.lttb`."""
+        from .resample import lttb
+
+        return lttb(self, n_out)
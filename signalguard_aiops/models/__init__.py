@@ -0,0 +1 @@
+from .registry import ModelRegistry, ModelKey, ModelEntry, RegistryStats
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..detectors.base import FittableDetector
+from ..metrics import TimeSeries
+
+
+def params_fingerprint(params: Dict[str, Any]) -> str:
+    """Stable short hash of a detector parameter dict."""
+    canonical = repr(sorted((k, repr(v)) for k, v in params.items()))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def window_fingerprint(series: TimeSeries) -> str:
+    """Short hash of a training window (its timestamps and values)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(np.ascontiguousarray(series.timestamps, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(series.values, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """
+    Identity of a fitted model slot: one per (service, metric, detector config).
+    """
+
+    service: str
+    metric: str
+    detector: str
+    params: str
+
+    def filename(self) -> str:
+        return hashlib.sha1(repr(self).encode("utf-8")).hexdigest() + ".pkl"
+
+
+@dataclass
+class ModelEntry:
+    """
+    A fitted detector plus the metadata used to decide when to refit it.
+
+    Attributes
+    ----------
+    detector : FittableDetector
+        The fitted detector.
+    fitted_at : float
+        Registry clock time of the fit.
+    window : str
+        Fingerprint of the training window (see `window_fingerprint`).
+    train_mean, train_std : float
+        Statistics of the training values, used for drift checks.
+    nbytes : int
+        Estimated memory footprint (pickled size).
+    """
+
+    detector: FittableDetector
+    fitted_at: float
+    window: str
+    train_mean: float
+    train_std: float
+    nbytes: int = 0
+
+
+@dataclass
+class RegistryStats:
+    hits: int = 0
+    misses: int = 0
+    fits: int = 0
+    spills: int = 0
+    loads: int = 0
+    evictions: int = 0
+
+
+class ModelRegistry:
+    """
+    Cache of fitted detectors that separates fitting from scoring.
+
+    `score` looks up the fitted model for (service, metric, detector params)
+    and only runs inference. A model is (re)fitted when it does not exist
+    yet, when it is older than `refit_interval`, or when the evaluated
+    window has drifted away from the training window.
+
+    Hot models live in an in-memory LRU bounded by `max_memory_bytes`
+    (estimated from the pickled size). When the budget is exceeded, the
+    least recently used models are written to `spill_dir` if one is
+    configured, and dropped otherwise. Spilled models are loaded back on
+    the next access.
+
+    Parameters
+    ----------
+    max_memory_bytes : int
+        Memory budget for in-memory models.
+    spill_dir : str, optional
+        Directory for the on-disk tier. If None, cold models are dropped.
+    refit_interval : float, optional
+        Maximum model age in seconds. None means never refit on age.
+    drift_threshold : float, optional
+        Refit when |mean(window) - train_mean| / train_std exceeds this.
+        None disables drift checks.
+    drift_check : callable, optional
+        Custom drift check `f(entry, series) -> bool`, replaces the default.
+    clock : callable
+        Time source, defaults to time.time.
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        spill_dir: Optional[str] = None,
+        refit_interval: Optional[float] = None,
+        drift_threshold: Optional[float] = 3.0,
+        drift_check: Optional[Callable[[ModelEntry, TimeSeries], bool]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.spill_dir = spill_dir
+        self.refit_interval = refit_interval
+        self.drift_threshold = drift_threshold
+        self.drift_check = drift_check
+        self.clock = clock
+
+        self.stats = RegistryStats()
+        self._memory: "OrderedDict[ModelKey, ModelEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    @staticmethod
+    def key_for(service: str, metric: str, detector: FittableDetector) -> ModelKey:
+        return ModelKey(
+            service=service,
+            metric=metric,
+            detector=type(detector).__name__,
+            params=params_fingerprint(detector.get_params()),
+        )
+
+    def get_fitted(
+        self,
+        service: str,
+        metric: str,
+        detector: FittableDetector,
+        series: TimeSeries,
+    ) -> FittableDetector:
+        """
+        Return a fitted copy of `detector` for this (service, metric).
+
+        `detector` acts as an unfitted template: it is deep-copied and fitted on
+        `series` when no usable model is cached.
+        """
+        key = self.key_for(service, metric, detector)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and not self._needs_refit(entry, series):
+                self.stats.hits += 1
+                return entry.detector
+            self.stats.misses += 1
+
+        # Fit outside the lock so other series are not blocked
+        fitted = copy.deepcopy(detector).fit(series.values, series.timestamps)
+        values = np.asarray(series.values, dtype=float)
+        finite = values[np.isfinite(values)]
+        entry = ModelEntry(
+            detector=fitted,
+            fitted_at=self.clock(),
+            window=window_fingerprint(series),
+            train_mean=float(finite.mean()) if finite.size else 0.0,
+            train_std=float(finite.std()) if finite.size else 0.0,
+        )
+        entry.nbytes = len(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+        with self._lock:
+            self.stats.fits += 1
+            self._store(key, entry)
+        return fitted
+
+    def score(
+        self,
+        service: str,
+        metric: str,
+        detector: FittableDetector,
+        series: TimeSeries,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score `series` with the cached model, fitting it first if needed.
+        """
+        fitted = self.get_fitted(service, metric, detector, series)
+        return fitted.score(series.values, series.timestamps)
+
+    def invalidate(self, key: ModelKey) -> None:
+        """Drop a model from memory and disk so the next access refits it."""
+        with self._lock:
+            entry = self._memory.pop(key, None)
+            if entry is not None:
+                self._memory_bytes -= entry.nbytes
+            path = self._spill_path(key)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    def clear(self) -> None:
+        """Drop every model, including spilled ones."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self.spill_dir is not None:
+                for name in os.listdir(self.spill_dir):
+                    if name.endswith(".pkl"):
+                        os.remove(os.path.join(self.spill_dir, name))
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    def __contains__(self, key: ModelKey) -> bool:
+        path = self._spill_path(key)
+        return key in self._memory or (path is not None and os.path.exists(path))
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _needs_refit(self, entry: ModelEntry, series: TimeSeries) -> bool:
+        if entry.window == window_fingerprint(series):
+            return False  # same training window, refitting cannot change the model
+        if self.refit_interval is not None and self.clock() - entry.fitted_at >= self.refit_interval:
+            return True
+        if self.drift_check is not None:
+            return bool(self.drift_check(entry, series))
+        if self.drift_threshold is None:
+            return False
+
+        values = np.asarray(series.values, dtype=float)
+        values = values[np.isfinite(values)]
+        if values.size == 0:
+            return False
+        shift = abs(values.mean() - entry.train_mean) / (entry.train_std or 1e-8)
+        return shift > self.drift_threshold
+
+    def _lookup(self, key: ModelKey) -> Optional[ModelEntry]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+
+        path = self._spill_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+        os.remove(path)
+        self.stats.loads += 1
+        self._store(key, entry)
+        return entry
+
+    def _store(self, key: ModelKey, entry: ModelEntry) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.nbytes
+        self._memory[key] = entry
+        self._memory_bytes += entry.nbytes
+
+        # Evict least recently used models, but always keep the newest one
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            cold_key, cold = self._memory.popitem(last=False)
+            self._memory_bytes -= cold.nbytes
+            self.stats.evictions += 1
+            self._spill(cold_key, cold)
+
+    def _spill(self, key: ModelKey, entry: ModelEntry) -> None:
+        path = self._spill_path(key)
+        if path is None:
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self.stats.spills += 1
+
+    def _spill_path(self, key: ModelKey) -> Optional[str]:
+        if self.spill_dir is None:
+            return None
+        return os.path.join(self.spill_dir, key.filename())
@@ -1 +1,2 @@
-from .prometheus_client import PrometheusSeriesFetcher
+from .prometheus_client import PrometheusSeriesFetcher, parse_range_response, series_key
+from .fleet import FleetRunner, FleetResult
@@ -0,0 +1,290 @@
+"""
+Arrow / Parquet I/O for series, frames and incidents.
+
+Requires pyarrow (`pip install signalguard-aiops[arrow]`). Series data is
+exchanged in long format, one row per sample:
+
+    timestamp (float seconds or an Arrow timestamp) | value | label columns...
+
+`timeseries_from_arrow` wraps float64 Arrow buffers without copying;
+`iter_parquet` / `read_parquet` stream Parquet datasets into
+TimeSeriesFrames, pushing label and time-range predicates down to the
+Parquet reader (row-group statistics and hive partitions), so only matching
+data is decoded.
+"""
+from __future__ import annotations
+
+import json
+from typing import Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
+
+from ..incidents import Incident
+from ..metrics import TimeSeries, TimeSeriesFrame
+
+_UNIT_PER_SECOND = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+
+LabelFilter = Mapping[str, Union[str, Sequence[str]]]
+
+# schema metadata entry listing (service, metric, note) of every incident
+_INCIDENTS_META = b"signalguard.incidents"
+
+
+def _single_chunk(arr: Union[pa.Array, pa.ChunkedArray]) -> pa.Array:
+    if isinstance(arr, pa.ChunkedArray):
+        return arr.chunk(0) if arr.num_chunks == 1 else arr.combine_chunks()
+    return arr
+
+
+def _to_float(arr: Union[pa.Array, pa.ChunkedArray]) -> np.ndarray:
+    """float64 NumPy array; zero-copy for float64 data without nulls, nulls become NaN."""
+    arr = _single_chunk(arr)
+    if pa.types.is_timestamp(arr.type):
+        ticks = arr.cast(pa.int64()).to_numpy(zero_copy_only=False)
+        return ticks / _UNIT_PER_SECOND[arr.type.unit]
+    if arr.type != pa.float64():
+        arr = arr.cast(pa.float64())
+    if arr.null_count == 0:
+        return arr.to_numpy(zero_copy_only=True)
+    return arr.to_numpy(zero_copy_only=False)
+
+
+def timeseries_from_arrow(
+    timestamps: Union[pa.Array, pa.ChunkedArray],
+    values: Union[pa.Array, pa.ChunkedArray],
+    name: str = "",
+) -> TimeSeries:
+    """
+    TimeSeries over Arrow arrays. float64 columns without nulls (in a single
+    chunk) are used in place; Arrow timestamps are converted to seconds.
+    """
+    return TimeSeries(timestamps=_to_float(timestamps), values=_to_float(values), name=name)
+
+
+def frame_from_arrow(
+    table: pa.Table,
+    timestamp: str = "timestamp",
+    value: str = "value",
+    labels: Optional[Sequence[str]] = None,
+) -> TimeSeriesFrame:
+    """
+    TimeSeriesFrame from a long-format table.
+
+    Rows are grouped into series by the `labels` columns (default: every
+    column but the timestamp and value ones) and scattered onto the union
+    of their timestamps in one vectorized pass.
+    """
+    if labels is None:
+        labels = [c for c in table.column_names if c not in (timestamp, value)]
+    ts = _to_float(table.column(timestamp))
+    vals = _to_float(table.column(value))
+    rows, tags = _group(table, labels)
+
+    timestamps, cols = np.unique(ts, return_inverse=True)
+    matrix = np.full((len(tags), len(timestamps)), np.nan)
+    matrix[rows, cols.reshape(-1)] = vals
+    return TimeSeriesFrame(timestamps, matrix, tags=tags)
+
+
+def _group(table: pa.Table, labels: Sequence[str]):
+    """Series index of every row and the label set of every series."""
+    # mixed-radix combination of the per-column dictionary codes
+    key = np.zeros(table.num_rows, dtype=np.int64)
+    dictionaries = []
+    for label in labels:
+        encoded = pc.dictionary_encode(_single_chunk(table.column(label)).cast(pa.string()).fill_null(""))
+        dictionaries.append(encoded.dictionary.to_pylist())
+        key = key * len(dictionaries[-1]) + encoded.indices.to_numpy(zero_copy_only=False)
+    series_keys, rows = np.unique(key, return_inverse=True)
+
+    tags = []
+    for k in series_keys.tolist():
+        tag = {}
+        for label, dictionary in zip(reversed(labels), reversed(dictionaries)):
+            k, code = divmod(k, len(dictionary))
+            tag[label] = dictionary[code]
+        tags.append({label: tag[label] for label in labels})
+    return rows.reshape(-1), tags
+
+
+def frame_to_arrow(frame: TimeSeriesFrame, timestamp: str = "timestamp", value: str = "value") -> pa.Table:
+    """Long-format table of the valid points of a frame, one column per tag."""
+    rows, cols = np.nonzero(frame.valid)
+    columns = {
+        timestamp: pa.array(frame.timestamps[cols]),
+        value: pa.array(frame.values[rows, cols]),
+    }
+    keys = sorted({k for tag in frame.tags for k in tag})
+    for k in keys:
+        dictionary = pa.array([tag.get(k, "") for tag in frame.tags], type=pa.string())
+        columns[k] = pa.DictionaryArray.from_arrays(pa.array(rows.astype(np.int32)), dictionary)
+    return pa.table(columns)
+
+
+def _time_scalar(seconds: float, arrow_type: pa.DataType) -> pa.Scalar:
+    if pa.types.is_timestamp(arrow_type):
+        return pa.scalar(int(round(seconds * _UNIT_PER_SECOND[arrow_type.unit])), type=pa.int64()).cast(arrow_type)
+    return pa.scalar(float(seconds))
+
+
+def _filter(
+    schema: pa.Schema,
+    timestamp: str,
+    labels: Optional[LabelFilter],
+    start_ts: Optional[float],
+    end_ts: Optional[float],
+) -> Optional[pads.Expression]:
+    expr = None
+    conditions = []
+    for label, wanted in (labels or {}).items():
+        if isinstance(wanted, str):
+            conditions.append(pads.field(label) == wanted)
+        else:
+            conditions.append(pads.field(label).isin(list(wanted)))
+    time_type = schema.field(timestamp).type
+    if start_ts is not None:
+        conditions.append(pads.field(timestamp) >= _time_scalar(start_ts, time_type))
+    if end_ts is not None:
+        conditions.append(pads.field(timestamp) <= _time_scalar(end_ts, time_type))
+    for condition in conditions:
+        expr = condition if expr is None else expr & condition
+    return expr
+
+
+def _dataset(source, partitioning: Optional[str]) -> pads.Dataset:
+    if isinstance(source, pads.Dataset):
+        return source
+    return pads.dataset(source, format="parquet", partitioning=partitioning)
+
+
+def iter_parquet(
+    source,
+    labels: Optional[LabelFilter] = None,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    timestamp: str = "timestamp",
+    value: str = "value",
+    label_columns: Optional[Sequence[str]] = None,
+    batch_size: int = 1 << 17,
+    partitioning: Optional[str] = "hive",
+) -> Iterator[TimeSeriesFrame]:
+    """
+    Stream a Parquet file or dataset as TimeSeriesFrames of up to
+    `batch_size` rows each.
+
+    Parameters
+    ----------
+    source : str, list of str or pyarrow.dataset.Dataset
+        Parquet file(s) or directory (hive partitions such as
+        service=orders/ become label columns).
+    labels : mapping, optional
+        Label filters, e.g. {"service": "orders"} or
+        {"service": ["orders", "billing"]}.
+    start_ts, end_ts : float, optional
+        Inclusive time range in seconds.
+
+    Filters are evaluated by the Parquet scanner: row groups and partitions
+    that cannot match are skipped without being read. A series can span
+    several yielded frames.
+    """
+    dataset = _dataset(source, partitioning)
+    if label_columns is None:
+        label_columns = [c for c in dataset.schema.names if c not in (timestamp, value)]
+    columns = [timestamp, value, *label_columns]
+    expr = _filter(dataset.schema, timestamp, labels, start_ts, end_ts)
+    for batch in dataset.to_batches(columns=columns, filter=expr, batch_size=batch_size):
+        if batch.num_rows:
+            yield frame_from_arrow(pa.Table.from_batches([batch]), timestamp, value, label_columns)
+
+
+def read_parquet(
+    source,
+    labels: Optional[LabelFilter] = None,
+    start_ts: Optional[float] = None,
+    end_ts: Optional[float] = None,
+    timestamp: str = "timestamp",
+    value: str = "value",
+    label_columns: Optional[Sequence[str]] = None,
+    partitioning: Optional[str] = "hive",
+) -> TimeSeriesFrame:
+    """Read the matching part of a Parquet dataset into one frame; see `iter_parquet`."""
+    dataset = _dataset(source, partitioning)
+    if label_columns is None:
+        label_columns = [c for c in dataset.schema.names if c not in (timestamp, value)]
+    expr = _filter(dataset.schema, timestamp, labels, start_ts, end_ts)
+    table = dataset.to_table(columns=[timestamp, value, *label_columns], filter=expr)
+    return frame_from_arrow(table, timestamp, value, label_columns)
+
+
+# ----------------------------------------------------------------------
+# Incidents
+# ----------------------------------------------------------------------
+def incidents_to_arrow(incidents: Sequence[Incident], anomalies_only: bool = False) -> pa.Table:
+    """
+    Long-format table of incidents: one row per point with the incident
+    index, service, metric and note (dictionary-encoded), timestamp, score
+    and label. The schema metadata lists every incident, so incidents
+    without points survive a round trip.
+    """
+    lengths, parts = [], []
+    for incident in incidents:
+        keep = incident.labels == 1 if anomalies_only else slice(None)
+        ts, scores, labels = incident.timestamps[keep], incident.scores[keep], incident.labels[keep]
+        lengths.append(len(ts))
+        parts.append((ts, scores, labels))
+    owner = np.repeat(np.arange(len(incidents), dtype=np.int32), lengths)
+
+    def _strings(attr: str) -> pa.DictionaryArray:
+        return pa.DictionaryArray.from_arrays(
+            pa.array(owner), pa.array([getattr(i, attr) for i in incidents], type=pa.string())
+        )
+
+    table = pa.table(
+        {
+            "incident": pa.array(owner),
+            "service": _strings("service"),
+            "metric": _strings("metric"),
+            "timestamp": pa.array(np.concatenate([p[0] for p in parts]) if parts else np.zeros(0)),
+            "score": pa.array(np.concatenate([p[1] for p in parts]) if parts else np.zeros(0)),
+            "label": pa.array((np.concatenate([p[2] for p in parts]) if parts else np.zeros(0)).astype(np.int8)),
+            "note": _strings("note"),
+        }
+    )
+    heads = [[i.service, i.metric, i.note] for i in incidents]
+    return table.replace_schema_metadata({_INCIDENTS_META: json.dumps(heads)})
+
+
+def write_incidents(incidents: Sequence[Incident], path: str, anomalies_only: bool = False, **kwargs) -> None:
+    """Write incidents to a Parquet file; extra arguments go to pyarrow.parquet.write_table."""
+    pq.write_table(incidents_to_arrow(incidents, anomalies_only=anomalies_only), path, **kwargs)
+
+
+def read_incidents(source) -> List[Incident]:
+    """Read incidents written by `write_incidents`, in their original order."""
+    table = pq.read_table(source)
+    rows = _single_chunk(table.column("incident")).to_numpy(zero_copy_only=False).astype(np.int64)
+    metadata = table.schema.metadata or {}
+    if _INCIDENTS_META in metadata:
+        heads = [tuple(head) for head in json.loads(metadata[_INCIDENTS_META])]
+    else:
+        # metadata stripped: take the names from the first row of every incident
+        n = int(rows.max()) + 1 if len(rows) else 0
+        heads = [("", "", "")] * n
+        first = np.unique(rows, return_index=True)[1]
+        names = table.select(["service", "metric", "note"]).take(first).to_pylist()
+        for i, row in zip(rows[first].tolist(), names):
+            heads[i] = (row["service"], row["metric"], row["note"])
+
+    order = np.argsort(rows, kind="stable")
+    bounds = np.cumsum(np.bincount(rows, minlength=len(heads)))[:-1]
+    timestamps = np.split(_to_float(table.column("timestamp"))[order], bounds)
+    scores = np.split(_to_float(table.column("score"))[order], bounds)
+    labels = np.split(table.column("label").to_numpy()[order], bounds)
+    return [
+        Incident.from_detector_output(service, metric, ts, sc, lb, note=note)
+        for (service, metric, note), ts, sc, lb in zip(heads, timestamps, scores, labels)
+    ]
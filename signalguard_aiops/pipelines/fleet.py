@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Deque, Dict, Hashable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..incidents import Incident
+from ..metrics import TimeSeries
+from ..recipes.base import BaseRecipe
+
+RecipeSpec = Union[BaseRecipe, Sequence[BaseRecipe], Callable[[Hashable], Union[BaseRecipe, Sequence[BaseRecipe]]]]
+
+# task flags in shared memory, written by the workers
+_PENDING, _RUNNING, _DONE = 0, 1, 2
+
+
+@dataclass
+class FleetResult:
+    """
+    Outcome of one (series, recipe) task.
+
+    Attributes
+    ----------
+    key : hashable
+        Series key, as given to FleetRunner.run.
+    recipe : str
+        Recipe class name.
+    incident : Incident, optional
+        Recipe output, None if the task failed.
+    error : BaseException, optional
+        Exception raised by the recipe, TimeoutError when it exceeded the
+        time limit, or RuntimeError when it took its worker process down.
+    elapsed : float
+        Wall-clock seconds spent in `recipe.run`.
+    worker : int
+        PID of the worker process that ran the task (0 if it never ran).
+    """
+
+    key: Hashable
+    recipe: str
+    incident: Optional[Incident] = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+    worker: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class WorkerStats:
+    tasks: int = 0
+    failures: int = 0
+    busy: float = 0.0
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_values: Optional[np.ndarray] = None
+_worker_timestamps: Optional[np.ndarray] = None
+_worker_flags: Optional[np.ndarray] = None
+
+
+def _attach(name: str, dtype, length: int) -> np.ndarray:
+    block = shared_memory.SharedMemory(name=name)
+    _worker_blocks.append(block)  # keep the mapping alive
+    return np.ndarray((length,), dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(values_name: str, timestamps_name: str, flags_name: str, n_points: int, n_tasks: int) -> None:
+    global _worker_values, _worker_timestamps, _worker_flags
+    _worker_values = _attach(values_name, np.float64, n_points)
+    _worker_timestamps = _attach(timestamps_name, np.float64, n_points)
+    _worker_flags = _attach(flags_name, np.int8, n_tasks)
+    # recipes only get read-only views of the shared series
+    _worker_values.flags.writeable = False
+    _worker_timestamps.flags.writeable = False
+
+
+@contextmanager
+def _time_limit(seconds: Optional[float]):
+    # SIGALRM interrupts Python code; a single long C call finishes first
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise TimeoutError(f"recipe exceeded the {seconds}s time limit")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _run_chunk(tasks: List[tuple], timeout: Optional[float]) -> List[Tuple[int, FleetResult]]:
+    pid = os.getpid()
+    out = []
+    for tid, key, recipe, offset, length, name in tasks:
+        series = TimeSeries(
+            timestamps=_worker_timestamps[offset : offset + length],
+            values=_worker_values[offset : offset + length],
+            name=name,
+        )
+        result = FleetResult(key=key, recipe=type(recipe).__name__, worker=pid)
+        _worker_flags[tid] = _RUNNING
+        start = time.perf_counter()
+        try:
+            with _time_limit(timeout):
+                result.incident = recipe.run(series)
+        except Exception as exc:
+            result.error = exc
+        result.elapsed = time.perf_counter() - start
+        _worker_flags[tid] = _DONE
+        out.append((tid, result))
+    return out
+
+
+# ----------------------------------------------------------------------
+# Parent side
+# ----------------------------------------------------------------------
+class FleetRunner:
+    """
+    Run recipes over a fleet of series in a process pool.
+
+    All series are copied once into shared memory (one float64 block for
+    the values, one for the timestamps); workers attach to it when they
+    start and build zero-copy, read-only TimeSeries views, so a task only
+    ships its recipe and an (offset, length) pair. Tasks are submitted in
+    chunks of `chunk_size`, with at most `2 * max_workers` chunks in flight,
+    and results are yielded as their chunk completes.
+
+    Failure isolation:
+      - An exception in a recipe only fails that task.
+      - With `timeout`, a recipe running longer than `timeout` seconds is
+        interrupted with TimeoutError (POSIX only).
+      - If a task kills its worker process (segfault, OOM kill, os._exit),
+        the pool is rebuilt. Tasks that had not started or had finished are
+        resubmitted; tasks that were running at the time are re-run one at a
+        time, and a task that takes down a worker on its own is reported as
+        failed with RuntimeError.
+
+    Recipes are pickled to the workers, so they must not hold unpicklable
+    state (e.g. a ModelRegistry or an executor).
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        Number of worker processes (defaults to the CPU count).
+    chunk_size : int
+        Number of tasks per submitted chunk.
+    timeout : float, optional
+        Per-task time limit in seconds.
+    mp_context : multiprocessing context, optional
+        Start method for the workers.
+
+    Attributes
+    ----------
+    worker_stats : dict
+        WorkerStats (tasks, failures, busy seconds) by worker PID, for the
+        last run.
+    errors : dict
+        Exceptions of the last run by (key, recipe name).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 64,
+        timeout: Optional[float] = None,
+        mp_context=None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self.max_workers = max_workers
+        self.chunk_size = int(chunk_size)
+        self.timeout = timeout
+        self.mp_context = mp_context
+        self.worker_stats: Dict[int, WorkerStats] = {}
+        self.errors: Dict[Tuple[Hashable, str], BaseException] = {}
+
+    @staticmethod
+    def _recipes_for(recipes: RecipeSpec, key: Hashable) -> Sequence[BaseRecipe]:
+        if callable(recipes) and not isinstance(recipes, BaseRecipe):
+            recipes = recipes(key)
+        if isinstance(recipes, BaseRecipe):
+            return [recipes]
+        return recipes
+
+    def run(self, series: Mapping[Hashable, TimeSeries], recipes: RecipeSpec) -> Iterator[FleetResult]:
+        """
+        Run recipes on every series, yielding results as they finish.
+
+        Parameters
+        ----------
+        series : mapping
+            TimeSeries by key, e.g. {(service, metric): series}.
+        recipes : recipe, sequence of recipes, or callable
+            Recipes to run on every series, or a function key -> recipe(s)
+            to choose them per series.
+        """
+        self.worker_stats = {}
+        self.errors = {}
+
+        keys = list(series)
+        lengths = np.array([len(series[k].values) for k in keys], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        n_points = int(lengths.sum())
+
+        tasks = []
+        for i, key in enumerate(keys):
+            ts = series[key]
+            for recipe in self._recipes_for(recipes, key):
+                tasks.append((len(tasks), key, recipe, int(offsets[i]), int(lengths[i]), ts.name))
+        if not tasks:
+            return
+
+        blocks = [
+            shared_memory.SharedMemory(create=True, size=max(1, n_points * 8)),
+            shared_memory.SharedMemory(create=True, size=max(1, n_points * 8)),
+            shared_memory.SharedMemory(create=True, size=len(tasks)),
+        ]
+        try:
+            values = np.ndarray((n_points,), dtype=np.float64, buffer=blocks[0].buf)
+            timestamps = np.ndarray((n_points,), dtype=np.float64, buffer=blocks[1].buf)
+            for i, key in enumerate(keys):
+                ts = series[key]
+                values[offsets[i] : offsets[i] + lengths[i]] = ts.values
+                timestamps[offsets[i] : offsets[i] + lengths[i]] = ts.timestamps
+            del values, timestamps
+
+            flags = np.ndarray((len(tasks),), dtype=np.int8, buffer=blocks[2].buf)
+            flags[:] = _PENDING
+            init_args = (blocks[0].name, blocks[1].name, blocks[2].name, n_points, len(tasks))
+            try:
+                yield from self._dispatch(tasks, flags, init_args)
+            finally:
+                del flags  # release the buffer before closing the block
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def incidents(self, series: Mapping[Hashable, TimeSeries], recipes: RecipeSpec) -> Iterator[Incident]:
+        """Like `run`, but yield only the incidents of successful tasks."""
+        for result in self.run(series, recipes):
+            if result.ok:
+                yield result.incident
+
+    def _new_pool(self, init_args) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=init_args,
+        )
+
+    def _record(self, result: FleetResult) -> FleetResult:
+        stats = self.worker_stats.setdefault(result.worker, WorkerStats())
+        stats.tasks += 1
+        stats.busy += result.elapsed
+        if not result.ok:
+            stats.failures += 1
+            self.errors[(result.key, result.recipe)] = result.error
+        return result
+
+    def _dispatch(self, tasks: List[tuple], flags: np.ndarray, init_args) -> Iterator[FleetResult]:
+        queue: Deque[List[tuple]] = deque(
+            tasks[i : i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)
+        )
+        suspects: Deque[tuple] = deque()  # tasks running when a worker died
+        max_in_flight = 2 * (self.max_workers or os.cpu_count() or 1)
+        pending: Dict = {}  # future -> (chunk, isolated)
+
+        pool = self._new_pool(init_args)
+        try:
+            while queue or suspects or pending:
+                # suspects run alone, so a crash can be attributed
+                if suspects:
+                    if not pending:
+                        chunk = [suspects.popleft()]
+                        pending[pool.submit(_run_chunk, chunk, self.timeout)] = (chunk, True)
+                else:
+                    while queue and len(pending) < max_in_flight:
+                        chunk = queue.popleft()
+                        pending[pool.submit(_run_chunk, chunk, self.timeout)] = (chunk, False)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                broken = []
+                for future in done:
+                    chunk, isolated = pending.pop(future)
+                    try:
+                        for tid, result in future.result():
+                            yield self._record(result)
+                    except BrokenProcessPool:
+                        broken.append((chunk, isolated))
+                    except Exception as exc:
+                        # e.g. a result that cannot be pickled: retry the tasks one by one
+                        if len(chunk) > 1:
+                            queue.extendleft([task] for task in reversed(chunk))
+                        else:
+                            task = chunk[0]
+                            yield self._record(FleetResult(key=task[1], recipe=type(task[2]).__name__, error=exc))
+
+                if broken:
+                    # every other in-flight chunk died with the pool; wait for
+                    # all workers to exit before reading the task flags
+                    broken.extend(pending.values())
+                    pending.clear()
+                    pool.shutdown(wait=True)
+                    for chunk, isolated in broken:
+                        yield from self._recover(chunk, isolated, flags, queue, suspects)
+                    pool = self._new_pool(init_args)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _recover(
+        self,
+        chunk: List[tuple],
+        isolated: bool,
+        flags: np.ndarray,
+        queue: Deque[List[tuple]],
+        suspects: Deque[tuple],
+    ) -> Iterator[FleetResult]:
+        retry = []
+        for task in chunk:
+            tid = task[0]
+            if flags[tid] != _RUNNING:
+                retry.append(task)  # not started, or finished but its result was lost
+            elif isolated:
+                error = RuntimeError(f"worker process died while running {type(task[2]).__name__} on {task[1]!r}")
+                yield self._record(FleetResult(key=task[1], recipe=type(task[2]).__name__, error=error))
+            else:
+                suspects.append(task)
+            flags[tid] = _PENDING
+        if retry:
+            queue.appendleft(retry)
@@ -1,12 +1,76 @@
 from __future__ import annotations
 
+import json
+import re
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Any, Dict, List, Mapping, Tuple, Union
 
 import requests
 import numpy as np
 
-from ..metrics import TimeSeries
+from ..metrics import TimeSeries, TimeSeriesFrame
+
+# the sample list of one result: "values": [[<ts>, "<value>"], ...]
+_VALUES = re.compile(rb'"values"\s*:\s*\[((?:\s*\[[^\]]*\]\s*,?)*)\s*\]')
+
+
+def series_key(labels: Mapping[str, str]) -> str:
+    """Prometheus-style identifier of a label set, e.g. 'http_errors{service="orders"}'."""
+    name = labels.get("__name__", "")
+    rest = ",".join(f'{k}="{v}"' for k, v in sorted(labels.items()) if k != "__name__")
+    return f"{name}{{{rest}}}" if rest or not name else name
+
+
+def parse_range_response(body: Union[bytes, str]) -> Tuple[List[Dict[str, str]], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a raw /api/v1/query_range response body.
+
+    The sample lists are cut out of the body before JSON decoding, so only
+    the small label skeleton becomes Python objects; the samples of all
+    results are then stripped of brackets and quotes and converted to
+    float64 in a single `np.fromstring` call. Bodies the fast path cannot
+    account for are parsed with the json module instead.
+
+    Returns
+    -------
+    labels : list of dict
+        Metric labels of every result.
+    lengths : np.ndarray
+        Number of samples of every result.
+    timestamps, values : np.ndarray
+        Samples of all results, concatenated in result order.
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+
+    parts, segments, prev = [], [], 0
+    for match in _VALUES.finditer(body):
+        parts.append(body[prev : match.start(1)])
+        segments.append(match.group(1))
+        prev = match.end(1)
+    parts.append(body[prev:])
+    data = json.loads(b"".join(parts))
+    results = _results(data)
+
+    lengths = np.array([s.count(b"[") for s in segments], dtype=np.int64)
+    if len(segments) == len(results):
+        flat = np.fromstring(b",".join(s for s in segments if s).translate(None, b'[]"'), sep=",")
+        if len(flat) == 2 * lengths.sum():
+            return [dict(r.get("metric", {})) for r in results], lengths, flat[0::2], flat[1::2]
+
+    # unexpected layout: decode everything
+    results = _results(json.loads(body))
+    lengths = np.array([len(r.get("values", [])) for r in results], dtype=np.int64)
+    n = int(lengths.sum())
+    timestamps = np.fromiter((p[0] for r in results for p in r.get("values", [])), dtype=float, count=n)
+    values = np.fromiter((p[1] for r in results for p in r.get("values", [])), dtype=float, count=n)
+    return [dict(r.get("metric", {})) for r in results], lengths, timestamps, values
+
+
+def _results(data: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+    if data.get("status") == "error":
+        raise ValueError(f"Prometheus query failed: {data.get('errorType', '')}: {data.get('error', '')}")
+    return data.get("data", {}).get("result", [])
 
 
 @dataclass
@@ -23,6 +87,17 @@ class PrometheusSeriesFetcher:
 
     base_url: str
 
+    def _query_range(self, query: str, start_ts: float, end_ts: float, step: str) -> bytes:
+        params = {
+            "query": query,
+            "start": start_ts,
+            "end": end_ts,
+            "step": step,
+        }
+        resp = requests.get(f"{self.base_url}/api/v1/query_range", params=params, timeout=10)
+        resp.raise_for_status()
+        return resp.content
+
     def fetch_range(
         self,
         query: str,
@@ -33,27 +108,41 @@ class PrometheusSeriesFetcher:
         """
         Fetch a range vector for the given query and time span.
 
-        Returns the first series in the response as a TimeSeries.
+        Returns the first series in the response as a TimeSeries; use
+        `fetch_all` or `fetch_frame` for queries returning several series.
         """
-        params = {
-            "query": query,
-            "start": start_ts,
-            "end": end_ts,
-            "step": step,
-        }
-        resp = requests.get(f"{self.base_url}/api/v1/query_range", params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        results = data.get("data", {}).get("result", [])
-        if not results:
+        labels, lengths, timestamps, values = parse_range_response(self._query_range(query, start_ts, end_ts, step))
+        if not labels:
             return TimeSeries.from_lists([], [], name=query)
+        n = int(lengths[0])
+        return TimeSeries(timestamps=timestamps[:n], values=values[:n], name=query)
 
-        # For simplicity, take the first result
-        series = results[0]
-        values = series["values"]  # list of [timestamp, value_str]
-
-        timestamps = np.array([float(t) for t, _ in values], dtype=float)
-        vals = np.array([float(v) for _, v in values], dtype=float)
+    def fetch_all(
+        self,
+        query: str,
+        start_ts: float,
+        end_ts: float,
+        step: str = "30s",
+    ) -> Dict[str, TimeSeries]:
+        """
+        Fetch every series of a range query, keyed (and named) by
+        `series_key` of its labels, e.g. 'http_errors{service="orders"}'.
+        """
+        labels, lengths, timestamps, values = parse_range_response(self._query_range(query, start_ts, end_ts, step))
+        bounds = np.cumsum(lengths)[:-1]
+        out = {}
+        for tags, ts, vals in zip(labels, np.split(timestamps, bounds), np.split(values, bounds)):
+            key = series_key(tags)
+            out[key] = TimeSeries(timestamps=ts, values=vals, name=key)
+        return out
 
-        return TimeSeries.from_lists(timestamps, vals, name=query)
+    def fetch_frame(
+        self,
+        query: str,
+        start_ts: float,
+        end_ts: float,
+        step: str = "30s",
+    ) -> TimeSeriesFrame:
+        """Fetch every series of a range query as one TimeSeriesFrame tagged with their labels."""
+        labels, lengths, timestamps, values = parse_range_response(self._query_range(query, start_ts, end_ts, step))
+        return TimeSeriesFrame.from_samples(labels, lengths, timestamps, values)
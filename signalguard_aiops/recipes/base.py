@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import copy
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
 
 from ..metrics import TimeSeries
 from ..incidents import Incident
+from ..detectors import BaseDetector, StreamingDetector
+
+# seconds of history the full-recomputation fallback keeps by default
+DEFAULT_HISTORY_WINDOW = 24 * 3600.0
 
 
 class BaseRecipe(ABC):
@@ -13,8 +20,37 @@ class BaseRecipe(ABC):
     - Takes a TimeSeries (metric),
     - Runs one or more detectors,
     - Returns an Incident plus optional metadata.
+
+    Incremental execution: `run_incremental(new_points)` scores only the
+    points appended since the previous call and returns an Incident for
+    that tail. Recipes built on a streaming detector override
+    `_stream_detector` (and `_incident`), so only the delta is processed;
+    every other recipe falls back to re-running `run` on the retained
+    history: the last `history_window` seconds (24 hours by default; a
+    constructor field of the built-in recipes). None keeps everything.
+    The state behind this is exposed through `get_state` / `set_state` and
+    can be pickled to persist it between evaluator restarts.
+
+    Recipes that split into detectors plus a combine step expose them via
+    `plan_detectors` / `combine`, which rule plans use to share detector
+    work between recipes.
+
+    Recipes fed from a `metrics.Rollup` declare their input resolution with
+    `tier` ("1m", "5m", "1h", ... or None for the raw recent window) and
+    `tier_agg` (the bucket aggregate: "mean", "max", ...), so long-horizon
+    recipes run on coarse buckets instead of raw points. Recipes that
+    implement `run_on_baseline` can instead set `baseline_tier`: the raw
+    recent window is then scored against a mean / std pooled from that
+    tier's buckets. The built-in recipes take these as constructor fields.
     """
 
+    # seconds of history retained for the full-recomputation fallback
+    history_window: Optional[float] = DEFAULT_HISTORY_WINDOW
+    # rollup tier and bucket aggregate the recipe runs on (see metrics.Rollup)
+    tier: Optional[str] = None
+    tier_agg: str = "mean"
+    baseline_tier: Optional[str] = None
+
     @abstractmethod
     def run(self, series: TimeSeries) -> Incident:
         """
@@ -22,9 +58,127 @@ class BaseRecipe(ABC):
         """
         raise NotImplementedError
 
+    def run_on_baseline(self, series: TimeSeries, mean: float, std: float) -> Incident:
+        """
+        Score `series` against a baseline mean / std computed elsewhere (e.g.
+        from rollup buckets by `metrics.Rollup.run`) instead of from the
+        series itself.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot run on a precomputed baseline")
+
     def run_with_meta(self, series: TimeSeries) -> Dict[str, Any]:
         """
         Optional: return incident + extra info, e.g. detector scores, params.
         """
         incident = self.run(series)
         return {"incident": incident}
+
+    # ------------------------------------------------------------------
+    # Evaluation plans (see signalguard_aiops.rules)
+    # ------------------------------------------------------------------
+    def plan_detectors(self) -> Optional[Dict[str, BaseDetector]]:
+        """
+        Detectors this recipe runs on its input series, by name, or None if
+        the recipe cannot be split into detector and combine steps.
+
+        Rule plans run each distinct (series, detector, params) once and pass
+        the outputs to `combine`, so recipes sharing a detector share its
+        work. Recipes returning None are evaluated with `run`.
+        """
+        return None
+
+    def combine(self, series: TimeSeries, outputs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        """
+        Build the Incident from the (labels, scores) of every detector named
+        in `plan_detectors`. Equivalent to `run(series)`.
+        """
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Incremental execution
+    # ------------------------------------------------------------------
+    def _stream_detector(self) -> Optional[StreamingDetector]:
+        """
+        Fresh streaming detector for incremental runs, or None if the recipe
+        cannot stream. Recipes returning one must also implement `_incident`.
+        """
+        return None
+
+    def _incident(self, series: TimeSeries, labels: np.ndarray, scores: np.ndarray) -> Incident:
+        """Build the recipe's Incident from its detector output on `series`."""
+        raise NotImplementedError
+
+    def run_incremental(self, new_points: TimeSeries) -> Incident:
+        """
+        Process points appended after the previous call and return the
+        Incident for those points only.
+
+        The first call starts from an empty state (or the one restored with
+        `set_state`). Timestamps must be newer than every point seen so far.
+        """
+        state = self.__dict__.get("_incremental_state")
+        if state is None:
+            state = self._initial_state()
+
+        if len(new_points.timestamps) and state["last_ts"] is not None:
+            if np.asarray(new_points.timestamps, dtype=float)[0] <= state["last_ts"]:
+                raise ValueError("run_incremental expects points newer than the last processed timestamp")
+
+        if state["detector"] is not None:
+            labels, scores = state["detector"].update_many(new_points.values)
+            incident = self._incident(new_points, labels, scores)
+        else:
+            incident = self._run_on_history(state, new_points)
+
+        if len(new_points.timestamps):
+            state["last_ts"] = float(new_points.timestamps[-1])
+        self._incremental_state = state
+        return incident
+
+    def _initial_state(self) -> Dict[str, Any]:
+        return {
+            "detector": self._stream_detector(),
+            "history": None,
+            "last_ts": None,
+        }
+
+    def _run_on_history(self, state: Dict[str, Any], new_points: TimeSeries) -> Incident:
+        history = state["history"]
+        if history is None:
+            timestamps = np.asarray(new_points.timestamps, dtype=float)
+            values = np.asarray(new_points.values, dtype=float)
+        else:
+            timestamps = np.concatenate([history.timestamps, new_points.timestamps])
+            values = np.concatenate([history.values, new_points.values])
+
+        if self.history_window is not None and len(timestamps):
+            keep = timestamps > timestamps[-1] - self.history_window
+            keep[len(timestamps) - len(new_points.values) :] = True  # the new points are always scored
+            timestamps, values = timestamps[keep], values[keep]
+
+        history = TimeSeries(timestamps=timestamps, values=values, name=new_points.name)
+        state["history"] = history
+
+        full = self.run(history)
+        tail = slice(len(timestamps) - len(new_points.values), None)
+        return Incident.from_detector_output(
+            service=full.service,
+            metric=full.metric,
+            timestamps=full.timestamps[tail],
+            scores=full.scores[tail],
+            labels=full.labels[tail],
+            note=full.note,
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        """Incremental state (picklable) for persisting between runs."""
+        state = self.__dict__.get("_incremental_state")
+        return copy.deepcopy(state) if state is not None else self._initial_state()
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        """Restore incremental state obtained from `get_state`."""
+        self._incremental_state = copy.deepcopy(state)
+
+    def reset_state(self) -> None:
+        """Forget all incremental state; the next call starts from scratch."""
+        self.__dict__.pop("_incremental_state", None)
@@ -1,14 +1,59 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from .. import detectors
 from ..metrics import TimeSeries
-from ..detectors import ZScoreDetector, IsolationForestDetector, LOFDetector
+from ..detectors import BaseDetector, ZScoreDetector
+from ..detectors.base import FittableDetector, _detect
 from ..incidents import Incident
-from .base import BaseRecipe
+from .base import DEFAULT_HISTORY_WINDOW, BaseRecipe
+
+if TYPE_CHECKING:
+    from ..models import ModelRegistry
+
+
+def normalize_scores(scores: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Min-max normalize scores to [0, 1] along the last axis.
+
+    Works on a single score vector or a stacked (n_rows, n_points) matrix,
+    normalizing each row independently. With a `mask`, only valid points
+    contribute to the min / max and invalid points are returned as 0.
+    """
+    x = np.asarray(scores, dtype=float)
+    if x.shape[-1] == 0:
+        return x.copy()
+
+    if mask is None:
+        lo = x.min(axis=-1, keepdims=True)
+        x = x - lo
+        maxv = x.max(axis=-1, keepdims=True)
+    else:
+        mask = np.asarray(mask, dtype=bool)
+        lo = np.where(mask, x, np.inf).min(axis=-1, keepdims=True)
+        x = np.where(mask, x - lo, 0.0)
+        maxv = np.where(mask, x, -np.inf).max(axis=-1, keepdims=True)
+        maxv = np.where(np.isneginf(maxv), 0.0, maxv)  # rows without valid points
+
+    maxv = np.where(maxv == 0, 1e-8, maxv)
+    return x / maxv
+
+
+def _run_member(
+    detector: BaseDetector,
+    values: np.ndarray,
+    timestamps: np.ndarray,
+    fitted: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # module-level so it can be shipped to process pools
+    if fitted:
+        return detector.score(values, timestamps)
+    return _detect(detector, values, timestamps)
 
 
 @dataclass
@@ -16,16 +61,38 @@ class EnsembleErrorRateRecipe(BaseRecipe):
     """
     Ensemble recipe for error-rate anomalies.
 
-    Uses multiple detectors and aggregates their votes:
+    Uses multiple detectors and aggregates their votes. By default:
       - ZScoreDetector
       - IsolationForestDetector
       - LOFDetector
 
+    Any other set can be passed as `members`, with optional per-detector
+    `weights` (default 1 each).
+
     Label rule:
-      - A point is anomalous if at least `min_votes` detectors mark it.
+      - A point is anomalous if the (weighted) number of detectors marking
+        it is at least `min_votes`.
 
     Score rule:
-      - Average of normalized scores from all detectors.
+      - (Weighted) average of normalized scores from all detectors.
+
+    Both rules are evaluated in one step over the stacked
+    (n_detectors, n_points) label and score matrices.
+
+    Detectors run one after another unless `executor` is set:
+      - "thread": a thread pool; detectors that release the GIL (NumPy,
+        sklearn) then run in parallel, so a run costs about as much as its
+        slowest detector.
+      - "process": a process pool, for detectors that hold the GIL.
+      - a concurrent.futures.Executor instance, used as-is.
+    Pools created by the recipe are reused across runs; `close()` shuts them
+    down.
+
+    With a `registry`, fittable detectors (IsolationForest, LOF, ...) are
+    fitted once per (service, metric) and reused across runs; LOF then
+    scores in novelty mode against its training window. Fitting goes
+    through the registry in the calling process, only scoring is dispatched
+    to the executor.
     """
 
     service: str
@@ -39,38 +106,121 @@ class EnsembleErrorRateRecipe(BaseRecipe):
     iforest_contamination: float = 0.05
     lof_contamination: float = 0.05
 
+    registry: Optional["ModelRegistry"] = None
+
+    # Custom detector set, replaces the three defaults above
+    members: Optional[Sequence[BaseDetector]] = None
+    weights: Optional[Sequence[float]] = None
+
+    executor: Union[None, str, Executor] = None
+    max_workers: Optional[int] = None
+    history_window: Optional[float] = DEFAULT_HISTORY_WINDOW
+    tier: Optional[str] = None
+    tier_agg: str = "mean"
+
+    _pool: Optional[Executor] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.weights is not None:
+            weights = np.asarray(self.weights, dtype=float)
+            if weights.ndim != 1 or not np.all(np.isfinite(weights)) or np.any(weights < 0):
+                raise ValueError("weights must be a sequence of finite, non-negative numbers")
+            if weights.sum() <= 0:
+                raise ValueError("weights must not all be zero")
+
+    def __getstate__(self) -> Dict[str, object]:
+        # pools cannot be pickled (e.g. when shipped to FleetRunner workers);
+        # the copy creates its own on first use
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _members(self) -> List[BaseDetector]:
+        if self.members is not None:
+            return list(self.members)
+        return [
+            ZScoreDetector(window=self.z_window, z_thresh=self.z_thresh),
+            detectors.IsolationForestDetector(contamination=self.iforest_contamination),
+            detectors.LOFDetector(contamination=self.lof_contamination),
+        ]
+
+    def _weights(self, n_members: int) -> np.ndarray:
+        if self.weights is None:
+            return np.ones(n_members)
+        weights = np.asarray(self.weights, dtype=float)
+        if weights.shape != (n_members,):
+            raise ValueError(f"expected {n_members} weights, got {weights.shape[0] if weights.ndim else 0}")
+        return weights
+
+    def _executor(self) -> Optional[Executor]:
+        if self.executor is None or isinstance(self.executor, Executor):
+            return self.executor
+        if self._pool is None:
+            if self.executor == "thread":
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            elif self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                raise ValueError(f"executor must be 'thread', 'process' or an Executor, got {self.executor!r}")
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the pool created by this recipe, if any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run_members(self, members: List[BaseDetector], series: TimeSeries) -> List[Tuple[np.ndarray, np.ndarray]]:
+        tasks = []
+        for det in members:
+            if self.registry is not None and isinstance(det, FittableDetector):
+                det = self.registry.get_fitted(self.service, self.metric, det, series)
+                tasks.append((det, True))
+            else:
+                tasks.append((det, False))
+
+        pool = self._executor()
+        if pool is None or len(tasks) < 2:
+            return [_run_member(det, series.values, series.timestamps, fitted) for det, fitted in tasks]
+
+        futures = [pool.submit(_run_member, det, series.values, series.timestamps, fitted) for det, fitted in tasks]
+        return [f.result() for f in futures]
+
+    def _member_names(self, n_members: int) -> List[str]:
+        if self.members is None:
+            return ["zscore", "iforest", "lof"]
+        return [f"member_{i}" for i in range(n_members)]
+
     def run(self, series: TimeSeries) -> Incident:
-        values = series.values
+        members = self._members()
+        return self._aggregate(series, self._run_members(members, series))
 
-        # 1) Run detectors
-        z_det = ZScoreDetector(window=self.z_window, z_thresh=self.z_thresh)
-        z_labels, z_scores = z_det.detect(values)
+    def plan_detectors(self) -> Optional[Dict[str, BaseDetector]]:
+        if self.registry is not None:
+            return None  # fittable members score with the registry's models
+        members = self._members()
+        return dict(zip(self._member_names(len(members)), members))
 
-        iforest_det = IsolationForestDetector(contamination=self.iforest_contamination)
-        i_labels, i_scores = iforest_det.detect(values)
+    def combine(self, series: TimeSeries, outputs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        names = self._member_names(len(outputs))
+        return self._aggregate(series, [outputs[name] for name in names])
 
-        lof_det = LOFDetector(contamination=self.lof_contamination)
-        l_labels, l_scores = lof_det.detect(values)
+    def _aggregate(self, series: TimeSeries, outputs: List[Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        weights = self._weights(len(outputs))
+
+        # 1) Stack detector outputs
+        labels = np.vstack([lab for lab, _ in outputs])
+        scores = np.vstack([sc for _, sc in outputs])
 
         # 2) Normalize scores to [0,1]
-        def _norm(x: np.ndarray) -> np.ndarray:
-            x = np.asarray(x, dtype=float)
-            if x.size == 0:
-                return x
-            x = x - x.min()
-            maxv = x.max() or 1e-8
-            return x / maxv
-
-        z_scores_n = _norm(z_scores)
-        i_scores_n = _norm(i_scores)
-        l_scores_n = _norm(l_scores)
-
-        # 3) Majority vote on labels
-        votes = z_labels + i_labels + l_labels
+        scores_n = normalize_scores(scores)
+
+        # 3) Weighted majority vote on labels
+        votes = weights @ labels
         ensemble_labels = (votes >= self.min_votes).astype(int)
 
-        # 4) Average scores
-        ensemble_scores = (z_scores_n + i_scores_n + l_scores_n) / 3.0
+        # 4) Weighted average of scores
+        ensemble_scores = weights @ scores_n / weights.sum()
 
         incident = Incident.from_detector_output(
             service=self.service,
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import numpy as np
 
+from .. import detectors
 from ..metrics import TimeSeries
-from ..detectors import ZScoreDetector, IsolationForestDetector
+from ..detectors import BaseDetector, ZScoreDetector
 from ..incidents import Incident
 from ..incidents import IncidentScorer
-from .base import BaseRecipe
+from .base import DEFAULT_HISTORY_WINDOW, BaseRecipe
+
+if TYPE_CHECKING:
+    from ..models import ModelRegistry
 
 
 @dataclass
@@ -21,6 +25,10 @@ class ErrorRateZScoreRecipe(BaseRecipe):
     Good for:
       - Simple, interpretable baselines
       - Fast experimentation on error_rate / failure_rate series
+
+    With `baseline_tier`, `metrics.Rollup.run` scores the raw recent window
+    against the mean / std of that rollup tier (e.g. "1h" over weeks)
+    instead of the trailing `window` points.
     """
 
     service: str
@@ -28,16 +36,20 @@ class ErrorRateZScoreRecipe(BaseRecipe):
     window: int = 30
     z_thresh: float = 3.0
     min_history: int = 10
+    history_window: Optional[float] = DEFAULT_HISTORY_WINDOW
+    tier: Optional[str] = None
+    tier_agg: str = "mean"
+    baseline_tier: Optional[str] = None
 
-    def run(self, series: TimeSeries) -> Incident:
-        detector = ZScoreDetector(
+    def _stream_detector(self) -> ZScoreDetector:
+        return ZScoreDetector(
             window=self.window,
             z_thresh=self.z_thresh,
             min_history=self.min_history,
         )
-        labels, scores = detector.detect(series.values)
 
-        incident = Incident.from_detector_output(
+    def _incident(self, series: TimeSeries, labels: np.ndarray, scores: np.ndarray) -> Incident:
+        return Incident.from_detector_output(
             service=self.service,
             metric=self.metric,
             timestamps=series.timestamps,
@@ -45,7 +57,24 @@ class ErrorRateZScoreRecipe(BaseRecipe):
             labels=labels,
             note=f"ErrorRateZScoreRecipe (window={self.window}, z={self.z_thresh})",
         )
-        return incident
+
+    def run(self, series: TimeSeries) -> Incident:
+        labels, scores = self._stream_detector().detect(series.values)
+        return self._incident(series, labels, scores)
+
+    def run_on_baseline(self, series: TimeSeries, mean: float, std: float) -> Incident:
+        std = std or 1e-8  # avoid division by zero
+        with np.errstate(invalid="ignore"):
+            scores = np.abs((np.asarray(series.values, dtype=float) - mean) / std)
+        scores = np.where(np.isfinite(scores), scores, 0.0)
+        labels = (scores >= self.z_thresh).astype(int)
+        return self._incident(series, labels, scores)
+
+    def plan_detectors(self) -> Dict[str, BaseDetector]:
+        return {"zscore": self._stream_detector()}
+
+    def combine(self, series: TimeSeries, outputs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        return self._incident(series, *outputs["zscore"])
 
 
 @dataclass
@@ -56,21 +85,28 @@ class ErrorRateIForestRecipe(BaseRecipe):
     Good for:
       - Non-Gaussian error distributions
       - Complex patterns where simple thresholds are not enough
+
+    With a `registry`, the forest is fitted once per (service, metric) and
+    reused across runs instead of being retrained on every call.
     """
 
     service: str
     metric: str = "error_rate"
     contamination: float = 0.05
     n_estimators: int = 100
+    registry: Optional["ModelRegistry"] = None
+    history_window: Optional[float] = DEFAULT_HISTORY_WINDOW
+    tier: Optional[str] = None
+    tier_agg: str = "mean"
 
-    def run(self, series: TimeSeries) -> Incident:
-        detector = IsolationForestDetector(
+    def _detector(self):
+        return detectors.IsolationForestDetector(
             n_estimators=self.n_estimators,
             contamination=self.contamination,
         )
-        labels, scores = detector.detect(series.values)
 
-        incident = Incident.from_detector_output(
+    def _incident(self, series: TimeSeries, labels: np.ndarray, scores: np.ndarray) -> Incident:
+        return Incident.from_detector_output(
             service=self.service,
             metric=self.metric,
             timestamps=series.timestamps,
@@ -78,4 +114,19 @@ class ErrorRateIForestRecipe(BaseRecipe):
             labels=labels,
             note=f"ErrorRateIForestRecipe (contamination={self.contamination})",
         )
-        return incident
+
+    def run(self, series: TimeSeries) -> Incident:
+        detector = self._detector()
+        if self.registry is not None:
+            labels, scores = self.registry.score(self.service, self.metric, detector, series)
+        else:
+            labels, scores = detector.detect(series.values)
+        return self._incident(series, labels, scores)
+
+    def plan_detectors(self) -> Optional[Dict[str, BaseDetector]]:
+        if self.registry is not None:
+            return None  # scoring depends on the registry's fitted model
+        return {"iforest": self._detector()}
+
+    def combine(self, series: TimeSeries, outputs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        return self._incident(series, *outputs["iforest"])
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 from ..metrics import TimeSeries
-from ..detectors import EMADetector
+from ..detectors import BaseDetector, EMADetector
 from ..incidents import Incident
-from .base import BaseRecipe
+from .base import DEFAULT_HISTORY_WINDOW, BaseRecipe
 
 
 @dataclass
@@ -27,15 +30,28 @@ class LatencySLORecipe(BaseRecipe):
     alpha: float = 0.2
     k_sigma: float = 3.0
     warmup: int = 10
+    history_window: Optional[float] = DEFAULT_HISTORY_WINDOW
+    tier: Optional[str] = None
+    tier_agg: str = "mean"
+
+    def _stream_detector(self) -> EMADetector:
+        return EMADetector(alpha=self.alpha, k_sigma=self.k_sigma, warmup=self.warmup)
 
     def run(self, series: TimeSeries) -> Incident:
         # EMADetector on latency values
-        detector = EMADetector(alpha=self.alpha, k_sigma=self.k_sigma, warmup=self.warmup)
-        labels_ema, scores_ema = detector.detect(series.values)
+        labels_ema, scores_ema = self._stream_detector().detect(series.values)
+        return self._incident(series, labels_ema, scores_ema)
+
+    def plan_detectors(self) -> Dict[str, BaseDetector]:
+        return {"ema": self._stream_detector()}
+
+    def combine(self, series: TimeSeries, outputs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Incident:
+        return self._incident(series, *outputs["ema"])
 
+    def _incident(self, series: TimeSeries, labels_ema: np.ndarray, scores_ema: np.ndarray) -> Incident:
         # SLO threshold check (assumes series.values are in seconds)
         slo_sec = self.slo_ms / 1000.0
-        slo_breach_labels = (series.values > slo_sec).astype(int)
+        slo_breach_labels = (np.asarray(series.values) > slo_sec).astype(int)
 
         # Combine EMA anomaly and SLO breach
         combined_labels = ((labels_ema == 1) | (slo_breach_labels == 1)).astype(int)
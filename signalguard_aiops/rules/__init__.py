@@ -0,0 +1,29 @@
+"""
+Declarative alert rules.
+
+Rule files (TOML, or YAML with PyYAML installed) describe PromQL queries,
+detectors and recipes; `compile_rules` turns them into an EvaluationPlan
+that fetches each query once and runs each (series, detector, params)
+combination once, sharing the outputs between recipes:
+
+    plan = compile_rules(load_rules("rules.toml"))
+    plan.dry_run(range_seconds=86400)
+    incidents = plan.evaluate_prometheus(PrometheusSeriesFetcher(url), start, end)
+
+From the command line:
+
+    python -m signalguard_aiops.rules rules.toml --dry-run --range 24h
+"""
+from .config import (
+    RECIPES,
+    DetectorSpec,
+    QuerySpec,
+    RuleConfig,
+    RuleConfigError,
+    RuleSpec,
+    load_rules,
+    loads_rules,
+    parse_duration,
+    parse_rules,
+)
+from .plan import EvaluationPlan, PlanStats, compile_rules
@@ -0,0 +1,40 @@
+"""
+Command line entry point: compile a rule file, print the plan or evaluate it.
+
+    python -m signalguard_aiops.rules rules.toml --dry-run --range 24h
+    python -m signalguard_aiops.rules rules.yaml --prometheus http://localhost:9090
+"""
+import argparse
+import time
+
+from . import compile_rules, load_rules, parse_duration
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m signalguard_aiops.rules")
+    parser.add_argument("rules", help="rule file (.toml, .yaml or .yml)")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan and cost estimate only")
+    parser.add_argument("--range", default="1h", help="query range, e.g. 1h or 24h (default 1h)")
+    parser.add_argument("--prometheus", default="http://localhost:9090", help="Prometheus base URL")
+    args = parser.parse_args(argv)
+
+    plan = compile_rules(load_rules(args.rules))
+    range_seconds = parse_duration(args.range)
+    if args.dry_run:
+        plan.dry_run(range_seconds)
+        return
+
+    from ..pipelines import PrometheusSeriesFetcher
+
+    end = time.time()
+    incidents = plan.evaluate_prometheus(PrometheusSeriesFetcher(args.prometheus), end - range_seconds, end)
+    for name, incident in incidents.items():
+        print(f"{name:<40} anomalies={len(incident.anomaly_indices()):<5} max_score={incident.max_score():.3f}")
+    print(
+        f"\n{plan.stats.fetches} fetches, {plan.stats.detector_runs} detector runs "
+        f"({plan.stats.detector_outputs_shared} shared outputs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
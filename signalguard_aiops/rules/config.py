@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Type
+
+from .. import detectors
+from ..detectors import BaseDetector
+from ..recipes import (
+    BaseRecipe,
+    EnsembleErrorRateRecipe,
+    ErrorRateIForestRecipe,
+    ErrorRateZScoreRecipe,
+    LatencySLORecipe,
+)
+
+# rule "recipe" name -> recipe class (class names are accepted too)
+RECIPES: Dict[str, Type[BaseRecipe]] = {
+    "error_rate_zscore": ErrorRateZScoreRecipe,
+    "error_rate_iforest": ErrorRateIForestRecipe,
+    "latency_slo": LatencySLORecipe,
+    "ensemble_error_rate": EnsembleErrorRateRecipe,
+}
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)?\s*$")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0, "w": 604800.0, None: 1.0}
+
+
+class RuleConfigError(ValueError):
+    """Raised for invalid rule files."""
+
+
+def parse_duration(value) -> float:
+    """Seconds in a Prometheus-style duration ("30s", "5m", "1h") or a number."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _DURATION.match(str(value))
+    if match is None:
+        raise RuleConfigError(f"invalid duration {value!r}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+@dataclass
+class QuerySpec:
+    """A PromQL range query."""
+
+    name: str
+    promql: str
+    step: str = "30s"
+
+
+@dataclass
+class DetectorSpec:
+    """A detector type from the detector registry plus its parameters."""
+
+    type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def build(self) -> BaseDetector:
+        try:
+            cls = detectors.get_detector(self.type)
+        except KeyError as exc:
+            raise RuleConfigError(str(exc)) from None
+        return cls(**self.params)
+
+
+@dataclass
+class RuleSpec:
+    """One recipe evaluated on one query."""
+
+    name: str
+    recipe: str
+    query: str
+    service: str
+    metric: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RuleConfig:
+    """
+    Parsed rule file.
+
+    Layout (YAML shown; TOML uses the same keys with [queries.<name>],
+    [detectors.<name>] and [[rules]] tables):
+
+        queries:
+          orders_errors:
+            promql: sum(rate(errors_total{service="orders"}[5m])) / sum(rate(requests_total{service="orders"}[5m]))
+            step: 30s
+        detectors:
+          z_baseline: {type: zscore, window: 30}
+        rules:
+          - name: orders-error-alert
+            recipe: error_rate_zscore
+            query: orders_errors
+            service: orders
+          - name: orders-ensemble
+            recipe: ensemble_error_rate
+            query: orders_errors
+            service: orders
+            params:
+              members: [z_baseline, {type: lof, n_neighbors: 20}]
+
+    A rule's `query` names an entry of `queries` or is an inline PromQL
+    expression. Ensemble `members` reference `detectors` entries or give an
+    inline {type: ..., <params>} table.
+    """
+
+    queries: Dict[str, QuerySpec] = field(default_factory=dict)
+    detectors: Dict[str, DetectorSpec] = field(default_factory=dict)
+    rules: List[RuleSpec] = field(default_factory=list)
+
+    def query_for(self, rule: RuleSpec) -> QuerySpec:
+        if rule.query in self.queries:
+            return self.queries[rule.query]
+        return QuerySpec(name=rule.query, promql=rule.query)
+
+    def detector(self, ref) -> BaseDetector:
+        """Build a detector from a `detectors` name or an inline {type: ...} mapping."""
+        if isinstance(ref, str):
+            if ref in self.detectors:
+                return self.detectors[ref].build()
+            return DetectorSpec(type=ref).build()
+        if isinstance(ref, Mapping):
+            params = dict(ref)
+            if "type" not in params:
+                raise RuleConfigError(f"inline detector needs a 'type': {ref!r}")
+            return DetectorSpec(type=params.pop("type"), params=params).build()
+        raise RuleConfigError(f"invalid detector reference {ref!r}")
+
+    def build_recipe(self, rule: RuleSpec) -> BaseRecipe:
+        cls = RECIPES.get(rule.recipe) or {c.__name__: c for c in RECIPES.values()}.get(rule.recipe)
+        if cls is None:
+            raise RuleConfigError(f"rule {rule.name!r}: unknown recipe {rule.recipe!r}. Available: {', '.join(RECIPES)}")
+
+        kwargs = dict(rule.params)
+        if "members" in kwargs:
+            kwargs["members"] = [self.detector(ref) for ref in kwargs["members"]]
+        kwargs["service"] = rule.service
+        if rule.metric is not None:
+            kwargs["metric"] = rule.metric
+        try:
+            return cls(**kwargs)
+        except TypeError as exc:
+            raise RuleConfigError(f"rule {rule.name!r}: {exc}") from None
+
+
+def parse_rules(data: Mapping[str, Any]) -> RuleConfig:
+    """Validate a rule document (already parsed from TOML / YAML / JSON)."""
+    if not isinstance(data, Mapping):
+        raise RuleConfigError("rule document must be a mapping")
+    unknown = set(data) - {"queries", "detectors", "rules"}
+    if unknown:
+        raise RuleConfigError(f"unknown top-level keys: {', '.join(sorted(unknown))}")
+
+    config = RuleConfig()
+    for name, spec in (data.get("queries") or {}).items():
+        if isinstance(spec, str):
+            spec = {"promql": spec}
+        if "promql" not in spec:
+            raise RuleConfigError(f"query {name!r} needs 'promql'")
+        step = spec.get("step", "30s")
+        parse_duration(step)
+        config.queries[name] = QuerySpec(name=name, promql=spec["promql"], step=str(step))
+
+    for name, spec in (data.get("detectors") or {}).items():
+        params = dict(spec)
+        if "type" not in params:
+            raise RuleConfigError(f"detector {name!r} needs a 'type'")
+        config.detectors[name] = DetectorSpec(type=params.pop("type"), params=params)
+
+    seen = set()
+    for i, spec in enumerate(data.get("rules") or []):
+        missing = [k for k in ("recipe", "query", "service") if k not in spec]
+        if missing:
+            raise RuleConfigError(f"rule #{i} is missing {', '.join(missing)}")
+        name = spec.get("name", f"rule_{i}")
+        if name in seen:
+            raise RuleConfigError(f"duplicate rule name {name!r}")
+        seen.add(name)
+        config.rules.append(
+            RuleSpec(
+                name=name,
+                recipe=spec["recipe"],
+                query=spec["query"],
+                service=spec["service"],
+                metric=spec.get("metric"),
+                params=dict(spec.get("params") or {}),
+            )
+        )
+    return config
+
+
+def loads_rules(text: str, format: str = "toml") -> RuleConfig:
+    """Parse rule text in "toml" or "yaml" format."""
+    if format == "toml":
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        data = tomllib.loads(text)
+    elif format in ("yaml", "yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError("YAML rule files need PyYAML (pip install signalguard-aiops[rules])") from exc
+        data = yaml.safe_load(text) or {}
+    else:
+        raise RuleConfigError(f"unsupported rule format {format!r}")
+    return parse_rules(data)
+
+
+def load_rules(path: str) -> RuleConfig:
+    """Load a .toml / .yaml / .yml rule file."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    with open(path, "r", encoding="utf-8") as f:
+        return loads_rules(f.read(), format=ext)
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from signalguard_aiops.incidents import Incident
+from signalguard_aiops.metrics import TimeSeriesFrame
+from signalguard_aiops.pipelines.arrow_io import (
+    frame_from_arrow,
+    frame_to_arrow,
+    iter_parquet,
+    read_incidents,
+    read_parquet,
+    timeseries_from_arrow,
+    write_incidents,
+)
+
+
+def _frame(n=500):
+    rng = np.random.default_rng(0)
+    timestamps = 1.7e9 + np.arange(n) * 60.0
+    values = rng.normal(size=(3, n))
+    values[1, :100] = np.nan
+    tags = [{"service": s, "region": "eu"} for s in ("billing", "orders", "search")]
+    return TimeSeriesFrame(timestamps, values, tags=tags)
+
+
+def test_timeseries_from_arrow_is_zero_copy():
+    values = np.random.default_rng(0).normal(size=100)
+    arr = pa.array(values)
+    ts = timeseries_from_arrow(pa.array(np.arange(100) * 60.0), arr)
+    assert np.shares_memory(ts.values, values)
+
+    stamped = pa.array((np.arange(100) * 60 * 10**9).astype("datetime64[ns]"))
+    ts = timeseries_from_arrow(stamped, pa.array(values), name="m")
+    np.testing.assert_array_equal(ts.timestamps, np.arange(100) * 60.0)
+
+
+def test_frame_roundtrip():
+    frame = _frame()
+    table = frame_to_arrow(frame)
+    assert table.num_rows == int(frame.valid.sum())
+
+    back = frame_from_arrow(table)
+    assert back.tags == frame.tags
+    np.testing.assert_array_equal(back.timestamps, frame.timestamps)
+    np.testing.assert_array_equal(back.values, frame.values)
+
+
+def test_parquet_pushdown_and_streaming(tmp_path):
+    frame = _frame()
+    table = frame_to_arrow(frame).cast(
+        pa.schema([("timestamp", pa.float64()), ("value", pa.float64()), ("region", pa.string()), ("service", pa.string())])
+    )
+    pq.write_to_dataset(table, str(tmp_path), partition_cols=["service"])
+
+    start, end = frame.timestamps[200], frame.timestamps[299]
+    got = read_parquet(str(tmp_path), labels={"service": ["orders", "search"]}, start_ts=start, end_ts=end)
+    assert sorted(t["service"] for t in got.tags) == ["orders", "search"]
+    np.testing.assert_array_equal(got.timestamps, frame.timestamps[200:300])
+    np.testing.assert_array_equal(got.select(service="orders")[0].values, frame.values[1, 200:300])
+
+    chunks = list(iter_parquet(str(tmp_path), labels={"service": "billing"}, batch_size=128))
+    assert len(chunks) > 1
+    assert sum(c.valid.sum() for c in chunks) == 500
+
+
+def test_incidents_roundtrip(tmp_path):
+    incidents = [
+        Incident.from_detector_output("orders", "error_rate", np.arange(5.0), np.linspace(0, 1, 5), [0, 0, 1, 1, 0]),
+        Incident.from_detector_output("search", "latency", np.arange(3.0), np.ones(3), [1, 0, 0], note="slo"),
+        Incident.from_detector_output("orders", "error_rate", np.zeros(0), np.zeros(0), np.zeros(0)),
+        Incident.from_detector_output("orders", "error_rate", np.arange(2.0) + 10, np.zeros(2), [0, 1]),
+    ]
+    path = str(tmp_path / "incidents.parquet")
+    write_incidents(incidents, path)
+    back = read_incidents(path)
+
+    assert [(i.service, i.metric, i.note) for i in back] == [(i.service, i.metric, i.note) for i in incidents]
+    for got, expected in zip(back, incidents):
+        np.testing.assert_array_equal(got.timestamps, expected.timestamps)
+        np.testing.assert_array_equal(got.scores, expected.scores)
+        np.testing.assert_array_equal(got.labels, expected.labels)
+
+    # without the schema metadata, incidents are still told apart by their index
+    pq.write_table(pq.read_table(path).replace_schema_metadata(None), path)
+    back = read_incidents(path)
+    assert [len(i.timestamps) for i in back] == [5, 3, 0, 2]
+    assert back[3].service == "orders"
+
+    write_incidents(incidents, path, anomalies_only=True)
+    assert pq.read_table(path).num_rows == 4
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import EMADetector, IsolationForestDetector, ZScoreDetector
+from signalguard_aiops.recipes.ensemble import normalize_scores
+
+
+def _fleet(n_series=6, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(n_series, n)).cumsum(axis=1)
+    values[:, n // 2] += 25.0
+    values[min(2, n_series - 1), 40:80] = 1.0
+    return values
+
+
+def _ragged_mask(values, seed=1):
+    rng = np.random.default_rng(seed)
+    mask = np.ones(values.shape, dtype=bool)
+    for r in range(values.shape[0]):
+        mask[r, rng.integers(0, 100) :][: rng.integers(0, 50)] = False  # interior gap
+        mask[r, values.shape[1] - rng.integers(0, 60) :] = False  # ragged tail
+    return mask
+
+
+@pytest.mark.parametrize(
+    "detector",
+    [ZScoreDetector(window=20), EMADetector(alpha=0.3, warmup=5)],
+    ids=["zscore", "ema"],
+)
+def test_batch_matches_rows(detector):
+    values = _fleet()
+    labels, scores = detector.detect_batch(values)
+    for r in range(values.shape[0]):
+        row_labels, row_scores = detector.detect(values[r])
+        np.testing.assert_array_equal(labels[r], row_labels)
+        np.testing.assert_allclose(scores[r], row_scores, rtol=1e-7, atol=1e-9)
+
+
+@pytest.mark.parametrize(
+    "detector",
+    [ZScoreDetector(window=20), EMADetector(alpha=0.3, warmup=5)],
+    ids=["zscore", "ema"],
+)
+def test_batch_with_mask_matches_compacted_rows(detector):
+    values = _fleet()
+    mask = _ragged_mask(values)
+    labels, scores = detector.detect_batch(values, mask=mask)
+    for r in range(values.shape[0]):
+        valid = mask[r]
+        row_labels, row_scores = detector.detect(values[r, valid])
+        np.testing.assert_array_equal(labels[r, valid], row_labels)
+        np.testing.assert_allclose(scores[r, valid], row_scores, rtol=1e-7, atol=1e-9)
+        assert not labels[r, ~valid].any()
+        assert not scores[r, ~valid].any()
+
+
+def test_default_batch_loops_over_rows():
+    values = _fleet(n_series=2, n=100)
+    det = IsolationForestDetector(n_estimators=20)
+    labels, scores = det.detect_batch(values)
+    row_labels, row_scores = IsolationForestDetector(n_estimators=20).detect(values[1])
+    np.testing.assert_array_equal(labels[1], row_labels)
+    np.testing.assert_allclose(scores[1], row_scores)
+
+
+def test_batch_rejects_1d():
+    with pytest.raises(ValueError):
+        ZScoreDetector().detect_batch(np.zeros(10))
+
+
+def test_normalize_scores_rows():
+    scores = np.array([[1.0, 3.0, 5.0], [2.0, 2.0, 2.0]])
+    np.testing.assert_allclose(normalize_scores(scores), [[0.0, 0.5, 1.0], [0.0, 0.0, 0.0]])
+    masked = normalize_scores(scores, mask=np.array([[True, True, False], [False, False, False]]))
+    np.testing.assert_allclose(masked, [[0.0, 1.0, 0.0], [0.0, 0.0, 0.0]])
@@ -0,0 +1,170 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.cache import CachedDetector, CachedRecipe, ResultCache, cached
+from signalguard_aiops.detectors import ZScoreDetector
+from signalguard_aiops.detectors.seasonal import SeasonalResidualDetector
+from signalguard_aiops.metrics import Rollup, TimeSeries
+from signalguard_aiops.recipes import EnsembleErrorRateRecipe, ErrorRateZScoreRecipe
+
+
+class CountingDetector(ZScoreDetector):
+    calls = 0
+
+    def detect(self, values):
+        CountingDetector.calls += 1
+        return super().detect(values)
+
+
+def _series(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 0.04 + rng.normal(scale=0.005, size=n)
+    values[120:130] += 0.2
+    return TimeSeries.from_lists(np.arange(n) * 60.0, values)
+
+
+def test_detector_results_are_memoized():
+    ts = _series()
+    cache = ResultCache()
+    CountingDetector.calls = 0
+    det = CachedDetector(CountingDetector(window=20), cache)
+
+    labels, scores = det.detect(ts.values)
+    labels2, scores2 = det.detect(ts.values.copy())
+    assert CountingDetector.calls == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    np.testing.assert_array_equal(scores, scores2)
+
+    # results are independent copies
+    scores2[:] = -1
+    assert det.detect(ts.values)[1][0] != -1
+
+    # different params or data miss
+    CachedDetector(CountingDetector(window=30), cache).detect(ts.values)
+    det.detect(ts.values + 1e-12)
+    assert CountingDetector.calls == 3
+    assert det.window == 20  # attributes are forwarded
+
+
+def test_detector_with_timestamps():
+    ts = _series()
+    cache = ResultCache()
+    det = cached(SeasonalResidualDetector(), cache)
+    det.detect(ts.values, ts.timestamps)
+    det.detect(ts.values, ts.timestamps + 60.0)
+    det.detect(ts.values, ts.timestamps)
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_recipe_run_is_memoized():
+    ts = _series()
+    cache = ResultCache()
+    recipe = cached(ErrorRateZScoreRecipe(service="orders"), cache)
+    assert isinstance(recipe, CachedRecipe)
+
+    first = recipe.run(ts)
+    second = recipe.run(ts)
+    np.testing.assert_array_equal(first.scores, second.scores)
+    assert cache.stats.hits == 1
+
+    cached(ErrorRateZScoreRecipe(service="payments"), cache).run(ts)
+    assert cache.stats.misses == 2
+    assert recipe.service == "orders"
+
+
+def test_fitted_detector_is_keyed_by_its_model():
+    ts = _series()
+    cache = ResultCache()
+    det = cached(SeasonalResidualDetector(), cache)
+    det.detect(ts.values, ts.timestamps)
+    assert not det.is_fitted  # detect runs on a copy
+
+    det.fit(ts.values[:100], ts.timestamps[:100])
+    det.detect(ts.values, ts.timestamps)
+    det.fit(ts.values[100:], ts.timestamps[100:])
+    det.detect(ts.values, ts.timestamps)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 3)
+
+
+def test_recipe_members_are_keyed_by_params():
+    ts = _series()
+    cache = ResultCache()
+
+    def recipe(window):
+        members = [ZScoreDetector(window=window), ZScoreDetector(window=2 * window)]
+        return cached(EnsembleErrorRateRecipe(service="orders", members=members, executor="thread"), cache)
+
+    first = recipe(20)
+    first.run(ts)
+    recipe(20).run(ts)
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    first.members[0].window = 25  # mutated in place
+    first.run(ts)
+    recipe(10).run(ts)
+    assert cache.stats.misses == 3
+    first.close()
+
+
+def test_cached_recipe_behaves_like_the_recipe():
+    ts = _series()
+    recipe = ErrorRateZScoreRecipe(service="orders", window=20, tier="5m", history_window=600.0, baseline_tier="1h")
+    wrapped = cached(dataclasses.replace(recipe), ResultCache())
+    assert (wrapped.tier, wrapped.history_window, wrapped.baseline_tier) == ("5m", 600.0, "1h")
+
+    # incremental runs keep streaming
+    for start in range(0, len(ts.values), 70):
+        chunk = TimeSeries(ts.timestamps[start : start + 70], ts.values[start : start + 70])
+        np.testing.assert_array_equal(wrapped.run_incremental(chunk).scores, recipe.run_incremental(chunk).scores)
+    assert wrapped.get_state()["history"] is None
+
+    # rule plans split the cached recipe into shared detectors
+    members = wrapped.plan_detectors()
+    assert list(members) == ["zscore"]
+    combined = wrapped.combine(ts, {name: det.detect(ts.values) for name, det in members.items()})
+    np.testing.assert_array_equal(combined.scores, recipe.run(ts).scores)
+
+    # rollups honour its baseline tier
+    rollup = Rollup(raw_window=3600)
+    rollup.update(ts)
+    np.testing.assert_array_equal(rollup.run(wrapped).scores, rollup.run(recipe).scores)
+    wrapped.tier = None
+    assert wrapped.recipe.tier is None
+
+
+def test_lru_eviction_by_size():
+    cache = ResultCache(max_bytes=3000)
+    for i in range(5):
+        cache.put(f"k{i}", np.zeros(100))  # ~950 bytes pickled
+    assert cache.memory_bytes <= 3000
+    assert cache.stats.evictions == 2
+    assert "k0" not in cache and "k4" in cache
+
+    cache.get("k2")  # refresh k2
+    cache.put("k5", np.zeros(100))
+    assert "k2" in cache and "k3" not in cache
+
+
+def test_disk_tier_and_ttl(tmp_path):
+    now = [1000.0]
+    clock = lambda: now[0]
+    cache = ResultCache(disk_dir=str(tmp_path), ttl=60, clock=clock)
+    cache.put("k", {"a": 1})
+
+    # a fresh cache (e.g. another process) reads the disk tier
+    other = ResultCache(disk_dir=str(tmp_path), ttl=60, clock=clock)
+    assert other.get("k") == {"a": 1}
+    assert other.stats.disk_hits == 1
+
+    now[0] += 61
+    assert cache.get("k") is None
+    assert other.get("k", "missing") == "missing"
+    assert cache.stats.expirations >= 1
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_cached_rejects_other_objects():
+    with pytest.raises(TypeError):
+        cached(object(), ResultCache())
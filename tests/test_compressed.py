@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import CompressedTimeSeries, TimeSeries
+
+
+def _series(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1.7e9 + np.arange(n) * 60.0
+    values = np.round(100 + np.cumsum(rng.normal(size=n)), 2)
+    values[[5, 500]] = [np.nan, np.inf]
+    return TimeSeries(timestamps, values, name="latency")
+
+
+def test_roundtrip_is_lossless_and_smaller():
+    ts = _series()
+    compressed = CompressedTimeSeries.from_timeseries(ts, block_size=120)
+    out = compressed.to_timeseries()
+
+    np.testing.assert_array_equal(out.timestamps, ts.timestamps)
+    np.testing.assert_array_equal(out.values.view(np.uint64), ts.values.view(np.uint64))
+    assert len(compressed) == 1000 and compressed.n_blocks == 8
+    # regular timestamps cost nothing per point
+    assert compressed.nbytes < 0.6 * (ts.timestamps.nbytes + ts.values.nbytes)
+
+
+def test_irregular_and_fractional_timestamps():
+    rng = np.random.default_rng(1)
+    jittered = np.cumsum(rng.integers(14_000, 16_000, size=300)) / 1000.0
+    fractional = np.cumsum(rng.random(300) + 0.1) / 3.0
+    for timestamps in (jittered, fractional):
+        ts = TimeSeries(timestamps, rng.normal(size=300))
+        out = CompressedTimeSeries.from_timeseries(ts, block_size=64).to_timeseries()
+        np.testing.assert_array_equal(out.timestamps, ts.timestamps)
+        np.testing.assert_array_equal(out.values, ts.values)
+
+
+def test_append_and_window_decode():
+    ts = _series()
+    compressed = CompressedTimeSeries(name="latency", block_size=100)
+    for start in range(0, 1000, 37):
+        compressed.extend(ts.timestamps[start : start + 37], ts.values[start : start + 37])
+    compressed.append(ts.timestamps[-1] + 60, 1.0)
+
+    window = compressed.window(ts.timestamps[250], ts.timestamps[420])
+    np.testing.assert_array_equal(window.values, ts.values[250:421])
+    np.testing.assert_array_equal(compressed.tail(30).values[:-1], ts.values[-29:])
+    assert len(compressed.window(0, 1).values) == 0
+
+    with pytest.raises(ValueError):
+        compressed.append(ts.timestamps[10], 0.0)
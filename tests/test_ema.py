@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import EMADetector
+
+
+def _latency(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    values = (150 + rng.normal(scale=20, size=n)) / 1000.0
+    values[n // 4 : n // 4 + 20] += 0.25
+    return values
+
+
+@pytest.mark.parametrize("chunks", [[1] * 120, [5, 60, 55], [120]])
+def test_streaming_matches_detect(chunks):
+    values = _latency(120)
+    det = EMADetector(alpha=0.3, k_sigma=2.5, warmup=10)
+    expected_labels, expected_scores = det.detect(values)
+
+    got_labels, got_scores = [], []
+    pos = 0
+    for size in chunks:
+        labels, scores = det.update_many(values[pos : pos + size])
+        got_labels.append(labels)
+        got_scores.append(scores)
+        pos += size
+
+    np.testing.assert_array_equal(np.concatenate(got_labels), expected_labels)
+    np.testing.assert_allclose(np.concatenate(got_scores), expected_scores, rtol=1e-9, atol=1e-9)
+
+
+def test_update_single_point():
+    det = EMADetector(warmup=0)
+    assert det.update(1.0) == (0, 0.0)
+    label, score = det.update(5.0)
+    assert label == 1 and score > 0
+
+
+@pytest.mark.parametrize("alpha", [0.01, 0.2, 0.5, 0.97, 1.0])
+@pytest.mark.parametrize("warmup", [0, 1, 10, 400])
+def test_vectorized_matches_reference(alpha, warmup):
+    values = _latency(5000, seed=int(alpha * 100) + warmup)
+    det = EMADetector(alpha=alpha, k_sigma=3.0, warmup=warmup)
+
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-9, atol=1e-9)
+
+
+def test_zero_deviation_is_not_scored():
+    # exactly representable EMA: ema_dev stays 0.0 and the point is skipped
+    values = np.array([0.0] * 15 + [1.0])
+    labels, scores = EMADetector(alpha=0.5, k_sigma=1.5, warmup=0).detect(values)
+    assert not scores[:15].any()
+    assert labels[15] == 1
+
+
+def test_flat_history_is_not_scored():
+    values = np.array([0.2] * 30 + [0.9] + [0.2] * 10)
+    det = EMADetector(alpha=0.2, warmup=5)
+
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+
+    assert not scores[:30].any()
+    assert labels[30] == 1
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores[30:], ref_scores[30:], rtol=1e-9)
+
+
+@pytest.mark.parametrize("level", [1e3, 1e6, 1e9])
+@pytest.mark.parametrize("alpha", [0.05, 0.2])
+def test_flat_large_magnitude_series_matches_reference(level, alpha):
+    values = np.r_[np.full(300, level), np.full(300, level + 1.0)]
+    det = EMADetector(alpha=alpha)
+
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+
+    np.testing.assert_array_equal(labels, ref_labels)
+    assert not scores[:300].any() and not ref_scores[:300].any()
+    np.testing.assert_allclose(scores[300:305], ref_scores[300:305], rtol=1e-6)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2])
+def test_short_series(n):
+    det = EMADetector(warmup=0)
+    values = np.arange(n, dtype=float)
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores, ref_scores)
+
+
+def test_batch_matches_reference_rows():
+    rng = np.random.default_rng(7)
+    values = 0.15 + rng.normal(scale=0.02, size=(20, 3000))
+    values[:, 1000:1010] += 0.3
+    det = EMADetector(alpha=0.1, warmup=20)
+
+    labels, scores = det.detect_batch(values)
+    for r in range(values.shape[0]):
+        ref_labels, ref_scores = det.detect_reference(values[r])
+        np.testing.assert_array_equal(labels[r], ref_labels)
+        np.testing.assert_allclose(scores[r], ref_scores, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,92 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import EMADetector, ZScoreDetector
+from signalguard_aiops.detectors.seasonal import SeasonalResidualDetector
+from signalguard_aiops.metrics import TimeSeries
+from signalguard_aiops.recipes import EnsembleErrorRateRecipe
+from signalguard_aiops.recipes.ensemble import normalize_scores
+
+
+def _series(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 0.04 + rng.normal(scale=0.005, size=n)
+    values[120:150] += 0.15
+    values[220:235] += 0.2
+    return TimeSeries.from_lists(np.arange(n), values)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_executors_match_sequential(executor):
+    ts = _series()
+    expected = EnsembleErrorRateRecipe(service="orders").run(ts)
+
+    recipe = EnsembleErrorRateRecipe(service="orders", executor=executor, max_workers=3)
+    try:
+        incident = recipe.run(ts)
+        incident_again = recipe.run(ts)
+    finally:
+        recipe.close()
+
+    np.testing.assert_array_equal(incident.labels, expected.labels)
+    np.testing.assert_allclose(incident.scores, expected.scores)
+    np.testing.assert_allclose(incident_again.scores, expected.scores)
+
+
+def test_custom_members_and_weights():
+    ts = _series()
+    z = ZScoreDetector(window=30)
+    ema = EMADetector(alpha=0.2)
+    z_labels, z_scores = z.detect(ts.values)
+    e_labels, e_scores = ema.detect(ts.values)
+
+    with ThreadPoolExecutor(2) as pool:
+        recipe = EnsembleErrorRateRecipe(
+            service="orders", members=[z, ema], weights=[2.0, 1.0], min_votes=2, executor=pool
+        )
+        incident = recipe.run(ts)
+
+    # the z-score detector alone carries enough weight to flag a point
+    np.testing.assert_array_equal(incident.labels, z_labels)
+    expected = (2 * normalize_scores(z_scores) + normalize_scores(e_scores)) / 3
+    np.testing.assert_allclose(incident.scores, expected)
+
+
+def test_invalid_configuration():
+    ts = _series()
+    with pytest.raises(ValueError):
+        EnsembleErrorRateRecipe(service="orders", members=[ZScoreDetector()], weights=[1.0, 2.0]).run(ts)
+    with pytest.raises(ValueError):
+        EnsembleErrorRateRecipe(service="orders", executor="gpu").run(ts)
+    with pytest.raises(ValueError):
+        EnsembleErrorRateRecipe(service="orders", members=[ZScoreDetector()] * 2, weights=[0.0, 0.0])
+    with pytest.raises(ValueError):
+        EnsembleErrorRateRecipe(service="orders", members=[ZScoreDetector()] * 2, weights=[1.0, -1.0])
+
+
+def test_timestamp_aware_members_get_the_series_timestamps():
+    rng = np.random.default_rng(0)
+    t = 1.7e9 + np.arange(2016) * 300.0  # one week of 5-minute points
+    values = 0.05 + 0.02 * np.sin(2 * np.pi * t / 86400.0) + rng.normal(scale=0.002, size=len(t))
+    ts = TimeSeries(t, values)
+    seasonal = SeasonalResidualDetector(daily_seasonality=True)
+
+    incident = EnsembleErrorRateRecipe(service="orders", members=[seasonal], min_votes=1).run(ts)
+    labels, scores = SeasonalResidualDetector(daily_seasonality=True).detect(values, t)
+    np.testing.assert_array_equal(incident.labels, labels)
+    np.testing.assert_allclose(incident.scores, normalize_scores(scores))
+
+
+def test_pickles_after_a_pooled_run():
+    ts = _series()
+    recipe = EnsembleErrorRateRecipe(service="orders", executor="thread")
+    try:
+        expected = recipe.run(ts)
+        copy = pickle.loads(pickle.dumps(recipe))
+    finally:
+        recipe.close()
+    np.testing.assert_allclose(copy.run(ts).scores, expected.scores)
+    copy.close()
@@ -0,0 +1,87 @@
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import TimeSeries
+from signalguard_aiops.pipelines import FleetRunner
+from signalguard_aiops.recipes import ErrorRateZScoreRecipe, LatencySLORecipe
+from signalguard_aiops.recipes.base import BaseRecipe
+
+
+def _fleet(n_series=40, n=200):
+    rng = np.random.default_rng(0)
+    fleet = {}
+    for i in range(n_series):
+        values = 0.04 + rng.normal(scale=0.005, size=n)
+        values[100:110] += 0.2
+        fleet[(f"svc-{i}", "error_rate")] = TimeSeries.from_lists(np.arange(n), values, name="error_rate")
+    return fleet
+
+
+@dataclass
+class FlakyRecipe(BaseRecipe):
+    """Fails in different ways depending on the series it is given."""
+
+    service: str = "flaky"
+
+    def run(self, series: TimeSeries):
+        if series.values[0] < -1000:
+            os._exit(1)  # kill the worker process
+        if series.values[0] < -100:
+            time.sleep(30)
+        if series.values[0] < 0:
+            raise ValueError("bad series")
+        return ErrorRateZScoreRecipe(service=self.service).run(series)
+
+
+def test_matches_sequential_loop():
+    fleet = _fleet()
+    recipes = [ErrorRateZScoreRecipe(service="s"), LatencySLORecipe(service="s", slo_ms=100.0)]
+    runner = FleetRunner(max_workers=2, chunk_size=7)
+
+    results = list(runner.run(fleet, recipes))
+
+    assert len(results) == 2 * len(fleet)
+    assert all(r.ok for r in results)
+    by_task = {(r.key, r.recipe): r.incident for r in results}
+    for key, ts in fleet.items():
+        for recipe in recipes:
+            expected = recipe.run(ts)
+            got = by_task[(key, type(recipe).__name__)]
+            np.testing.assert_allclose(got.scores, expected.scores)
+            np.testing.assert_array_equal(got.labels, expected.labels)
+
+    assert sum(s.tasks for s in runner.worker_stats.values()) == len(results)
+    assert len(list(runner.incidents(fleet, lambda key: ErrorRateZScoreRecipe(service=key[0])))) == len(fleet)
+
+
+def test_failures_are_isolated():
+    fleet = _fleet(n_series=30)
+    bad = {
+        ("svc-3", "error_rate"): -1.0,  # raises
+        ("svc-11", "error_rate"): -500.0,  # exceeds the time limit
+        ("svc-20", "error_rate"): -5000.0,  # kills its worker
+    }
+    for key, first in bad.items():
+        fleet[key].values[0] = first
+
+    runner = FleetRunner(max_workers=2, chunk_size=4, timeout=1.0)
+    start = time.perf_counter()
+    results = {r.key: r for r in runner.run(fleet, FlakyRecipe())}
+    assert time.perf_counter() - start < 20
+
+    assert len(results) == len(fleet)
+    assert isinstance(results[("svc-3", "error_rate")].error, ValueError)
+    assert isinstance(results[("svc-11", "error_rate")].error, TimeoutError)
+    assert isinstance(results[("svc-20", "error_rate")].error, RuntimeError)
+    assert sum(r.ok for r in results.values()) == len(fleet) - 3
+    assert set(runner.errors) == {(key, "FlakyRecipe") for key in bad}
+
+
+def test_empty_fleet():
+    assert list(FleetRunner(max_workers=1).run({}, ErrorRateZScoreRecipe(service="s"))) == []
+    with pytest.raises(ValueError):
+        FleetRunner(chunk_size=0)
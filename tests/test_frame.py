@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import ZScoreDetector
+from signalguard_aiops.metrics import TimeSeries, TimeSeriesFrame
+
+
+def _response():
+    return {
+        "status": "success",
+        "data": {
+            "resultType": "matrix",
+            "result": [
+                {
+                    "metric": {"__name__": "http_errors", "service": "orders"},
+                    "values": [[0, "1"], [30, "2"], [60, "NaN"]],
+                },
+                {
+                    "metric": {"__name__": "http_errors", "service": "billing"},
+                    "values": [[30, "5"], [90, "+Inf"]],
+                },
+            ],
+        },
+    }
+
+
+def test_from_prometheus_aligns_results():
+    frame = TimeSeriesFrame.from_prometheus(_response())
+
+    np.testing.assert_array_equal(frame.timestamps, [0, 30, 60, 90])
+    assert frame.shape == (2, 4)
+    assert frame.values.flags.c_contiguous
+    np.testing.assert_array_equal(frame.values[0, :2], [1, 2])
+    assert np.isnan(frame.values[0, 2]) and np.isnan(frame.values[1, 0])
+    assert frame.values[1, 3] == np.inf
+    np.testing.assert_array_equal(frame.valid, [[1, 1, 0, 0], [0, 1, 0, 0]])
+    assert frame.tags[1]["service"] == "billing"
+    assert frame.select(service="orders").tags == [frame.tags[0]]
+
+
+def test_rows_are_zero_copy_views():
+    frame = TimeSeriesFrame.from_series(
+        [
+            TimeSeries.from_lists([0, 60, 120], [1.0, 2.0, 3.0], name="a"),
+            TimeSeries.from_lists([60, 180], [4.0, 5.0], name="b"),
+        ]
+    )
+    np.testing.assert_array_equal(frame.timestamps, [0, 60, 120, 180])
+
+    row = frame["b"]
+    assert isinstance(row, TimeSeries)
+    assert np.shares_memory(row.values, frame.values)
+    assert row.timestamps is frame.timestamps
+    frame.values[1, 1] = 42.0
+    assert row.values[1] == 42.0
+
+    dense = frame.series("b", dropna=True)
+    np.testing.assert_array_equal(dense.timestamps, [60, 180])
+    np.testing.assert_array_equal(dense.values, [42.0, 5.0])
+    assert [s.name for s in frame] == ["a", "b"]
+
+    window = frame.window(60, 120)
+    np.testing.assert_array_equal(window.timestamps, [60, 120])
+    assert np.shares_memory(window.values, frame.values)
+
+
+def test_detect_uses_valid_points():
+    rng = np.random.default_rng(0)
+    series = [TimeSeries.from_lists(np.arange(200) * 60.0, rng.normal(size=200), name=f"s{i}") for i in range(3)]
+    series[1] = TimeSeries.from_lists(series[1].timestamps[::2], series[1].values[::2], name="s1")
+    frame = TimeSeriesFrame.from_series(series)
+    detector = ZScoreDetector(window=20)
+
+    labels, scores = frame.detect(detector)
+
+    assert labels.shape == frame.shape
+    _, expected = detector.detect(series[1].values)
+    np.testing.assert_allclose(scores[1, ::2], expected)
+    np.testing.assert_array_equal(scores[1, 1::2], 0.0)
+
+
+def test_invalid_construction():
+    with pytest.raises(ValueError):
+        TimeSeriesFrame([0, 0, 1], np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        TimeSeriesFrame([0, 1], np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        TimeSeriesFrame([0, 1], np.zeros((2, 2)), names=["a"])
+
+
+def test_fill_gaps_keeps_the_mask():
+    values = np.array([[1.0, np.nan, 3.0, 50.0, np.nan], [1.0, 2.0, np.nan, 4.0, 5.0]])
+    mask = np.array([[1, 1, 1, 0, 1], [1, 1, 1, 1, 1]], dtype=bool)
+    frame = TimeSeriesFrame([0, 60, 120, 180, 240], values, mask=mask)
+
+    filled = frame.fill_gaps("ffill")
+
+    np.testing.assert_array_equal(filled.mask, mask)
+    assert filled.mask is not frame.mask
+    # the masked-out 50.0 is kept but not carried forward
+    np.testing.assert_array_equal(filled.values, [[1, 1, 3, 50, 3], [1, 2, 2, 4, 5]])
+    np.testing.assert_array_equal(filled.valid, [[1, 1, 1, 0, 1], [1, 1, 1, 1, 1]])
+    assert TimeSeriesFrame([0, 60], [[1.0, np.nan]]).fill_gaps().mask is None
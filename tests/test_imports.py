@@ -0,0 +1,92 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import signalguard_aiops.detectors as detectors
+from signalguard_aiops.detectors import BaseDetector, ZScoreDetector, get_detector, register_detector
+
+# Import-time budget (seconds) for the light-weight public modules, as
+# measured by `python -X importtime` (interpreter start-up excluded).
+# Generous enough for slow CI machines, far below what TensorFlow / Prophet /
+# scikit-learn cost.
+IMPORT_BUDGET_S = 1.5
+HEAVY_MODULES = ("tensorflow", "prophet", "sklearn", "scipy", "pandas")
+PUBLIC_MODULES = (
+    "signalguard_aiops",
+    "signalguard_aiops.detectors",
+    "signalguard_aiops.recipes",
+    "signalguard_aiops.metrics",
+    "signalguard_aiops.incidents",
+)
+
+_PROBE = """
+import json, sys
+import signalguard_aiops
+import signalguard_aiops.detectors
+import signalguard_aiops.recipes
+import signalguard_aiops.metrics
+import signalguard_aiops.incidents
+print(json.dumps({"heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe():
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_import_does_not_load_heavy_dependencies():
+    assert _probe()["heavy"] == []
+
+
+def _import_seconds():
+    code = "; ".join(f"import {m}" for m in PUBLIC_MODULES)
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    total_us = 0
+    for line in out.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <module>"; top-level imports are not indented
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].startswith(" signalguard_aiops") and not fields[2].startswith("  "):
+            total_us += int(fields[1])
+    return total_us / 1e6
+
+
+def test_import_time_budget():
+    # best of three to smooth out a cold filesystem cache
+    elapsed = min(_import_seconds() for _ in range(3))
+    assert 0 < elapsed < IMPORT_BUDGET_S, f"importing signalguard_aiops took {elapsed:.2f}s"
+
+
+def test_registry_resolves_builtins():
+    assert get_detector("zscore") is ZScoreDetector
+    assert get_detector("ZScoreDetector") is ZScoreDetector
+    assert "lstm_autoencoder" in detectors.available_detectors()
+
+
+def test_register_lazy_target(monkeypatch):
+    monkeypatch.setattr(detectors, "_registry", dict(detectors._registry))
+    register_detector("zscore_alias", "signalguard_aiops.detectors.zscore:ZScoreDetector")
+    assert get_detector("zscore_alias") is ZScoreDetector
+
+
+def test_entry_point_detectors(monkeypatch):
+    from importlib.metadata import EntryPoint
+
+    ep = EntryPoint(
+        name="plugin_zscore",
+        value="signalguard_aiops.detectors.zscore:ZScoreDetector",
+        group=detectors.ENTRY_POINT_GROUP,
+    )
+    monkeypatch.setattr(detectors, "entry_points", lambda **kwargs: [ep])
+    monkeypatch.setattr(detectors, "_entry_points_loaded", False)
+    monkeypatch.setattr(detectors, "_registry", dict(detectors._registry))
+
+    assert "plugin_zscore" in detectors.available_detectors()
+    assert issubclass(get_detector("plugin_zscore"), BaseDetector)
+
+
+def test_unknown_detector():
+    with pytest.raises(KeyError):
+        get_detector("does_not_exist")
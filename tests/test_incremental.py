@@ -0,0 +1,92 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import TimeSeries
+from signalguard_aiops.recipes import ErrorRateIForestRecipe, ErrorRateZScoreRecipe, LatencySLORecipe
+
+
+def _series(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 0.15 + rng.normal(scale=0.02, size=n)
+    values[200:215] += 0.3
+    values[450] += 0.5
+    return TimeSeries.from_lists(np.arange(n) * 30.0, values)
+
+
+def _chunks(ts, sizes):
+    start = 0
+    for size in sizes:
+        yield TimeSeries(ts.timestamps[start : start + size], ts.values[start : start + size])
+        start += size
+
+
+SIZES = [1, 7, 100, 2, 250, 0, 240]
+
+
+@pytest.mark.parametrize(
+    "recipe",
+    [ErrorRateZScoreRecipe(service="orders"), LatencySLORecipe(service="orders", slo_ms=400.0)],
+)
+def test_streaming_recipes_match_full_run(recipe):
+    ts = _series()
+    expected = recipe.run(ts)
+
+    parts = [recipe.run_incremental(chunk) for chunk in _chunks(ts, SIZES)]
+
+    np.testing.assert_allclose(np.concatenate([p.scores for p in parts]), expected.scores, atol=1e-9)
+    np.testing.assert_array_equal(np.concatenate([p.labels for p in parts]), expected.labels)
+    np.testing.assert_array_equal(parts[-1].timestamps, ts.timestamps[-240:])
+    assert parts[-1].note == expected.note
+    # only the detector is kept, no history
+    assert recipe.get_state()["history"] is None
+
+
+def test_state_survives_pickling():
+    ts = _series()
+    first, second = list(_chunks(ts, [350, 250]))
+    recipe = ErrorRateZScoreRecipe(service="orders")
+    recipe.run_incremental(first)
+    state = pickle.loads(pickle.dumps(recipe.get_state()))
+
+    restored = ErrorRateZScoreRecipe(service="orders")
+    restored.set_state(state)
+    np.testing.assert_allclose(restored.run_incremental(second).scores, recipe.run_incremental(second).scores)
+
+
+def test_non_streaming_recipe_recomputes_on_history():
+    ts = _series()
+    recipe = ErrorRateIForestRecipe(service="orders", history_window=300 * 30.0)
+
+    for chunk in _chunks(ts, [400, 50, 150]):
+        incident = recipe.run_incremental(chunk)
+
+    history = recipe.get_state()["history"]
+    assert len(history.values) == 300
+    expected = recipe.run(TimeSeries(ts.timestamps[-300:], ts.values[-300:]))
+    np.testing.assert_allclose(incident.scores, expected.scores[-150:])
+    np.testing.assert_array_equal(incident.timestamps, ts.timestamps[-150:])
+
+
+def test_history_stays_bounded_by_default():
+    recipe = ErrorRateIForestRecipe(service="orders", n_estimators=10)
+    day = int(recipe.history_window // 30)
+    ts = _series(n=day + 500)
+    sizes = []
+    for chunk in _chunks(ts, [day] + [5] * 100):
+        recipe.run_incremental(chunk)
+        sizes.append(len(recipe.get_state()["history"].values))
+    assert sizes[0] == day
+    assert set(sizes[1:]) == {day}
+
+
+def test_points_must_be_appended():
+    ts = _series()
+    recipe = ErrorRateZScoreRecipe(service="orders")
+    recipe.run_incremental(TimeSeries(ts.timestamps[:100], ts.values[:100]))
+    with pytest.raises(ValueError):
+        recipe.run_incremental(TimeSeries(ts.timestamps[50:150], ts.values[50:150]))
+
+    recipe.reset_state()
+    assert len(recipe.run_incremental(TimeSeries(ts.timestamps[50:150], ts.values[50:150])).scores) == 100
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors.lof import LOF1D, LOFDetector
+
+sklearn_neighbors = pytest.importorskip("sklearn.neighbors")
+
+
+def _values(n, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=n)
+    values[n // 3] += 6.0
+    # exact duplicates (but no values tied at equal distance on both sides,
+    # where sklearn's own answer depends on the kNN algorithm)
+    values[::11] = values[1]
+    return values
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize(
+    "n, k, contamination",
+    [(300, 20, 0.05), (50, 5, "auto"), (2, 1, 0.1), (21, 20, 0.5), (3000, 35, 0.01), (10, 20, 0.2)],
+)
+def test_matches_sklearn(n, k, contamination):
+    values = _values(n)
+    ref = sklearn_neighbors.LocalOutlierFactor(n_neighbors=k, contamination=contamination)
+    ref_labels = ref.fit_predict(values.reshape(-1, 1))
+
+    lof = LOF1D(n_neighbors=k, contamination=contamination)
+    labels = lof.fit_predict(values)
+
+    np.testing.assert_allclose(lof.negative_outlier_factor_, ref.negative_outlier_factor_, rtol=1e-9)
+    assert lof.offset_ == pytest.approx(ref.offset_)
+    np.testing.assert_array_equal(labels, ref_labels)
+
+
+@pytest.mark.parametrize("n, k", [(300, 20), (25, 24), (1000, 5)])
+def test_novelty_matches_sklearn(n, k):
+    values = _values(n)
+    rng = np.random.default_rng(1)
+    queries = np.concatenate([rng.normal(scale=3, size=500), values[:20], [values.min() - 1, values.max() + 1]])
+
+    ref = sklearn_neighbors.LocalOutlierFactor(n_neighbors=k, contamination=0.05, novelty=True)
+    ref.fit(values.reshape(-1, 1))
+    lof = LOF1D(n_neighbors=k, contamination=0.05).fit(values)
+
+    np.testing.assert_allclose(lof.score_samples(queries), ref.score_samples(queries.reshape(-1, 1)), rtol=1e-9)
+    np.testing.assert_array_equal(lof.predict(queries), ref.predict(queries.reshape(-1, 1)))
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError):
+        LOF1D(contamination=0.8)
+    with pytest.raises(ValueError):
+        LOF1D().fit(np.array([1.0, np.nan, 2.0]))
+
+
+def test_detector_flags_outlier():
+    values = np.random.default_rng(0).normal(size=300)
+    values[100] += 6.0
+    labels, scores = LOFDetector().detect(values)
+    assert labels[100] == 1
+    assert scores.argmax() == 100
+
+    det = LOFDetector().fit(values)
+    labels, scores = det.score(np.array([0.0, 0.1, 12.0]))
+    np.testing.assert_array_equal(labels, [0, 0, 1])
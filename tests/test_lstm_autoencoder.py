@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from signalguard_aiops.detectors import lstm_numpy
+from signalguard_aiops.detectors.lstm_autoencoder import LSTMAutoencoderDetector
+
+
+def _series(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.sin(np.arange(n) / 5.0) + rng.normal(scale=0.1, size=n)
+    values[n // 2] += 4.0
+    return values
+
+
+def test_trains_on_tf_data_and_scores_in_chunks(monkeypatch):
+    values = _series()
+    det = LSTMAutoencoderDetector(window_size=10, latent_dim=4, epochs=2, batch_size=16, train_stride=3)
+
+    # a batch size that does not divide the 37 strided training windows
+    batches = list(det._training_dataset(values))
+    assert [len(x) for x, _ in batches] == [16, 16, 5]
+    assert batches[0][0].shape[1:] == (10, 1)
+
+    labels, scores = det.detect(values)
+    assert det.is_fitted
+    assert labels.shape == scores.shape == (120,)
+    assert np.all(np.isfinite(scores))
+    assert scores.max() == pytest.approx(1.0)
+    assert not scores[:4].any()  # no window is centered on the first points
+
+    # 111 windows scored 8 at a time, with a short last chunk
+    monkeypatch.setattr(lstm_numpy, "_PREDICT_CHUNK", 8)
+    chunked_labels, chunked_scores = det.score(values)
+    np.testing.assert_allclose(chunked_scores, scores, rtol=1e-5, atol=1e-7)
+    np.testing.assert_array_equal(chunked_labels, labels)
@@ -0,0 +1,87 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors.lstm_numpy import (
+    WEIGHT_NAMES,
+    NumpyLSTMAutoencoder,
+    NumpyLSTMAutoencoderDetector,
+)
+
+
+def _random_weights(window_size=8, latent_dim=4, seed=0):
+    rng = np.random.default_rng(seed)
+    u = latent_dim
+    shapes = {
+        "encoder_kernel": (1, 4 * u),
+        "encoder_recurrent_kernel": (u, 4 * u),
+        "encoder_bias": (4 * u,),
+        "decoder_kernel": (u, 4 * u),
+        "decoder_recurrent_kernel": (u, 4 * u),
+        "decoder_bias": (4 * u,),
+        "dense_kernel": (u, 1),
+        "dense_bias": (1,),
+    }
+    return {k: rng.normal(scale=0.5, size=shapes[k]) for k in WEIGHT_NAMES}
+
+
+def _series(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.sin(np.arange(n) / 5.0) + rng.normal(scale=0.1, size=n)
+    values[n // 2] += 4.0
+    return values
+
+
+def test_artifact_roundtrip(tmp_path):
+    model = NumpyLSTMAutoencoder(_random_weights(), window_size=8)
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+
+    loaded = NumpyLSTMAutoencoder.load(path)
+    windows = np.random.default_rng(1).normal(size=(5, 8, 1))
+    assert loaded.window_size == 8 and loaded.latent_dim == 4
+    np.testing.assert_allclose(loaded.predict(windows), model.predict(windows))
+    assert model.predict(windows).shape == (5, 8, 1)
+
+
+def test_detector_scores_series():
+    det = NumpyLSTMAutoencoderDetector(model=NumpyLSTMAutoencoder(_random_weights(), window_size=8))
+    labels, scores = det.detect(_series())
+    assert labels.shape == scores.shape == (400,)
+    assert scores.max() == pytest.approx(1.0)
+    assert not scores[:4].any()  # no window is centered on the first points
+
+
+def test_numpy_inference_does_not_import_tensorflow(tmp_path):
+    path = str(tmp_path / "model.npz")
+    NumpyLSTMAutoencoder(_random_weights(), window_size=8).save(path)
+    code = (
+        "import sys, numpy as np\n"
+        "from signalguard_aiops.detectors import get_detector\n"
+        f"det = get_detector('lstm_autoencoder_numpy')({path!r})\n"
+        "det.detect(np.sin(np.arange(100.0)))\n"
+        "assert 'tensorflow' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_matches_keras_predict(tmp_path):
+    pytest.importorskip("tensorflow")
+    from signalguard_aiops.detectors import LSTMAutoencoderDetector
+
+    values = _series()
+    det = LSTMAutoencoderDetector(window_size=12, latent_dim=6, epochs=1)
+    det.fit(values)
+
+    windows = det._create_windows(values)[:64].astype(np.float32)
+    expected = det.model.predict(windows, verbose=0)
+    got = det.to_numpy().model.predict(windows)
+    np.testing.assert_allclose(got, expected, rtol=1e-4, atol=1e-5)
+
+    path = str(tmp_path / "lstm.npz")
+    det.export_weights(path)
+    labels, scores = NumpyLSTMAutoencoderDetector(path).detect(values)
+    ref_labels, ref_scores = det.score(values)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-3, atol=1e-4)
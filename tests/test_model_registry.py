@@ -0,0 +1,113 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import IsolationForestDetector, LOFDetector
+from signalguard_aiops.metrics import TimeSeries
+from signalguard_aiops.models import ModelRegistry
+from signalguard_aiops.recipes import EnsembleErrorRateRecipe, ErrorRateIForestRecipe
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _series(n=300, seed=0, shift=0.0, start=0):
+    rng = np.random.default_rng(seed)
+    values = 0.03 + shift + rng.normal(scale=0.004, size=n)
+    return TimeSeries.from_lists(np.arange(start, start + n) * 30.0, values, name="error_rate")
+
+
+def test_fit_score_matches_detect():
+    ts = _series()
+    det = IsolationForestDetector(n_estimators=20)
+    expected = IsolationForestDetector(n_estimators=20).detect(ts.values)
+    got = det.fit(ts.values).score(ts.values)
+    np.testing.assert_array_equal(got[0], expected[0])
+    np.testing.assert_allclose(got[1], expected[1])
+
+
+def test_score_requires_fit():
+    with pytest.raises(RuntimeError):
+        LOFDetector().score(np.arange(10.0))
+
+
+def test_registry_reuses_model_until_refit_interval():
+    clock = _Clock()
+    registry = ModelRegistry(refit_interval=3600, clock=clock)
+    template = IsolationForestDetector(n_estimators=20)
+
+    first = registry.get_fitted("orders", "error_rate", template, _series(seed=0))
+    second = registry.get_fitted("orders", "error_rate", template, _series(seed=1, start=10))
+    assert first is second
+    assert not template.is_fitted
+    assert (registry.stats.fits, registry.stats.hits) == (1, 1)
+
+    clock.now += 3600
+    third = registry.get_fitted("orders", "error_rate", template, _series(seed=2, start=20))
+    assert third is not first
+    assert registry.stats.fits == 2
+
+
+def test_registry_refits_on_drift():
+    registry = ModelRegistry(drift_threshold=3.0)
+    template = LOFDetector()
+    first = registry.get_fitted("orders", "error_rate", template, _series(seed=0))
+    drifted = registry.get_fitted("orders", "error_rate", template, _series(seed=1, shift=1.0))
+    assert drifted is not first
+    assert registry.stats.fits == 2
+
+
+def test_registry_keys_on_params():
+    registry = ModelRegistry()
+    ts = _series()
+    a = registry.get_fitted("orders", "error_rate", IsolationForestDetector(n_estimators=10), ts)
+    b = registry.get_fitted("orders", "error_rate", IsolationForestDetector(n_estimators=20), ts)
+    c = registry.get_fitted("payments", "error_rate", IsolationForestDetector(n_estimators=10), ts)
+    assert len({id(a), id(b), id(c)}) == 3
+
+
+def test_registry_spills_to_disk_and_loads_back(tmp_path):
+    registry = ModelRegistry(max_memory_bytes=1, spill_dir=str(tmp_path))
+    template = IsolationForestDetector(n_estimators=10)
+    ts = _series()
+
+    registry.get_fitted("a", "error_rate", template, ts)
+    registry.get_fitted("b", "error_rate", template, ts)
+    assert len(registry) == 1
+    assert registry.stats.spills == 1
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+    key_a = registry.key_for("a", "error_rate", template)
+    assert key_a in registry
+    labels, scores = registry.score("a", "error_rate", template, ts)
+    assert registry.stats.loads == 1
+    assert registry.stats.fits == 2
+    assert scores.shape == ts.values.shape
+
+
+def test_recipes_use_registry():
+    registry = ModelRegistry(drift_threshold=None)
+    ts = _series()
+    iforest = ErrorRateIForestRecipe(service="orders", registry=registry)
+    ensemble = EnsembleErrorRateRecipe(service="orders", registry=registry)
+
+    for _ in range(3):
+        iforest.run(ts)
+        incident = ensemble.run(ts)
+
+    assert incident.scores.shape == ts.values.shape
+    # both recipes share the same IsolationForest config; plus one LOF
+    assert registry.stats.fits == 2
+
+
+def test_fitted_detectors_pickle():
+    ts = _series()
+    det = LOFDetector().fit(ts.values)
+    restored = pickle.loads(pickle.dumps(det))
+    np.testing.assert_allclose(restored.score(ts.values)[1], det.score(ts.values)[1])
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.pipelines import PrometheusSeriesFetcher, parse_range_response, series_key
+from signalguard_aiops.pipelines import prometheus_client
+
+
+def _body(n_series=3, n=50, indent=None):
+    results = []
+    for s in range(n_series):
+        values = [[1.7e9 + 30 * i + s * 15, repr(0.1 * i + s)] for i in range(n - s)]
+        results.append({"metric": {"__name__": "http_errors", "service": f"svc{s}"}, "values": values})
+    results[0]["values"][3][1] = "NaN"
+    results[1]["values"][4][1] = "+Inf"
+    return json.dumps({"status": "success", "data": {"resultType": "matrix", "result": results}}, indent=indent)
+
+
+def _reference(body):
+    results = json.loads(body)["data"]["result"]
+    return [
+        (r["metric"], np.array([float(t) for t, _ in r["values"]]), np.array([float(v) for _, v in r["values"]]))
+        for r in results
+    ]
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_parse_matches_reference(indent):
+    body = _body(indent=indent)
+    labels, lengths, timestamps, values = parse_range_response(body.encode())
+
+    expected = _reference(body)
+    assert labels == [e[0] for e in expected]
+    np.testing.assert_array_equal(lengths, [50, 49, 48])
+    np.testing.assert_array_equal(timestamps, np.concatenate([e[1] for e in expected]))
+    np.testing.assert_array_equal(values, np.concatenate([e[2] for e in expected]))
+
+
+def test_parse_edge_cases():
+    empty = json.dumps({"status": "success", "data": {"resultType": "matrix", "result": []}})
+    labels, lengths, timestamps, _ = parse_range_response(empty)
+    assert labels == [] and len(timestamps) == 0
+
+    # a label value that looks like a sample list still parses correctly
+    tricky = json.dumps(
+        {"status": "success", "data": {"result": [{"metric": {"q": '"values":[[1,"2"]]'}, "values": [[5, "7"]]}]}}
+    )
+    labels, lengths, timestamps, values = parse_range_response(tricky)
+    assert labels[0]["q"] == '"values":[[1,"2"]]'
+    np.testing.assert_array_equal(values, [7.0])
+
+    with pytest.raises(ValueError):
+        parse_range_response(json.dumps({"status": "error", "errorType": "bad_data", "error": "parse error"}))
+
+
+class _Response:
+    def __init__(self, body):
+        self.content = body.encode()
+
+    def raise_for_status(self):
+        pass
+
+
+def test_fetch_all_and_frame(monkeypatch):
+    body = _body()
+    monkeypatch.setattr(prometheus_client.requests, "get", lambda *args, **kwargs: _Response(body))
+    fetcher = PrometheusSeriesFetcher("http://prometheus:9090")
+
+    series = fetcher.fetch_all("http_errors", 0, 1)
+    assert list(series) == [f'http_errors{{service="svc{s}"}}' for s in range(3)]
+    np.testing.assert_array_equal(series['http_errors{service="svc2"}'].values, _reference(body)[2][2])
+
+    frame = fetcher.fetch_frame("http_errors", 0, 1)
+    assert frame.shape[0] == 3 and frame.tags[1]["service"] == "svc1"
+    assert len(fetcher.fetch_range("http_errors", 0, 1).values) == 50
+    assert series_key({"service": "a"}) == '{service="a"}'
@@ -0,0 +1,63 @@
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("prophet")
+
+from signalguard_aiops.detectors.prophet_detector import ProphetFleet, ProphetResidualDetector
+from signalguard_aiops.metrics import TimeSeries
+
+
+def _series(n=240, seed=0, step=300.0):
+    rng = np.random.default_rng(seed)
+    t = 1.7e9 + np.arange(n) * step
+    values = 10 + np.sin(2 * np.pi * t / 86400.0) + rng.normal(scale=0.1, size=n)
+    values[n // 2] += 3.0
+    return TimeSeries.from_lists(t, values)
+
+
+def test_fit_then_score_tail_without_refit():
+    ts = _series()
+    det = ProphetResidualDetector().fit(ts.values[:200], ts.timestamps[:200])
+    labels, scores = det.score(ts.values[200:], ts.timestamps[200:])
+    assert scores.shape == (40,)
+    assert np.isfinite(scores).all()
+
+
+def test_detect_equals_fit_plus_score():
+    ts = _series()
+    labels, scores = ProphetResidualDetector().detect(ts.values, ts.timestamps)
+    det = ProphetResidualDetector().fit(ts.values, ts.timestamps)
+    np.testing.assert_allclose(det.score(ts.values, ts.timestamps)[1], scores, rtol=1e-6)
+    assert labels[120] == 1
+
+
+def test_fitted_detector_pickles():
+    ts = _series()
+    det = ProphetResidualDetector().fit(ts.values, ts.timestamps)
+    restored = pickle.loads(pickle.dumps(det))
+    np.testing.assert_allclose(
+        restored.score(ts.values, ts.timestamps)[1],
+        det.score(ts.values, ts.timestamps)[1],
+        rtol=1e-6,
+    )
+
+
+def test_fleet_fits_in_parallel_and_scores_tails():
+    fleet_series = {f"svc-{i}": _series(seed=i) for i in range(3)}
+    history = {k: TimeSeries(ts.timestamps[:200], ts.values[:200]) for k, ts in fleet_series.items()}
+    tails = {k: TimeSeries(ts.timestamps[200:], ts.values[200:]) for k, ts in fleet_series.items()}
+    history["broken"] = TimeSeries(np.array([1.0]), np.array([np.nan]))
+
+    fleet = ProphetFleet(max_workers=2)
+    fitted = fleet.fit(history)
+
+    assert set(fitted) == set(fleet_series)
+    assert "broken" in fleet.errors
+
+    results = fleet.score_many(tails)
+    for key, (labels, scores) in results.items():
+        serial = ProphetResidualDetector().fit(history[key].values, history[key].timestamps)
+        expected = serial.score(tails[key].values, tails[key].timestamps)[1]
+        np.testing.assert_allclose(scores, expected, rtol=1e-4, atol=1e-6)
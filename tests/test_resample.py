@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import TimeSeries, TimeSeriesFrame, align, fill_gaps, lttb
+
+
+def _jittered(n=500, step=15.0, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(n) * step + rng.uniform(0, 5, size=n)
+    values = rng.normal(size=n)
+    values[rng.choice(n, 20, replace=False)] = np.nan
+    return TimeSeries(timestamps, values, name="m")
+
+
+@pytest.mark.parametrize("agg", ["mean", "sum", "count", "min", "max", "first", "last"])
+def test_resample_matches_pandas(agg):
+    pd = pytest.importorskip("pandas")
+    ts = _jittered()
+    out = ts.resample(60, agg=agg)
+
+    s = pd.Series(ts.values, index=pd.to_datetime(ts.timestamps, unit="s")).dropna()
+    expected = getattr(s.resample("60s"), agg)()
+    if agg == "sum":  # pandas sums empty buckets to 0, we keep them missing
+        expected[s.resample("60s").count() == 0] = np.nan
+
+    np.testing.assert_allclose(out.timestamps, expected.index.astype("int64") // 10**9)
+    np.testing.assert_allclose(out.values, expected.to_numpy(dtype=float))
+
+
+def test_align_many_series_to_one_grid():
+    series = [_jittered(seed=s) for s in range(4)]
+    series[2] = TimeSeries(series[2].timestamps[100:], series[2].values[100:], name="late")
+    frame = align(series, 60, agg="max")
+
+    assert frame.shape[0] == 4
+    assert frame.names[2] == "late"
+    for row, s in zip(frame, series):
+        expected = s.resample(60, agg="max", start=frame.timestamps[0], end=frame.timestamps[-1])
+        np.testing.assert_array_equal(row.values, expected.values)
+
+    again = align(frame, 120, agg="count")
+    assert again.values.sum() == np.isfinite(frame.values).sum()
+    assert isinstance(frame.resample(120), TimeSeriesFrame)
+
+
+def test_fill_gaps():
+    values = np.array([np.nan, 1.0, np.nan, 3.0, np.nan, np.nan, np.nan, 7.0, np.nan])
+    np.testing.assert_array_equal(fill_gaps(values, "ffill"), [np.nan, 1, 1, 3, 3, 3, 3, 7, 7])
+    np.testing.assert_array_equal(fill_gaps(values, "bfill"), [1, 1, 3, 3, 7, 7, 7, 7, np.nan])
+    np.testing.assert_array_equal(fill_gaps(values, "linear"), [np.nan, 1, 2, 3, 4, 5, 6, 7, np.nan])
+    np.testing.assert_array_equal(fill_gaps(values, "linear", limit=1), [np.nan, 1, 2, 3, np.nan, np.nan, np.nan, 7, np.nan])
+    np.testing.assert_array_equal(fill_gaps(values, 0.5, limit=2), [0.5, 1, 0.5, 3, np.nan, np.nan, np.nan, 7, 0.5])
+
+    rows = np.vstack([values, values[::-1]])
+    np.testing.assert_array_equal(fill_gaps(rows, "ffill")[1], fill_gaps(values[::-1], "ffill"))
+    with pytest.raises(ValueError):
+        fill_gaps(values, "nearest")
+
+
+def _lttb_reference(x, y, n_out):
+    every = (len(x) - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        lo, hi = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        nlo, nhi = hi, min(int(np.floor((i + 2) * every)) + 1, len(x))
+        if i == n_out - 3:
+            ax, ay = x[-1], y[-1]
+        else:
+            ax, ay = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = [abs((x[a] - ax) * (y[j] - y[a]) - (x[a] - x[j]) * (ay - y[a])) for j in range(lo, hi)]
+        a = lo + int(np.argmax(area))
+        selected.append(a)
+    return selected + [len(x) - 1]
+
+
+def test_lttb_keeps_shape():
+    rng = np.random.default_rng(1)
+    x = np.arange(1000.0)
+    y = np.sin(x / 50) + rng.normal(scale=0.05, size=1000)
+    y[417] = 10.0
+    ts = TimeSeries(x, y)
+
+    out = lttb(ts, 100)
+    assert len(out.values) == 100
+    assert out.timestamps[0] == 0 and out.timestamps[-1] == 999
+    assert 10.0 in out.values
+    np.testing.assert_array_equal(out.timestamps, x[_lttb_reference(x, y, 100)])
+    assert len(ts.window(0, 50).lttb(100).values) == 51
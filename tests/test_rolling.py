@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import ZScoreDetector
+from signalguard_aiops.metrics import RollingTimeSeries, TimeSeries
+from signalguard_aiops.recipes import ErrorRateZScoreRecipe
+
+
+def test_keeps_newest_points_as_contiguous_views():
+    rolling = RollingTimeSeries(capacity=5, name="m")
+    for i in range(3):
+        rolling.append(i * 60.0, float(i))
+    rolling.extend(np.arange(3, 9) * 60.0, np.arange(3, 9, dtype=float))
+    rolling.append(540.0, 9.0)
+
+    assert len(rolling) == 5 and rolling.full
+    np.testing.assert_array_equal(rolling.values, [5, 6, 7, 8, 9])
+    np.testing.assert_array_equal(rolling.timestamps, np.arange(5, 10) * 60.0)
+    assert rolling.values.flags.c_contiguous
+    assert np.shares_memory(rolling.values, rolling._values)
+    assert not rolling.values.flags.writeable
+
+    snap = rolling.snapshot()
+    rolling.extend(np.arange(10, 30) * 60.0, np.arange(10, 30, dtype=float))
+    np.testing.assert_array_equal(rolling.values, np.arange(25, 30))
+    np.testing.assert_array_equal(snap.values, [5, 6, 7, 8, 9])
+
+    with pytest.raises(ValueError):
+        rolling.append(0.0, 1.0)
+
+
+def test_interchangeable_with_timeseries():
+    rng = np.random.default_rng(0)
+    n = 400
+    full = TimeSeries(np.arange(n) * 60.0, 0.05 + rng.normal(scale=0.01, size=n), name="errors")
+    full.values[350] = 0.5
+
+    rolling = RollingTimeSeries(capacity=200, name="errors")
+    for start in range(0, n, 7):
+        rolling.extend(full.timestamps[start : start + 7], full.values[start : start + 7])
+    tail = TimeSeries(full.timestamps[-200:], full.values[-200:], name="errors")
+
+    detector = ZScoreDetector()
+    np.testing.assert_array_equal(detector.detect(rolling.values)[1], detector.detect(tail.values)[1])
+    recipe = ErrorRateZScoreRecipe(service="orders")
+    np.testing.assert_array_equal(recipe.run(rolling).labels, recipe.run(tail).labels)
+    np.testing.assert_array_equal(rolling.window(300 * 60, 310 * 60).values, full.values[300:311])
+    assert isinstance(rolling, TimeSeries)
+
+
+def test_constructors():
+    rolling = RollingTimeSeries.from_lists([120, 0, 60], [3.0, 1.0, 2.0], name="m", sort=True, capacity=2)
+    assert isinstance(rolling, RollingTimeSeries) and rolling.capacity == 2
+    np.testing.assert_array_equal(rolling.values, [2, 3])
+    assert RollingTimeSeries.from_lists([0, 60], [1.0, 2.0]).capacity == 2
+
+    series = TimeSeries.from_lists([0, 60, 120], [1.0, 2.0, 3.0], name="m")
+    assert RollingTimeSeries.from_timeseries(series).capacity == 3
+    with pytest.raises(ValueError):
+        RollingTimeSeries.from_timeseries(series, capacity=0)
+
+
+def test_recipe_output_does_not_alias_the_buffer():
+    rolling = RollingTimeSeries(capacity=60, name="errors")
+    rolling.extend(np.arange(100.0), 0.05 + 0.001 * np.sin(np.arange(100.0)))
+    incident = ErrorRateZScoreRecipe(service="svc").run(rolling)
+    before = incident.timestamps.copy()
+
+    rolling.extend([100.0, 101.0], [0.05, 0.05])
+    np.testing.assert_array_equal(incident.timestamps, before)
+    assert incident.timestamps[0] == 40.0 and incident.timestamps[-1] == 99.0
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import Rollup, RollupTier, TimeSeries
+from signalguard_aiops.recipes import ErrorRateZScoreRecipe
+
+
+def _series(n=3 * 1440 * 2, step=30.0, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1.7e9 + np.arange(n) * step
+    values = 0.05 + 0.01 * np.sin(2 * np.pi * timestamps / 86400) + rng.normal(scale=0.002, size=n)
+    values[rng.choice(n, 30, replace=False)] = np.nan
+    return TimeSeries(timestamps, values, name="errors")
+
+
+def test_incremental_tiers_match_batch_resample():
+    ts = _series()
+    rollup = Rollup(name="errors")
+    for start in range(0, len(ts.values), 97):
+        rollup.update(TimeSeries(ts.timestamps[start : start + 97], ts.values[start : start + 97]))
+
+    for tier, step in (("1m", 60), ("5m", 300), ("1h", 3600)):
+        for agg in ("mean", "sum", "count", "min", "max"):
+            expected = ts.resample(step, agg=agg)
+            present = expected.values > 0 if agg == "count" else ~np.isnan(expected.values)
+            got = rollup.series(tier, agg=agg)
+            np.testing.assert_allclose(got.timestamps, expected.timestamps[present])
+            np.testing.assert_allclose(got.values, expected.values[present])
+
+    # per-bucket std of the raw points, from the merged centered moments
+    got = rollup.series("1h", agg="std")
+    keys = np.floor(ts.timestamps / 3600)
+    finite = ~np.isnan(ts.values)
+    expected = [np.std(ts.values[(keys == k) & finite]) for k in np.unique(keys[finite])]
+    np.testing.assert_allclose(got.values, expected, rtol=1e-6)
+
+
+def test_retention_and_raw_window():
+    tier = RollupTier(60, retention=3600)
+    ts = _series()
+    tier.update(ts.timestamps, ts.values)
+    hourly = tier.series("count")
+    assert len(hourly.values) == 61
+    assert hourly.timestamps[0] >= ts.timestamps[-1] - 3600 - 60
+    with pytest.raises(ValueError):
+        tier.update(ts.timestamps[:10], ts.values[:10])
+
+    rollup = Rollup(raw_window=600)
+    rollup.update(ts)
+    raw = rollup.series()
+    assert raw.timestamps[0] >= ts.timestamps[-1] - 600 and len(raw.values) == 21
+    with pytest.raises(KeyError):
+        rollup.series("1d")
+
+
+def test_recipes_run_on_their_tier():
+    ts = _series()
+    rollup = Rollup(name="errors")
+    rollup.update(ts)
+
+    recipe = ErrorRateZScoreRecipe(service="orders", tier="5m", tier_agg="max")
+    incident = rollup.run(recipe)
+    assert len(incident.timestamps) == len(rollup.series("5m").values)
+    np.testing.assert_array_equal(incident.labels, recipe.run(rollup.series("5m", agg="max")).labels)
+
+    # without a tier the recipe only sees the raw recent window
+    recipe.tier = None
+    assert len(recipe.run(ts).timestamps) == len(ts.values)
+    assert len(rollup.run(recipe).timestamps) == len(rollup.series().values) == 721
+
+
+def test_long_baseline_from_tier_and_raw_recent_window():
+    ts = _series()
+    ts.values[-100] = 0.2
+    rollup = Rollup(raw_window=3600, name="errors")
+    for start in range(0, len(ts.values), 500):
+        rollup.update(TimeSeries(ts.timestamps[start : start + 500], ts.values[start : start + 500]))
+
+    # pooled from hourly buckets that close before the raw window starts
+    count, mean, std = rollup.baseline("1h")
+    recent = ts.timestamps[-1] - 3600
+    before = (ts.timestamps < np.floor(recent / 3600) * 3600) & ~np.isnan(ts.values)
+    assert count == before.sum()
+    assert mean == pytest.approx(np.mean(ts.values[before]), rel=1e-9)
+    assert std == pytest.approx(np.std(ts.values[before]), rel=1e-6)
+
+    recipe = ErrorRateZScoreRecipe(service="orders", baseline_tier="1h")
+    incident = rollup.run(recipe)
+    np.testing.assert_array_equal(incident.timestamps, rollup.series().timestamps)
+    np.testing.assert_allclose(incident.scores, np.nan_to_num(np.abs(rollup.series().values - mean) / std))
+    assert incident.labels[-100] == 1
+    assert incident.labels.sum() <= 3
+
+
+def test_std_far_from_zero():
+    rng = np.random.default_rng(1)
+    n = 4 * 3600
+    timestamps = 1.7e9 + np.arange(n, dtype=float)
+    values = 1e8 + rng.normal(size=n)
+    tier = RollupTier(3600)
+    for start in range(0, n, 700):  # chunks split buckets, exercising the merge
+        tier.update(timestamps[start : start + 700], values[start : start + 700])
+
+    keys = np.floor(timestamps / 3600)
+    expected = [np.std(values[keys == k]) for k in np.unique(keys)]
+    np.testing.assert_allclose(tier.series("std").values, expected, rtol=1e-6)
+    count, mean, std = tier.stats()
+    assert count == n
+    assert mean == pytest.approx(np.mean(values), rel=1e-12)
+    assert std == pytest.approx(np.std(values), rel=1e-6)
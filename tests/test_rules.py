@@ -0,0 +1,161 @@
+import io
+
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import TimeSeries
+from signalguard_aiops.recipes import EnsembleErrorRateRecipe, ErrorRateZScoreRecipe, LatencySLORecipe
+from signalguard_aiops.rules import RuleConfigError, compile_rules, loads_rules, parse_duration
+
+RULES_TOML = """
+[queries.orders_errors]
+promql = 'sum(rate(errors_total{service="orders"}[5m])) / sum(rate(requests_total{service="orders"}[5m]))'
+step = "30s"
+
+[queries.orders_latency]
+promql = 'histogram_quantile(0.95, sum(rate(latency_bucket{service="orders"}[5m])) by (le))'
+step = "1m"
+
+[detectors.z_baseline]
+type = "zscore"
+window = 30
+
+[[rules]]
+name = "orders-error-alert"
+recipe = "error_rate_zscore"
+query = "orders_errors"
+service = "orders"
+
+[[rules]]
+name = "orders-ensemble"
+recipe = "ensemble_error_rate"
+query = "orders_errors"
+service = "orders"
+
+[[rules]]
+name = "orders-custom-ensemble"
+recipe = "EnsembleErrorRateRecipe"
+query = "orders_errors"
+service = "orders"
+params = { members = ["z_baseline", { type = "ema", alpha = 0.3 }], weights = [2.0, 1.0] }
+
+[[rules]]
+name = "orders-latency"
+recipe = "latency_slo"
+query = "orders_latency"
+service = "orders"
+metric = "latency_p95"
+params = { slo_ms = 250.0 }
+"""
+
+
+def _fetch_fn(calls):
+    rng = np.random.default_rng(0)
+    data = {
+        "30s": 0.04 + rng.normal(scale=0.005, size=400),
+        "1m": 0.15 + rng.normal(scale=0.02, size=200),
+    }
+    data["30s"][150:165] += 0.2
+
+    def fetch(promql, step):
+        calls.append(promql)
+        values = data[step]
+        return TimeSeries.from_lists(np.arange(len(values)) * parse_duration(step), values)
+
+    return fetch
+
+
+def test_plan_deduplicates_fetches_and_detectors():
+    plan = compile_rules(loads_rules(RULES_TOML))
+
+    assert len(plan.fetches) == 2
+    # zscore shared by all three error-rate rules, plus iforest, lof, ema and the latency ema
+    assert len(plan.detectors) == 5
+    zscore = [n for n in plan.detectors.values() if type(n.detector).__name__ == "ZScoreDetector"]
+    assert len(zscore) == 1 and len(zscore[0].consumers) == 3
+
+    calls = []
+    incidents = plan.evaluate(_fetch_fn(calls))
+    assert len(calls) == 2
+    assert plan.stats.detector_runs == 5
+    assert plan.stats.detector_outputs_shared == 2
+
+    series = _fetch_fn([])
+    errors, latency = series("q", "30s"), series("q", "1m")
+    expected = {
+        "orders-error-alert": ErrorRateZScoreRecipe(service="orders").run(errors),
+        "orders-ensemble": EnsembleErrorRateRecipe(service="orders").run(errors),
+        "orders-latency": LatencySLORecipe(service="orders", slo_ms=250.0).run(latency),
+    }
+    for name, incident in expected.items():
+        np.testing.assert_allclose(incidents[name].scores, incident.scores)
+        np.testing.assert_array_equal(incidents[name].labels, incident.labels)
+        assert incidents[name].note == incident.note
+    assert incidents["orders-latency"].metric == "latency_p95"
+
+
+def test_plan_passes_timestamps_to_detectors():
+    text = """
+[queries.errors]
+promql = 'errors'
+step = "5m"
+
+[[rules]]
+name = "seasonal-ensemble"
+recipe = "ensemble_error_rate"
+query = "errors"
+service = "orders"
+params = { members = [{ type = "seasonal", daily_seasonality = true }, "zscore"], min_votes = 1 }
+"""
+    plan = compile_rules(loads_rules(text))
+    assert plan.recipes["seasonal-ensemble"].inputs is not None
+
+    rng = np.random.default_rng(0)
+    t = 1.7e9 + np.arange(2016) * 300.0
+    series = TimeSeries(t, 0.05 + 0.02 * np.sin(2 * np.pi * t / 86400.0) + rng.normal(scale=0.002, size=len(t)))
+    incident = plan.evaluate(lambda promql, step: series)["seasonal-ensemble"]
+
+    expected = plan.recipes["seasonal-ensemble"].recipe.run(series)
+    np.testing.assert_allclose(incident.scores, expected.scores)
+    np.testing.assert_array_equal(incident.labels, expected.labels)
+
+
+def test_yaml_and_dry_run():
+    pytest.importorskip("yaml")
+    config = loads_rules(
+        """
+queries:
+  errors: {promql: 'rate(errors_total[5m])', step: 1m}
+rules:
+  - {name: a, recipe: error_rate_zscore, query: errors, service: s}
+  - {name: b, recipe: error_rate_zscore, query: 'rate(errors_total[5m])', service: s, params: {window: 60}}
+""",
+        format="yaml",
+    )
+    plan = compile_rules(config)
+    # the inline query uses the default 30s step, so it is a separate fetch
+    assert len(plan.fetches) == 2
+
+    out = io.StringIO()
+    plan.dry_run(range_seconds=86400, file=out)
+    text = out.getvalue()
+    assert "fetch:errors" in text and "points=1441" in text
+    assert "estimated cost" in text
+
+    planned, naive = compile_rules(loads_rules(RULES_TOML)).estimate_cost(86400)
+    assert planned < naive
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[[rules]]\nname = 'a'\nrecipe = 'error_rate_zscore'\nquery = 'up'\n",
+        "[[rules]]\nrecipe = 'nope'\nquery = 'up'\nservice = 's'\n",
+        "[[rules]]\nrecipe = 'error_rate_zscore'\nquery = 'up'\nservice = 's'\nparams = { bogus = 1 }\n",
+        "[queries.q]\npromql = 'up'\nstep = 'soon'\n",
+        "[[rules]]\nrecipe = 'ensemble_error_rate'\nquery = 'up'\nservice = 's'\nparams = { members = [{ alpha = 1 }] }\n",
+    ],
+)
+def test_invalid_rules(text):
+    with pytest.raises(RuleConfigError):
+        compile_rules(loads_rules(text))
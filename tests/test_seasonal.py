@@ -0,0 +1,96 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from signalguard_aiops import detectors
+from signalguard_aiops.detectors.seasonal import SeasonalResidualDetector
+
+
+def _seasonal(n=2016, seed=0, step=300.0):
+    # one week of 5-minute points with a daily cycle and a slow trend
+    rng = np.random.default_rng(seed)
+    t = 1.7e9 + np.arange(n) * step
+    values = 10 + 1e-5 * (t - t[0]) + 2 * np.sin(2 * np.pi * t / 86400.0) + rng.normal(scale=0.1, size=n)
+    return t, values
+
+
+def test_daily_cycle_is_not_flagged_but_spike_is():
+    t, values = _seasonal()
+    values[1000] += 2.0
+    labels, scores = SeasonalResidualDetector(daily_seasonality=True).detect(values, t)
+    assert labels[1000] == 1
+    assert labels.sum() <= 10
+
+    # without the seasonal terms the daily peaks dominate the residuals
+    flat_scores = SeasonalResidualDetector().detect(values, t)[1]
+    assert flat_scores[1000] < scores[1000]
+
+
+def test_fit_then_score_tail_without_refit():
+    t, values = _seasonal()
+    det = SeasonalResidualDetector(daily_seasonality=True).fit(values[:1800], t[:1800])
+    tail = values[1800:].copy()
+    tail[50] += 2.0
+    labels, scores = det.score(tail, t[1800:])
+    assert scores.shape == (216,)
+    assert labels[50] == 1
+    assert labels.sum() <= 3
+
+
+def test_detect_equals_fit_plus_score_and_pickles():
+    t, values = _seasonal()
+    labels, scores = SeasonalResidualDetector(daily_seasonality=True).detect(values, t)
+    det = pickle.loads(pickle.dumps(SeasonalResidualDetector(daily_seasonality=True).fit(values, t)))
+    np.testing.assert_allclose(det.score(values, t)[1], scores)
+
+
+def test_score_requires_fit():
+    with pytest.raises(RuntimeError):
+        SeasonalResidualDetector().score(np.ones(5))
+
+
+def test_missing_points_are_ignored_in_fit():
+    t, values = _seasonal()
+    values[10:20] = np.nan
+    labels, scores = SeasonalResidualDetector(daily_seasonality=True).detect(values, t)
+    assert np.isfinite(scores).all()
+    assert scores[10:20].sum() == 0
+
+
+def test_detect_batch_matches_per_series():
+    t, _ = _seasonal(n=600)
+    batch = np.vstack([_seasonal(n=600, seed=s)[1] for s in range(5)])
+    batch[1, 300] += 3.0
+    mask = np.ones(batch.shape, dtype=bool)
+    mask[3, 100:150] = False
+
+    det = SeasonalResidualDetector(daily_seasonality=True, n_changepoints=3)
+    labels, scores = det.detect_batch(batch, mask, timestamps=t)
+
+    for r in range(5):
+        keep = mask[r]
+        ref_labels, ref_scores = det.detect(batch[r, keep], t[keep])
+        np.testing.assert_allclose(scores[r, keep], ref_scores, rtol=1e-8, atol=1e-10)
+        np.testing.assert_array_equal(labels[r, keep], ref_labels)
+    assert scores[3, 100:150].sum() == 0
+    assert labels[1, 300] == 1
+
+
+def test_detect_batch_keeps_fitted_model():
+    t, values = _seasonal()
+    det = SeasonalResidualDetector(daily_seasonality=True).fit(values[:1800], t[:1800])
+    expected = det.score(values[1800:], t[1800:])[1]
+
+    batch = np.vstack([values[:600], values[600:1200]])
+    mask = np.ones(batch.shape, dtype=bool)
+    mask[1, :10] = False
+    det.detect_batch(batch, mask, timestamps=t[:600])
+
+    assert det.is_fitted
+    np.testing.assert_allclose(det.score(values[1800:], t[1800:])[1], expected)
+
+
+def test_registered():
+    assert detectors.get_detector("seasonal") is SeasonalResidualDetector
+    assert detectors.SeasonalResidualDetector is SeasonalResidualDetector
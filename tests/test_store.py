@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import SeriesStore, TimeSeries
+
+
+def _series(start, n, step=60.0):
+    timestamps = start + np.arange(n) * step
+    return TimeSeries(timestamps, np.sin(timestamps / 600.0), name="m")
+
+
+def test_append_and_range_reads(tmp_path):
+    store = SeriesStore(str(tmp_path), segment_points=100)
+    assert store.append("orders:error_rate", _series(0, 250)) == 250
+    # overlapping re-fetch: only the new points are written
+    assert store.append("orders:error_rate", _series(200 * 60, 100)) == 50
+
+    full = store.read("orders:error_rate")
+    expected = _series(0, 300)
+    np.testing.assert_array_equal(full.timestamps, expected.timestamps)
+    np.testing.assert_array_equal(full.values, expected.values)
+    assert store.last_timestamp("orders:error_rate") == 299 * 60
+
+    # a range inside one segment is a read-only view of the mapped file
+    part = store.read("orders:error_rate", 110 * 60, 150 * 60)
+    assert isinstance(part.values, np.memmap)
+    assert not part.values.flags.writeable
+    np.testing.assert_array_equal(part.timestamps, expected.timestamps[110:151])
+
+    # a new store instance sees the same data
+    reopened = SeriesStore(str(tmp_path), segment_points=100)
+    assert reopened.keys() == ["orders:error_rate"]
+    np.testing.assert_array_equal(reopened.read("orders:error_rate", 6000, 12000).values, expected.values[100:201])
+    with pytest.raises(KeyError):
+        reopened.read("missing")
+
+
+def test_interrupted_append_is_ignored(tmp_path):
+    store = SeriesStore(str(tmp_path), segment_points=1000)
+    store.append("k", _series(0, 10))
+    seg_file = next(p for p in tmp_path.rglob("*.val"))
+    with open(seg_file, "ab") as f:
+        f.write(b"\x00" * 12)  # torn write the index never recorded
+
+    reopened = SeriesStore(str(tmp_path), segment_points=1000)
+    assert len(reopened.read("k").values) == 10
+    reopened.append("k", _series(600, 5))
+    np.testing.assert_array_equal(reopened.read("k").values, _series(0, 15).values)
+
+
+def test_compact_applies_retention_and_merges(tmp_path):
+    store = SeriesStore(str(tmp_path), segment_points=100, retention=100 * 60)
+    for start in range(0, 300, 30):  # many appends, partially filled segments stay full
+        store.append("k", _series(start * 60, 30))
+
+    removed = store.compact(now=299 * 60)
+    assert removed == 199
+    ts = store.read("k")
+    np.testing.assert_array_equal(ts.timestamps, np.arange(199, 300) * 60.0)
+    assert len(list(tmp_path.rglob("*.ts"))) == 2
+    assert store.compact(now=299 * 60) == 0
+
+
+def test_sync_only_fetches_the_tail(tmp_path):
+    store = SeriesStore(str(tmp_path))
+    source = _series(0, 500)
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return source.window(start, end)
+
+    first = store.sync("k", fetch, 0, 200 * 60)
+    second = store.sync("k", fetch, 100 * 60, 499 * 60)
+
+    assert calls == [(0, 200 * 60), (200 * 60, 499 * 60)]
+    assert len(first.values) == 201
+    np.testing.assert_array_equal(second.values, source.values[100:])
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from signalguard_aiops.metrics import TimeSeries
+
+
+def _series(n=100):
+    return TimeSeries.from_lists(np.arange(n) * 60.0, np.arange(n, dtype=float), name="m")
+
+
+def test_timestamps_must_be_sorted():
+    with pytest.raises(ValueError):
+        TimeSeries(np.array([0.0, 120.0, 60.0]), np.zeros(3))
+    with pytest.raises(ValueError):
+        TimeSeries(np.array([0.0, 60.0]), np.zeros(3))
+
+    ts = TimeSeries.from_lists([120, 0, 60], [3.0, 1.0, 2.0], sort=True)
+    np.testing.assert_array_equal(ts.timestamps, [0, 60, 120])
+    np.testing.assert_array_equal(ts.values, [1, 2, 3])
+
+
+def test_datetime64_timestamps_become_epoch_seconds():
+    stamps = np.array(["2024-01-01T00:00:00", "2024-01-01T00:01:00.5"], dtype="datetime64[ms]")
+    ts = TimeSeries(stamps, np.zeros(2))
+    np.testing.assert_array_equal(ts.timestamps, [1704067200.0, 1704067260.5])
+    np.testing.assert_array_equal(TimeSeries.from_lists(stamps[::-1], [1.0, 0.0], sort=True).timestamps, ts.timestamps)
+
+
+def test_from_pandas_datetime_index():
+    pd = pytest.importorskip("pandas")
+    index = pd.to_datetime([60, 0], unit="s").as_unit("s")  # second resolution, unsorted
+    ts = TimeSeries.from_pandas(pd.Series([2.0, 1.0], index=index))
+    np.testing.assert_array_equal(ts.timestamps, [0.0, 60.0])
+    np.testing.assert_array_equal(ts.values, [1.0, 2.0])
+
+
+def test_window_is_an_inclusive_view():
+    ts = _series()
+    window = ts.window(600, 1200)
+
+    np.testing.assert_array_equal(window.timestamps, np.arange(10, 21) * 60.0)
+    assert np.shares_memory(window.values, ts.values)
+    assert np.shares_memory(window.timestamps, ts.timestamps)
+    assert window.name == "m"
+    assert len(ts.window(1e9, 2e9).values) == 0
+
+
+def test_sliding_windows_by_points():
+    ts = _series(10)
+    windows = list(ts.sliding_windows(4, stride=3))
+
+    assert [w.values[0] for w in windows] == [0, 3, 6]
+    assert all(len(w.values) == 4 and np.shares_memory(w.values, ts.values) for w in windows)
+
+
+def test_sliding_windows_by_time():
+    ts = _series(10)
+    windows = list(ts.sliding_windows(180, by_time=True))
+
+    assert len(windows) == 10
+    # trailing (t - 180, t]: up to three points
+    np.testing.assert_array_equal(windows[0].values, [0])
+    np.testing.assert_array_equal(windows[5].values, [3, 4, 5])
+    assert len(list(ts.sliding_windows(180, by_time=True, min_points=3))) == 8
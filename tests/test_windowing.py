@@ -0,0 +1,35 @@
+import numpy as np
+
+from signalguard_aiops.detectors.windowing import sliding_windows, window_scores_to_points
+
+
+def test_sliding_windows_are_read_only_views():
+    values = np.arange(10.0)
+    windows = sliding_windows(values, 4)
+    assert windows.shape == (7, 4)
+    assert np.shares_memory(windows, values)
+    assert not windows.flags.writeable
+    np.testing.assert_array_equal(windows[3], values[3:7])
+
+
+def test_sliding_windows_stride_and_short_series():
+    windows = sliding_windows(np.arange(10.0), 4, stride=3)
+    np.testing.assert_array_equal(windows[:, 0], [0, 3, 6])
+    assert sliding_windows(np.arange(3.0), 4).shape == (0, 4)
+
+
+def test_window_scores_to_points_matches_center_loop():
+    n, w = 50, 7
+    errors = np.random.default_rng(0).random(n - w + 1)
+
+    expected = np.zeros(n)
+    for i, err in enumerate(errors):
+        expected[i + w // 2] = err
+
+    np.testing.assert_allclose(window_scores_to_points(errors, n, w), expected)
+
+
+def test_window_scores_to_points_with_stride():
+    points = window_scores_to_points(np.array([1.0, 2.0, 3.0]), 10, 4, stride=3)
+    np.testing.assert_allclose(points[[2, 5, 8]], [1.0, 2.0, 3.0])
+    assert points.sum() == 6.0
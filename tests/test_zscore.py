@@ -1 +1,108 @@
-# TODO: add simple tests for ZScoreDetector
+import numpy as np
+import pytest
+
+from signalguard_aiops.detectors import ZScoreDetector
+
+
+def _series(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    values = 0.03 + rng.normal(scale=0.004, size=n)
+    values[n // 6 : n // 6 + 30] += 0.12
+    values[n // 2 : n // 2 + 60] = 0.5  # constant stretch -> zero std histories
+    values[3 * n // 4 :] += np.linspace(0, 50, n - 3 * n // 4)  # trend
+    return values
+
+
+@pytest.mark.parametrize("window,min_history", [(30, 10), (5, 5), (1, 1), (100, 1)])
+def test_vectorized_matches_reference(window, min_history):
+    values = _series()
+    det = ZScoreDetector(window=window, min_history=min_history)
+
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-7, atol=1e-9)
+
+
+def test_flags_spike():
+    values = np.full(100, 1.0) + np.sin(np.arange(100))
+    values[60] = 50.0
+    labels, scores = ZScoreDetector(window=30).detect(values)
+    assert labels[60] == 1
+    assert scores[60] == scores.max()
+    assert labels[:10].sum() == 0
+
+
+def test_constant_history_uses_epsilon_std():
+    values = np.array([2.0] * 20 + [2.0, 3.0])
+    labels, scores = ZScoreDetector(window=10).detect(values)
+    assert scores[20] == 0.0
+    assert scores[21] == pytest.approx(1.0 / 1e-8)
+    assert labels[21] == 1
+
+
+def test_constant_history_with_rounding_residue_matches_reference():
+    # np.std of repeated 0.1 is ~1e-17, not 0, so the epsilon fallback must not kick in
+    values = np.r_[np.full(60, 0.1), 0.1 + 2e-8]
+    det = ZScoreDetector(window=30)
+    labels, scores = det.detect(values)
+    ref_labels, ref_scores = det.detect_reference(values)
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-7, atol=1e-9)
+    assert labels[60] == 1
+
+    det.reset()
+    assert det.update_many(values[:60])[0].sum() == 0
+    assert det.update(values[60]) == (labels[60], pytest.approx(scores[60]))
+    batch = det.detect_batch(np.vstack([values, values]))[1]
+    np.testing.assert_allclose(batch[1], ref_scores, rtol=1e-7, atol=1e-9)
+
+
+def test_non_finite_values_match_reference():
+    values = _series(300)
+    values[50] = np.nan
+    values[120] = np.inf
+    det = ZScoreDetector(window=20)
+    with np.errstate(invalid="ignore"):
+        ref_labels, ref_scores = det.detect_reference(values)
+    labels, scores = det.detect(values)
+    np.testing.assert_array_equal(labels, ref_labels)
+    np.testing.assert_allclose(scores, ref_scores, rtol=1e-7, atol=1e-9)
+
+
+def test_empty():
+    labels, scores = ZScoreDetector().detect(np.array([]))
+    assert labels.shape == scores.shape == (0,)
+
+
+@pytest.mark.parametrize("chunks", [[1] * 200, [7, 50, 3, 140], [200], [31, 31, 31, 107]])
+def test_streaming_matches_detect(chunks):
+    values = _series(200, seed=3)
+    values[80:100] = 0.5
+    values[150] = np.nan
+    det = ZScoreDetector(window=30, min_history=10)
+    with np.errstate(invalid="ignore"):
+        expected_labels, expected_scores = det.detect(values)
+
+        got_labels, got_scores = [], []
+        pos = 0
+        for size in chunks:
+            labels, scores = det.update_many(values[pos : pos + size])
+            got_labels.append(labels)
+            got_scores.append(scores)
+            pos += size
+
+    np.testing.assert_array_equal(np.concatenate(got_labels), expected_labels)
+    np.testing.assert_allclose(np.concatenate(got_scores), expected_scores, rtol=1e-7, atol=1e-9)
+
+
+def test_streaming_reset_and_detect_is_stateless():
+    values = _series(100)
+    det = ZScoreDetector(window=10)
+    det.update_many(values[:50])
+    det.detect(values)  # must not disturb the stream
+    tail = det.update_many(values[50:])
+    det.reset()
+    head = det.update_many(values[:50])
+    np.testing.assert_allclose(np.concatenate([head[1], tail[1]]), det.detect(values)[1], rtol=1e-7)